@@ -0,0 +1,110 @@
+"""Program catalog payloads of washers, dryers, dishwashers and ovens.
+
+Every file holds the status of one model, reduced to the capabilities the
+program catalog is parsed from: ``supportedCycles``, ``predefinedCourses``
+or the kitchen ``specification``, and the capabilities the parsing looks
+at next to them. The files are used by the micro benchmarks, and more are
+added from diagnostics or recordings with::
+
+    python -m benchmarks.corpus add config_entry-smartthings-01J.json
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+from typing import Any
+
+CORPUS_DIR = Path(__file__).parent
+
+# Capabilities kept from a status, with the attributes kept of each of them
+CATALOG_CAPABILITIES: dict[str, tuple[str, ...]] = {
+    "custom.supportedOptions": ("course", "supportedCourses", "referenceTable"),
+    "samsungce.washerCycle": ("washerCycle", "supportedCycles", "referenceTable"),
+    "samsungce.dryerCycle": ("dryerCycle", "supportedCycles", "referenceTable"),
+    "samsungce.steamClosetCycle": (
+        "steamClosetCycle",
+        "supportedCycles",
+        "referenceTable",
+    ),
+    "samsungce.dishwasherWashingCourse": ("washingCourse", "supportedCourses"),
+    "samsungce.dishwasherWashingCourseDetails": (
+        "predefinedCourses",
+        "waterUsageMax",
+        "energyUsageMax",
+    ),
+    "samsungce.kitchenModeSpecification": ("specification",),
+    "samsungce.kitchenDeviceIdentification": ("regionCode", "modelCode"),
+    "temperatureMeasurement": ("temperature",),
+    "custom.ovenCavityStatus": ("ovenCavityStatus",),
+    "custom.disabledComponents": ("disabledComponents",),
+    "custom.disabledCapabilities": ("disabledCapabilities",),
+}
+
+# Capability with the program catalog of every appliance
+APPLIANCE_CAPABILITIES = {
+    "samsungce.kitchenModeSpecification": "oven",
+    "samsungce.dishwasherWashingCourseDetails": "dishwasher",
+    "samsungce.dryerCycle": "dryer",
+    "samsungce.steamClosetCycle": "steam_closet",
+    "samsungce.washerCycle": "washer",
+    "custom.supportedOptions": "washer",
+}
+
+
+@dataclass
+class CorpusEntry:
+    """The program catalog of a model."""
+
+    name: str
+    appliance: str
+    description: str
+    status: dict[str, Any]
+
+
+def load_corpus(directory: Path = CORPUS_DIR) -> list[CorpusEntry]:
+    """Load every payload of the corpus, ordered by name."""
+    entries = []
+    for path in sorted(directory.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        entries.append(
+            CorpusEntry(
+                name=path.stem,
+                appliance=data["appliance"],
+                description=data.get("description", ""),
+                status=data["status"],
+            )
+        )
+    return entries
+
+
+def appliance_of(status: dict[str, Any]) -> str | None:
+    """Return the appliance of a status, or None without a program catalog."""
+    main = status.get("components", {}).get("main", {})
+    return next(
+        (
+            appliance
+            for capability, appliance in APPLIANCE_CAPABILITIES.items()
+            if capability in main
+        ),
+        None,
+    )
+
+
+def catalog_status(status: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a status to the capabilities of the program catalog."""
+    components: dict[str, Any] = {}
+    for component_id, capabilities in status.get("components", {}).items():
+        kept = {
+            capability: {
+                attribute: capabilities[capability][attribute]
+                for attribute in attributes
+                if attribute in capabilities[capability]
+            }
+            for capability, attributes in CATALOG_CAPABILITIES.items()
+            if capability in capabilities
+        }
+        if kept:
+            components[component_id] = kept
+    return {"components": components}
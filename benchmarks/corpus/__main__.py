@@ -0,0 +1,91 @@
+"""Add the program catalogs of diagnostics or recordings to the corpus.
+
+Every device with a program catalog is reduced to the capabilities the
+catalog is parsed from and written as a file of its own. Diagnostics and
+redacted recordings hold no identifiers, and the reduced status holds
+none either, so the files can be shared.
+
+Example::
+
+    python -m benchmarks.corpus add config_entry-smartthings-01J.json
+    python -m benchmarks.corpus list
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import re
+
+from benchmarks.replay import load
+
+from . import CORPUS_DIR, appliance_of, catalog_status, load_corpus
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def corpus_name(appliance: str, model: str, directory: Path) -> str:
+    """Return a file name in the corpus that isn't taken yet."""
+    base = re.sub(r"[^a-z0-9]+", "_", f"{appliance}_{model}".lower()).strip("_")
+    name, index = base, 1
+    while (directory / f"{name}.json").exists():
+        index += 1
+        name = f"{base}_{index}"
+    return name
+
+
+def add(paths: list[Path], directory: Path) -> None:
+    """Add the program catalogs of every device in the files."""
+    for path in paths:
+        for info, status in load(path).devices:
+            if (appliance := appliance_of(status)) is None:
+                continue
+            catalog = catalog_status(status)
+            model = (
+                info.get("ocf", {}).get("modelNumber")
+                or info.get("presentationId")
+                or appliance
+            )
+            name = corpus_name(appliance, model.split("|")[0], directory)
+            data = {
+                "appliance": appliance,
+                "description": f"{model} from {path.name}",
+                "status": catalog,
+            }
+            (directory / f"{name}.json").write_text(
+                json.dumps(data, indent=2) + "\n", encoding="utf-8"
+            )
+            _LOGGER.info("Added %s", name)
+
+
+def list_corpus(directory: Path) -> None:
+    """Print the payloads of the corpus."""
+    for entry in load_corpus(directory):
+        print(f"{entry.name:40} {entry.appliance:12} {entry.description}")  # noqa: T201
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--directory", type=Path, default=CORPUS_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="add diagnostics or recordings")
+    add_parser.add_argument("files", type=Path, nargs="+")
+    commands.add_parser("list", help="list the payloads")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run a command."""
+    args = parse_args()
+    if args.command == "add":
+        add(args.files, args.directory)
+    else:
+        list_corpus(args.directory)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark the cycle statistics over a synthetic cycle history.
+
+Every machine gets cycle logs covering a number of years, rotated like the
+integration rotates them. The statistics are computed once with an empty
+column cache, when every log is parsed, and then again with the cache
+filled, for NumPy and for the array fallback.
+
+Example::
+
+    python -m benchmarks.cycle_statistics --machines 100 --years 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import orjson
+
+from custom_components.smartthingswasher.analytics import (
+    CycleColumnCache,
+    cycle_statistics,
+    np,
+)
+from custom_components.smartthingswasher.history import MAX_LOG_SIZE, ROTATED_LOGS
+
+DEFAULT_MACHINES = 100
+DEFAULT_YEARS = 2
+DEFAULT_CYCLES_PER_DAY = 3
+DEFAULT_ROUNDS = 5
+PROGRAMS = [f"course_{code:02x}" for code in range(0x20, 0x40)]
+OPTIONS = {"spinLevel": "1400", "waterTemperature": "40", "rinseCycle": "2"}
+
+
+def write_logs(
+    directory: Path, machines: int, years: int, cycles_per_day: int, seed: int
+) -> list[Path]:
+    """Write the cycle logs of the machines, oldest log first per machine."""
+    randomizer = random.Random(seed)
+    paths = []
+    now = time.time()
+    for machine in range(machines):
+        programs = randomizer.sample(PROGRAMS, 8)
+        moment = now - years * 365 * 86400
+        logs: list[list[bytes]] = [[]]
+        size = 0
+        while moment < now:
+            moment += randomizer.expovariate(cycles_per_day / 86400)
+            duration = randomizer.randint(20 * 60, 4 * 3600)
+            line = orjson.dumps(
+                {
+                    "start": round(moment),
+                    "end": round(moment + duration),
+                    "program": randomizer.choice(programs),
+                    "options": OPTIONS,
+                    "energy": round(randomizer.uniform(0.1, 2.5), 3),
+                    "water": round(randomizer.uniform(0, 90), 1),
+                    "job_state": "finish",
+                }
+            )
+            if size + len(line) + 1 > MAX_LOG_SIZE:
+                logs.append([])
+                size = 0
+            logs[-1].append(line)
+            size += len(line) + 1
+            moment += duration
+        # Only the most recent rotated logs are kept
+        logs = logs[-(ROTATED_LOGS + 1) :]
+        for index, lines in enumerate(logs):
+            path = directory / f"machine_{machine:03}.{index}.ndjson"
+            path.write_bytes(b"\n".join(lines) + b"\n")
+            paths.append(path)
+    return paths
+
+
+def measure(paths: list[Path], rounds: int, use_numpy: bool) -> dict[str, Any]:
+    """Time the statistics with an empty and with a filled column cache."""
+    time_zone = ZoneInfo("Europe/Amsterdam")
+    cache = CycleColumnCache()
+    start = time.perf_counter()
+    result = cycle_statistics(
+        cache.load(paths), cache.programs, None, None, time_zone, use_numpy=use_numpy
+    )
+    cold = time.perf_counter() - start
+    warm = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        cycle_statistics(
+            cache.load(paths),
+            cache.programs,
+            None,
+            None,
+            time_zone,
+            use_numpy=use_numpy,
+        )
+        warm.append(time.perf_counter() - start)
+    return {
+        "engine": result["engine"],
+        "cycles": result["cycles"],
+        "cold": round(cold, 4),
+        "warm_median": round(statistics.median(warm), 4),
+        "warm_min": round(min(warm), 4),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--machines", type=int, default=DEFAULT_MACHINES)
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS)
+    parser.add_argument("--cycles-per-day", type=int, default=DEFAULT_CYCLES_PER_DAY)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="file to write, or stdout")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the benchmark and write the results as JSON."""
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_logs(
+            Path(directory), args.machines, args.years, args.cycles_per_day, args.seed
+        )
+        engines = [True, False] if np is not None else [False]
+        results = [measure(paths, args.rounds, use_numpy) for use_numpy in engines]
+    output = json.dumps(
+        {
+            "benchmark": "cycle_statistics",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "machines": args.machines,
+            "years": args.years,
+            "cycles_per_day": args.cycles_per_day,
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output is None:
+        print(output)  # noqa: T201
+    else:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+"""Benchmark the dispatch of device events to the entities.
+
+A config entry is set up for a fleet against the fake cloud, then device
+events are fed to the raw event handler of the pysmartthings client, the
+same path the event stream takes. Streams of events at increasing rates
+and realistic bursts are measured for events per second, state writes per
+event and event loop lag, and the results are written as JSON.
+
+Example::
+
+    python -m benchmarks.dispatch --size 100 --rates 100 1000 5000 --output dispatch.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import logging
+from pathlib import Path
+import platform
+import random
+import time
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_STATE_CHANGED, __version__ as HA_VERSION
+from homeassistant.core import Event, HomeAssistant, StateMachine, callback
+
+from .fake_cloud import Fleet, device_event_payload
+from .harness import (
+    async_add_entry,
+    async_prepare_integration,
+    build_mixed_fleet,
+    create_entry,
+    running_hass,
+)
+from .replay import percentiles
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RATES = (100, 500, 1000, 2000, 5000)
+# Interval of the loop lag probe
+LAG_INTERVAL = 0.01
+# Events dispatched between yields to the loop in a stream
+STREAM_SLICE = 0.005
+
+# Component, capability, attribute, value and unit of an event of a device
+type EventSpec = tuple[str, str, str, Any, str | None]
+
+
+@dataclass
+class Counters:
+    """Count the state writes and the state changes they caused."""
+
+    writes: int = 0
+    changes: int = 0
+    lags: list[float] = field(default_factory=list)
+
+    def reset(self) -> None:
+        """Start counting again."""
+        self.writes = self.changes = 0
+        self.lags = []
+
+
+@contextmanager
+def count_state_writes(hass: HomeAssistant, counters: Counters) -> Iterator[None]:
+    """Count every state write and state change while active."""
+    set_internal = StateMachine.async_set_internal
+
+    def counting_set_internal(self: StateMachine, *args: Any, **kwargs: Any) -> None:
+        counters.writes += 1
+        set_internal(self, *args, **kwargs)
+
+    @callback
+    def count_change(event: Event) -> None:
+        counters.changes += 1
+
+    remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, count_change)
+    try:
+        with patch.object(StateMachine, "async_set_internal", counting_set_internal):
+            yield
+    finally:
+        remove_listener()
+
+
+async def probe_loop_lag(counters: Counters) -> None:
+    """Record how late the loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        counters.lags.append(max(loop.time() - expected, 0.0))
+
+
+def encode(fleet: Fleet, device_id: str, spec: EventSpec) -> str:
+    """Return a device event as the event stream carries it."""
+    return json.dumps(
+        {
+            "eventTime": int(time.time() * 1000),
+            "eventType": "DEVICE_EVENT",
+            **device_event_payload(fleet.location_id, device_id, *spec),
+        }
+    )
+
+
+def _power(energy: int, power: float) -> dict[str, Any]:
+    """Return a power consumption report."""
+    return {
+        "energy": energy,
+        "deltaEnergy": 10,
+        "power": power,
+        "powerEnergy": 0.01,
+        "persistedEnergy": 0,
+        "energySaved": 0,
+        "start": "2026-01-01T00:00:00.000Z",
+        "end": "2026-01-01T00:00:10.000Z",
+    }
+
+
+def washer_phase_change(fleet: Fleet, burst: int) -> list[tuple[str, EventSpec]]:
+    """Return the events of every washer moving to its next phase."""
+    phase = ("wash", "rinse", "spin", "finish")[burst % 4]
+    remaining = 120 - 30 * (burst % 4)
+    state = "washerOperatingState"
+    samsung_state = "samsungce.washerOperatingState"
+    specs: list[EventSpec] = [
+        ("main", "switch", "switch", "on", None),
+        ("main", state, "machineState", "run", None),
+        ("main", state, "washerJobState", phase, None),
+        ("main", state, "operatingState", "running", None),
+        ("main", state, "remainingTime", remaining, "min"),
+        ("main", samsung_state, "washerJobState", phase, None),
+        ("main", samsung_state, "remainingTime", remaining, "min"),
+        ("main", samsung_state, "progress", 100 - remaining // 2, "%"),
+        (
+            "main",
+            "powerConsumptionReport",
+            "powerConsumption",
+            _power(1000 + burst, 450),
+            None,
+        ),
+    ]
+    return [
+        (device.device_id, spec)
+        for device in fleet.devices.values()
+        if device.appliance == "washer"
+        for spec in specs
+    ]
+
+
+def oven_preheat(fleet: Fleet, burst: int) -> list[tuple[str, EventSpec]]:
+    """Return the events of every oven heating up a step."""
+    temperature = min(22 + 30 * burst, 200)
+    specs: list[EventSpec] = [
+        ("main", "switch", "switch", "on", None),
+        ("main", "ovenOperatingState", "machineState", "running", None),
+        ("main", "ovenOperatingState", "ovenJobState", "preheat", None),
+        ("main", "ovenOperatingState", "operatingState", "running", None),
+        ("main", "ovenSetpoint", "ovenSetpoint", 200, "C"),
+        ("main", "samsungce.ovenMode", "ovenMode", "Bake", None),
+        ("main", "temperatureMeasurement", "temperature", temperature, "C"),
+    ]
+    return [
+        (device.device_id, spec)
+        for device in fleet.devices.values()
+        if device.appliance in ("oven", "dual_oven")
+        for spec in specs
+    ]
+
+
+def power_meter_tick(fleet: Fleet, burst: int) -> list[tuple[str, EventSpec]]:
+    """Return a power report of every device that reports power."""
+    return [
+        (
+            device.device_id,
+            (
+                "main",
+                "powerConsumptionReport",
+                "powerConsumption",
+                _power(10_000 + 10 * burst, 100 + burst % 7),
+                None,
+            ),
+        )
+        for device in fleet.devices.values()
+        if "powerConsumptionReport" in device.components.get("main", {})
+    ]
+
+
+SCENARIOS: dict[str, Callable[[Fleet, int], list[tuple[str, EventSpec]]]] = {
+    "washer_phase_change": washer_phase_change,
+    "oven_preheat": oven_preheat,
+    "power_meter_tick": power_meter_tick,
+}
+
+
+class DispatchBenchmark:
+    """Feed events to the client of a set up config entry and measure them."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fleet: Fleet,
+        dispatch: Callable[[str, str], bool],
+        counters: Counters,
+        seed: int,
+    ) -> None:
+        """Initialize the benchmark."""
+        self._hass = hass
+        self._fleet = fleet
+        self._dispatch = dispatch
+        self._counters = counters
+        self._rng = random.Random(seed)
+
+    def _stream_events(self, count: int) -> list[str]:
+        """Return events cycling the attributes of random devices."""
+        devices = list(self._fleet.devices.values())
+        events = []
+        for _ in range(count):
+            device = self._rng.choice(devices)
+            events.append(
+                encode(self._fleet, device.device_id, device.next_event(self._rng))
+            )
+        return events
+
+    def _result(self, events: int, elapsed: float) -> dict[str, Any]:
+        """Return the measurements of a run."""
+        counters = self._counters
+        per_event = max(events, 1)
+        return {
+            "events": events,
+            "elapsed": round(elapsed, 4),
+            "events_per_second": round(events / elapsed, 1) if elapsed else None,
+            "state_writes": counters.writes,
+            "state_writes_per_event": round(counters.writes / per_event, 3),
+            "state_changes_per_event": round(counters.changes / per_event, 3),
+            "loop_lag_ms": percentiles(counters.lags),
+        }
+
+    async def async_stream(self, rate: float, duration: float) -> dict[str, Any]:
+        """Dispatch events at a rate and measure what was processed."""
+        events = self._stream_events(int(rate * duration))
+        loop = asyncio.get_running_loop()
+        await self._hass.async_block_till_done()
+        self._counters.reset()
+        start = loop.time()
+        started = time.perf_counter()
+        busy = 0.0
+        sent = 0
+        while sent < len(events):
+            due = min(int((loop.time() - start) * rate) + 1, len(events))
+            slice_start = time.perf_counter()
+            while sent < due:
+                self._dispatch("DEVICE_EVENT", events[sent])
+                sent += 1
+                if time.perf_counter() - slice_start > STREAM_SLICE:
+                    break
+            busy += time.perf_counter() - slice_start
+            await asyncio.sleep(max(start + sent / rate - loop.time(), 0))
+        await self._hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+        return {
+            "rate": rate,
+            "achieved_rate": round(len(events) / elapsed, 1),
+            "behind": round(max(elapsed - duration, 0.0), 4),
+            "busy": round(busy / elapsed, 3),
+            **self._result(len(events), busy),
+        }
+
+    async def async_bursts(
+        self, scenario: str, bursts: int, interval: float
+    ) -> dict[str, Any]:
+        """Dispatch bursts of a scenario and measure how long they take."""
+        build = SCENARIOS[scenario]
+        encoded = [
+            [
+                encode(self._fleet, device_id, spec)
+                for device_id, spec in build(self._fleet, burst)
+            ]
+            for burst in range(bursts)
+        ]
+        await self._hass.async_block_till_done()
+        self._counters.reset()
+        durations: list[float] = []
+        for events in encoded:
+            start = time.perf_counter()
+            for event in events:
+                self._dispatch("DEVICE_EVENT", event)
+            await self._hass.async_block_till_done()
+            durations.append(time.perf_counter() - start)
+            await asyncio.sleep(interval)
+        total = sum(len(events) for events in encoded)
+        return {
+            "scenario": scenario,
+            "bursts": bursts,
+            "events_per_burst": total // bursts if bursts else 0,
+            "burst_ms": percentiles(durations),
+            **self._result(total, sum(durations)),
+        }
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Set up a fleet and run every stream and burst scenario."""
+    fleet = build_mixed_fleet(args.size, args.seed)
+    counters = Counters()
+    async with running_hass(fleet) as (hass, cloud):
+        component = await async_prepare_integration(hass)
+        entry = create_entry(fleet)
+        await async_add_entry(hass, cloud, component, entry)
+        client = entry.runtime_data.client
+        benchmark = DispatchBenchmark(
+            hass,
+            fleet,
+            client._dispatch_event,  # noqa: SLF001
+            counters,
+            args.seed,
+        )
+        probe = asyncio.create_task(probe_loop_lag(counters))
+        try:
+            with count_state_writes(hass, counters):
+                streams = []
+                for rate in args.rates:
+                    _LOGGER.info("Dispatching %s events per second", rate)
+                    streams.append(await benchmark.async_stream(rate, args.duration))
+                bursts = []
+                for scenario in SCENARIOS:
+                    _LOGGER.info("Dispatching bursts of %s", scenario)
+                    bursts.append(
+                        await benchmark.async_bursts(
+                            scenario, args.bursts, args.interval
+                        )
+                    )
+        finally:
+            probe.cancel()
+        listeners = entry.runtime_data.dispatcher.listener_count
+        await hass.config_entries.async_unload(entry.entry_id)
+    return {
+        "benchmark": "dispatch",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "devices": len(fleet.devices),
+        "listeners": listeners,
+        "seed": args.seed,
+        "streams": streams,
+        "bursts": bursts,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100, help="devices in the fleet")
+    parser.add_argument("--rates", type=float, nargs="+", default=list(DEFAULT_RATES))
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="seconds of every stream"
+    )
+    parser.add_argument("--bursts", type=int, default=10, help="bursts per scenario")
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="seconds between bursts"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="file to write, or stdout")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark and write the results as JSON."""
+    args = parse_args()
+    logging.getLogger("homeassistant").setLevel(logging.WARNING)
+    result = json.dumps(asyncio.run(async_main(args)), indent=2)
+    if args.output is None:
+        print(result)  # noqa: T201
+    else:
+        args.output.write_text(result + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,25 @@
+"""Fake SmartThings cloud for load and integration testing.
+
+Serves a synthetic fleet of washers, dryers, dishwashers, ovens and air
+conditioners over the endpoints the integration uses, including the event
+stream. Clients reach it through a session that redirects the SmartThings
+API host::
+
+    fleet = build_fleet(washers=50, ovens=10)
+    async with FakeCloud(fleet, event_rate=20) as cloud:
+        client = SmartThings(session=cloud.client_session())
+"""
+
+from .fleet import APPLIANCES, FakeDevice, Fleet, build_fleet, load_template
+from .server import FakeCloud, device_event_payload, redirect_request_class
+
+__all__ = [
+    "APPLIANCES",
+    "FakeCloud",
+    "FakeDevice",
+    "Fleet",
+    "build_fleet",
+    "device_event_payload",
+    "load_template",
+    "redirect_request_class",
+]
@@ -0,0 +1,63 @@
+"""Run the fake SmartThings cloud.
+
+Example::
+
+    python -m benchmarks.fake_cloud --washers 100 --ovens 20 --rate 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from .fleet import build_fleet
+from .server import FakeCloud
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--washers", type=int, default=1)
+    parser.add_argument("--dryers", type=int, default=1)
+    parser.add_argument("--dishwashers", type=int, default=1)
+    parser.add_argument("--ovens", type=int, default=1)
+    parser.add_argument("--dual-ovens", type=int, default=0)
+    parser.add_argument("--air-conditioners", type=int, default=0)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="events per second over the fleet"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Serve the fleet until interrupted."""
+    fleet = build_fleet(
+        washers=args.washers,
+        dryers=args.dryers,
+        dishwashers=args.dishwashers,
+        ovens=args.ovens,
+        dual_ovens=args.dual_ovens,
+        air_conditioners=args.air_conditioners,
+        seed=args.seed,
+    )
+    async with FakeCloud(
+        fleet, event_rate=args.rate, host=args.host, port=args.port, seed=args.seed
+    ) as cloud:
+        _LOGGER.info(
+            "Serving %s devices of location %s at %s",
+            len(fleet.devices),
+            fleet.location_id,
+            cloud.base_url,
+        )
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parse_args()))
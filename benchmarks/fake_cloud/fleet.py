@@ -0,0 +1,216 @@
+"""Synthetic fleets of SmartThings appliances built from templates."""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import cache
+import json
+from pathlib import Path
+import random
+from typing import Any
+import uuid
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+APPLIANCES = (
+    "washer",
+    "dryer",
+    "dishwasher",
+    "oven",
+    "dual_oven",
+    "air_conditioner",
+)
+
+ROOMS = ("Kitchen", "Laundry room", "Utility room", "Garage")
+
+
+@cache
+def load_template(appliance: str) -> dict[str, Any]:
+    """Return the template of an appliance."""
+    return json.loads((TEMPLATE_DIR / f"{appliance}.json").read_text())
+
+
+@dataclass
+class FakeDevice:
+    """A device of the fake cloud with its live status."""
+
+    device_id: str
+    appliance: str
+    label: str
+    room_id: str | None
+    components: dict[str, dict[str, dict[str, Any]]]
+    online: bool = True
+    # Position in the value cycle of every event template
+    event_positions: list[int] = field(default_factory=list)
+    # Device as returned by the cloud, for devices loaded from a recording
+    info: dict[str, Any] | None = None
+
+    @property
+    def template(self) -> dict[str, Any]:
+        """Return the template the device was built from."""
+        return load_template(self.appliance)
+
+    def description(self, location_id: str) -> dict[str, Any]:
+        """Return the device as returned by the devices endpoint."""
+        if self.info is not None:
+            return {
+                **self.info,
+                "deviceId": self.device_id,
+                "label": self.label,
+                "locationId": location_id,
+                "roomId": self.room_id,
+            }
+        template = self.template
+        return {
+            "deviceId": self.device_id,
+            "name": template["name"],
+            "label": self.label,
+            "manufacturerName": "Samsung Electronics",
+            "presentationId": f"DA-WM-{self.appliance.upper()}-01001",
+            "deviceManufacturerCode": "Samsung Electronics",
+            "locationId": location_id,
+            "ownerId": location_id,
+            "roomId": self.room_id,
+            "deviceTypeName": f"Samsung OCF {template['category']}",
+            "components": [
+                {
+                    "id": component_id,
+                    "label": component_id,
+                    "capabilities": [
+                        {"id": capability, "version": 1} for capability in capabilities
+                    ],
+                    "categories": [
+                        {"name": template["category"], "categoryType": "manufacturer"}
+                    ],
+                }
+                for component_id, capabilities in self.components.items()
+            ],
+            "createTime": "2026-01-01T00:00:00.000Z",
+            "profile": {"id": str(uuid.uuid5(uuid.NAMESPACE_URL, self.appliance))},
+            "ocf": {
+                "ocfDeviceType": template["ocfDeviceType"],
+                "name": template["name"],
+                "specVersion": "core.1.1.0",
+                "verticalDomainSpecVersion": "1.2.1",
+                "manufacturerName": "Samsung Electronics",
+                "modelNumber": "TP1X_DA-WM-01001|20466141|3001000100131100022B010000000000",
+                "platformVersion": "DAWIT 2.0",
+                "platformOS": "TizenRT 1.0 + IPv6",
+                "hwVersion": "MediaTek",
+                "firmwareVersion": "DA_WM_TP1_21_COMMON_30230708",
+                "vendorId": "DA-WM-01001",
+                "vendorResourceClientServerVersion": "MediaTek Release 2.230708.1",
+                "lastSignupTime": "2026-01-01T00:00:00.000Z",
+                "transferCandidate": False,
+                "additionalAuthCodeRequired": False,
+            },
+            "type": "OCF",
+            "restrictionTier": 0,
+            "allowed": [],
+            "executionContext": "CLOUD",
+        }
+
+    def status(self) -> dict[str, Any]:
+        """Return the status as returned by the status endpoint."""
+        return {"components": self.components}
+
+    def set_attribute(
+        self,
+        component_id: str,
+        capability: str,
+        attribute: str,
+        value: Any,
+        unit: str | None = None,
+    ) -> bool:
+        """Change an attribute of the status, return if the device has it."""
+        try:
+            current = self.components[component_id][capability]
+        except KeyError:
+            return False
+        state: dict[str, Any] = {"value": value, "timestamp": _timestamp()}
+        if unit is not None:
+            state["unit"] = unit
+        current[attribute] = state
+        return True
+
+    def next_event(self, rng: random.Random) -> tuple[str, str, str, Any, str | None]:
+        """Return the next change of one of the attributes the template cycles."""
+        events = self.template["events"]
+        index = rng.randrange(len(events))
+        event = events[index]
+        position = self.event_positions[index]
+        self.event_positions[index] = (position + 1) % len(event["values"])
+        return (
+            event["component"],
+            event["capability"],
+            event["attribute"],
+            event["values"][position],
+            event.get("unit"),
+        )
+
+
+@dataclass
+class Fleet:
+    """A location with rooms, scenes and devices."""
+
+    location_id: str
+    name: str
+    rooms: dict[str, str]
+    devices: dict[str, FakeDevice]
+    scenes: dict[str, str] = field(default_factory=dict)
+
+
+def build_fleet(
+    *,
+    washers: int = 0,
+    dryers: int = 0,
+    dishwashers: int = 0,
+    ovens: int = 0,
+    dual_ovens: int = 0,
+    air_conditioners: int = 0,
+    seed: int = 0,
+) -> Fleet:
+    """Build a fleet of appliances, the same seed gives the same identifiers."""
+    rng = random.Random(seed)
+
+    def identifier() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    location_id = identifier()
+    rooms = {identifier(): name for name in ROOMS}
+    room_ids = list(rooms)
+    devices: dict[str, FakeDevice] = {}
+    counts = dict(
+        zip(
+            APPLIANCES,
+            (washers, dryers, dishwashers, ovens, dual_ovens, air_conditioners),
+            strict=True,
+        )
+    )
+    for appliance, count in counts.items():
+        template = load_template(appliance)
+        for number in range(1, count + 1):
+            device_id = identifier()
+            devices[device_id] = FakeDevice(
+                device_id=device_id,
+                appliance=appliance,
+                label=f"{appliance.replace('_', ' ').capitalize()} {number}",
+                room_id=rng.choice(room_ids),
+                components=copy.deepcopy(template["components"]),
+                event_positions=[0] * len(template["events"]),
+            )
+    scenes = {identifier(): "Laundry done", identifier(): "Dinner"}
+    return Fleet(
+        location_id=location_id,
+        name="Fake home",
+        rooms=rooms,
+        devices=devices,
+        scenes=scenes,
+    )
+
+
+def _timestamp() -> str:
+    """Return the current time as the cloud formats it."""
+    return datetime.now(UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
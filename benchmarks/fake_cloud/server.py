@@ -0,0 +1,523 @@
+"""Fake SmartThings cloud serving a synthetic fleet."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import contextlib
+import json
+import logging
+import random
+import time
+from typing import Any, Self
+import uuid
+
+from aiohttp import ClientRequest, ClientSession, web
+from pysmartthings.const import API_BASE
+from yarl import URL
+
+from .fleet import FakeDevice, Fleet
+
+_LOGGER = logging.getLogger(__name__)
+
+PAGE_SIZE = 200
+KEEPALIVE_INTERVAL = 20
+MAX_SUBSCRIPTIONS = 20
+
+# Commands that set the attribute of the same name, like setOvenSetpoint
+SET_COMMAND_PREFIX = "set"
+SWITCH_COMMANDS = {"on", "off"}
+
+
+def redirect_request_class(base_url: URL) -> type[ClientRequest]:
+    """Return a request class sending SmartThings API requests to a base URL."""
+
+    class FakeCloudRequest(ClientRequest):
+        """Request that goes to the fake cloud instead of SmartThings."""
+
+        def __init__(self, method: str, url: URL, *args: Any, **kwargs: Any) -> None:
+            if url.host == API_BASE:
+                url = url.with_scheme(base_url.scheme).with_host(
+                    base_url.host or "localhost"
+                )
+                url = url.with_port(base_url.port)
+            super().__init__(method, url, *args, **kwargs)
+
+    return FakeCloudRequest
+
+
+class FakeCloud:
+    """Serve the SmartThings endpoints the integration uses for a fleet.
+
+    Devices, status, health, rooms, scenes, subscriptions, commands and the
+    event stream are served from the live status of the fleet. Events are
+    pushed to every open event stream, either on demand or at a fixed rate
+    spread over all devices.
+    """
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        *,
+        event_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the fake cloud."""
+        self.fleet = fleet
+        self.event_rate = event_rate
+        self._host = host
+        self._port = port
+        self._rng = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._event_task: asyncio.Task[None] | None = None
+        self.base_url = URL()
+        self.subscriptions: dict[str, dict[str, Any]] = {}
+        self._streams: dict[str, asyncio.Queue[bytes | None]] = {}
+        self.requests: Counter[str] = Counter()
+        self.commands: list[dict[str, Any]] = []
+        self.events_sent = 0
+
+    def _app(self) -> web.Application:
+        """Return the application with the routes of the cloud."""
+        app = web.Application(middlewares=[self._count_request])
+        app.router.add_get("/v1/locations", self._locations)
+        app.router.add_get("/v1/locations/{location_id}", self._location)
+        app.router.add_get("/v1/locations/{location_id}/rooms", self._rooms)
+        app.router.add_get("/v1/locations/{location_id}/rooms/{room_id}", self._room)
+        app.router.add_get("/v1/devices", self._devices)
+        app.router.add_get("/v1/devices/{device_id}", self._device)
+        app.router.add_get("/v1/devices/{device_id}/status", self._status)
+        app.router.add_get("/v1/devices/{device_id}/health", self._health)
+        app.router.add_post("/v1/devices/{device_id}/commands", self._command)
+        app.router.add_get("/v1/scenes", self._scenes)
+        app.router.add_post("/v1/scenes/{scene_id}/execute", self._execute_scene)
+        app.router.add_post("/subscriptions", self._create_subscription)
+        app.router.add_get("/subscriptions/{subscription_id}", self._subscription)
+        app.router.add_delete(
+            "/subscriptions/{subscription_id}", self._delete_subscription
+        )
+        app.router.add_get("/events/{subscription_id}", self._event_stream)
+        return app
+
+    async def start(self) -> None:
+        """Start serving the fleet."""
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = URL.build(scheme="http", host=host, port=port)
+        if self.event_rate > 0:
+            self._event_task = asyncio.create_task(self._push_events())
+
+    async def stop(self) -> None:
+        """Close the event streams and stop serving."""
+        if self._event_task is not None:
+            self._event_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._event_task
+        for queue in self._streams.values():
+            queue.put_nowait(None)
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> Self:
+        """Start the cloud."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Stop the cloud."""
+        await self.stop()
+
+    def client_session(self, **kwargs: Any) -> ClientSession:
+        """Return a session sending SmartThings API requests to this cloud."""
+        return ClientSession(
+            request_class=redirect_request_class(self.base_url), **kwargs
+        )
+
+    @property
+    def stream_count(self) -> int:
+        """Return the number of open event streams."""
+        return len(self._streams)
+
+    async def wait_for_stream(self, timeout: float = 10) -> None:
+        """Wait until a client opened an event stream."""
+        async with asyncio.timeout(timeout):
+            while not self._streams:
+                await asyncio.sleep(0.01)
+
+    def push_device_event(
+        self,
+        device: FakeDevice,
+        component_id: str,
+        capability: str,
+        attribute: str,
+        value: Any,
+        unit: str | None = None,
+    ) -> None:
+        """Change an attribute of a device and send the event."""
+        if not device.set_attribute(component_id, capability, attribute, value, unit):
+            return
+        self._send(
+            "DEVICE_EVENT",
+            device_event_payload(
+                self.fleet.location_id,
+                device.device_id,
+                component_id,
+                capability,
+                attribute,
+                value,
+                unit,
+            ),
+        )
+
+    def push_health_event(self, device: FakeDevice, online: bool) -> None:
+        """Change the health of a device and send the event."""
+        device.online = online
+        self._send(
+            "DEVICE_HEALTH_EVENT",
+            {
+                "deviceHealthEvent": {
+                    "eventId": str(uuid.uuid4()),
+                    "locationId": self.fleet.location_id,
+                    "ownerId": self.fleet.location_id,
+                    "ownerType": "LOCATION",
+                    "deviceId": device.device_id,
+                    "hubId": "",
+                    "status": "ONLINE" if online else "OFFLINE",
+                    "reason": "NONE",
+                }
+            },
+        )
+
+    def push_lifecycle_event(self, device_id: str, lifecycle: str) -> None:
+        """Send a lifecycle event, like CREATE or DELETE, for a device."""
+        self._send(
+            "DEVICE_LIFECYCLE_EVENT",
+            {
+                "deviceLifecycleEvent": {
+                    "lifecycle": lifecycle,
+                    "eventId": str(uuid.uuid4()),
+                    "locationId": self.fleet.location_id,
+                    "deviceId": device_id,
+                    "deviceName": device_id,
+                    "principal": "location",
+                }
+            },
+        )
+
+    def push_random_event(self) -> None:
+        """Send the next event of a random device of the fleet."""
+        if not self.fleet.devices:
+            return
+        device = self._rng.choice(list(self.fleet.devices.values()))
+        self.push_device_event(device, *device.next_event(self._rng))
+
+    def push_raw_event(self, event_type: str, data: dict[str, Any]) -> None:
+        """Send a recorded event, device events also change the status."""
+        payload = {
+            key: value
+            for key, value in data.items()
+            if key not in ("eventTime", "eventType")
+        }
+        event = payload.get("deviceEvent")
+        if event is not None and (
+            device := self.fleet.devices.get(event.get("deviceId"))
+        ):
+            device.set_attribute(
+                event["componentId"],
+                event["capability"],
+                event["attribute"],
+                event.get("value"),
+                event.get("unit"),
+            )
+        self._send(event_type, payload)
+
+    def _send(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Send an event to every open event stream."""
+        body = {
+            "eventTime": int(time.time() * 1000),
+            "eventType": event_type,
+            **payload,
+        }
+        message = f"event: {event_type}\ndata: {json.dumps(body)}\n\n".encode()
+        for queue in self._streams.values():
+            queue.put_nowait(message)
+        self.events_sent += 1
+
+    async def _push_events(self) -> None:
+        """Send events at the configured rate."""
+        interval = 1 / self.event_rate
+        loop = asyncio.get_running_loop()
+        next_event = loop.time()
+        while True:
+            now = loop.time()
+            # Catch up when the loop fell behind, so the rate holds on average
+            while next_event <= now:
+                self.push_random_event()
+                next_event += interval
+            await asyncio.sleep(next_event - now)
+
+    @web.middleware
+    async def _count_request(
+        self,
+        request: web.Request,
+        handler: Any,
+    ) -> web.StreamResponse:
+        """Count the requests per endpoint."""
+        route = request.match_info.route.resource
+        path = route.canonical if route is not None else request.path
+        self.requests[f"{request.method} {path}"] += 1
+        return await handler(request)
+
+    def _get_device(self, request: web.Request) -> FakeDevice:
+        """Return the device of a request."""
+        if (device := self.fleet.devices.get(request.match_info["device_id"])) is None:
+            raise _error(web.HTTPNotFound, "NotFoundError", "The device was not found")
+        return device
+
+    def _location_body(self) -> dict[str, Any]:
+        """Return the location of the fleet."""
+        return {
+            "locationId": self.fleet.location_id,
+            "name": self.fleet.name,
+            "countryCode": "NLD",
+            "latitude": 52.37,
+            "longitude": 4.89,
+            "regionRadius": 150,
+            "temperatureScale": "C",
+            "timeZoneId": "Europe/Amsterdam",
+            "locale": "en",
+        }
+
+    def _room_body(self, room_id: str) -> dict[str, Any]:
+        """Return a room of the fleet."""
+        return {
+            "roomId": room_id,
+            "locationId": self.fleet.location_id,
+            "name": self.fleet.rooms[room_id],
+            "backgroundImage": None,
+        }
+
+    async def _locations(self, request: web.Request) -> web.Response:
+        location = self._location_body()
+        return web.json_response(
+            {
+                "items": [
+                    {"locationId": location["locationId"], "name": location["name"]}
+                ]
+            }
+        )
+
+    async def _location(self, request: web.Request) -> web.Response:
+        return web.json_response(self._location_body())
+
+    async def _rooms(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"items": [self._room_body(room_id) for room_id in self.fleet.rooms]}
+        )
+
+    async def _room(self, request: web.Request) -> web.Response:
+        if (room_id := request.match_info["room_id"]) not in self.fleet.rooms:
+            raise _error(web.HTTPNotFound, "NotFoundError", "The room was not found")
+        return web.json_response(self._room_body(room_id))
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        devices = list(self.fleet.devices.values())
+        if device_ids := request.query.get("deviceId"):
+            wanted = set(device_ids.split(","))
+            devices = [device for device in devices if device.device_id in wanted]
+        page_size = int(request.query.get("max", PAGE_SIZE))
+        page = int(request.query.get("page", 0))
+        items = devices[page * page_size : (page + 1) * page_size]
+        links: dict[str, Any] = {}
+        if (page + 1) * page_size < len(devices):
+            links["next"] = {
+                "href": str(
+                    self.base_url.joinpath("v1/devices").with_query(
+                        max=page_size, page=page + 1
+                    )
+                )
+            }
+        return web.json_response(
+            {
+                "items": [
+                    device.description(self.fleet.location_id) for device in items
+                ],
+                "_links": links,
+            }
+        )
+
+    async def _device(self, request: web.Request) -> web.Response:
+        device = self._get_device(request)
+        return web.json_response(device.description(self.fleet.location_id))
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response(self._get_device(request).status())
+
+    async def _health(self, request: web.Request) -> web.Response:
+        device = self._get_device(request)
+        return web.json_response(
+            {
+                "deviceId": device.device_id,
+                "state": "ONLINE" if device.online else "OFFLINE",
+                "lastUpdatedDate": "2026-01-01T00:00:00.000Z",
+            }
+        )
+
+    async def _command(self, request: web.Request) -> web.Response:
+        device = self._get_device(request)
+        body = await request.json()
+        results = []
+        for command in body.get("commands", []):
+            self.commands.append({"deviceId": device.device_id, **command})
+            self._apply_command(device, command)
+            results.append({"id": str(uuid.uuid4()), "status": "ACCEPTED"})
+        return web.json_response({"results": results})
+
+    def _apply_command(self, device: FakeDevice, command: dict[str, Any]) -> None:
+        """Change the status the way the appliance would for simple commands."""
+        component_id = command.get("component", "main")
+        capability = command["capability"]
+        name = command["command"]
+        arguments = command.get("arguments", [])
+        if name in SWITCH_COMMANDS:
+            self.push_device_event(device, component_id, capability, "switch", name)
+        elif name.startswith(SET_COMMAND_PREFIX) and arguments:
+            attribute = name[len(SET_COMMAND_PREFIX) :]
+            attribute = attribute[0].lower() + attribute[1:]
+            status = device.components.get(component_id, {}).get(capability, {})
+            if attribute in status:
+                self.push_device_event(
+                    device, component_id, capability, attribute, arguments[0]
+                )
+
+    async def _scenes(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "items": [
+                    {
+                        "sceneId": scene_id,
+                        "sceneName": name,
+                        "sceneIcon": "204",
+                        "sceneColor": None,
+                        "locationId": self.fleet.location_id,
+                    }
+                    for scene_id, name in self.fleet.scenes.items()
+                ]
+            }
+        )
+
+    async def _execute_scene(self, request: web.Request) -> web.Response:
+        if request.match_info["scene_id"] not in self.fleet.scenes:
+            raise _error(web.HTTPNotFound, "NotFoundError", "The scene was not found")
+        return web.json_response({"status": "success"})
+
+    async def _create_subscription(self, request: web.Request) -> web.Response:
+        if len(self.subscriptions) >= MAX_SUBSCRIPTIONS:
+            raise _error(
+                web.HTTPUnprocessableEntity,
+                "LimitError",
+                "Reached limit of subscriptions",
+            )
+        body = await request.json()
+        subscription_id = str(uuid.uuid4())
+        subscription = {
+            "subscriptionId": subscription_id,
+            "registrationUrl": str(self.base_url.joinpath(f"events/{subscription_id}")),
+            "name": body.get("name", ""),
+            "version": body.get("version", 1),
+            "subscriptionFilters": body.get("subscriptionFilters", []),
+        }
+        self.subscriptions[subscription_id] = subscription
+        return web.json_response(subscription)
+
+    async def _subscription(self, request: web.Request) -> web.Response:
+        subscription_id = request.match_info["subscription_id"]
+        if (subscription := self.subscriptions.get(subscription_id)) is None:
+            raise _error(
+                web.HTTPNotFound, "NotFoundError", "The subscription was not found"
+            )
+        return web.json_response(subscription)
+
+    async def _delete_subscription(self, request: web.Request) -> web.Response:
+        subscription_id = request.match_info["subscription_id"]
+        self.subscriptions.pop(subscription_id, None)
+        if (queue := self._streams.get(subscription_id)) is not None:
+            queue.put_nowait(None)
+        return web.json_response({})
+
+    async def _event_stream(self, request: web.Request) -> web.StreamResponse:
+        subscription_id = request.match_info["subscription_id"]
+        if subscription_id not in self.subscriptions:
+            raise _error(
+                web.HTTPNotFound, "NotFoundError", "The subscription was not found"
+            )
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._streams[subscription_id] = queue
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(KEEPALIVE_INTERVAL):
+                        message = await queue.get()
+                except TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                await response.write(message)
+        except ConnectionResetError:
+            _LOGGER.debug("Event stream %s closed by the client", subscription_id)
+        finally:
+            if self._streams.get(subscription_id) is queue:
+                del self._streams[subscription_id]
+        return response
+
+
+def device_event_payload(
+    location_id: str,
+    device_id: str,
+    component_id: str,
+    capability: str,
+    attribute: str,
+    value: Any,
+    unit: str | None = None,
+) -> dict[str, Any]:
+    """Return the payload of a device event as sent on the event stream."""
+    event: dict[str, Any] = {
+        "eventId": str(uuid.uuid4()),
+        "locationId": location_id,
+        "ownerId": location_id,
+        "ownerType": "LOCATION",
+        "deviceId": device_id,
+        "componentId": component_id,
+        "capability": capability,
+        "attribute": attribute,
+        "value": value,
+        "valueType": type(value).__name__,
+        "stateChange": True,
+    }
+    if unit is not None:
+        event["unit"] = unit
+    return {"deviceEvent": event}
+
+
+def _error(
+    exception: type[web.HTTPClientError], code: str, message: str
+) -> web.HTTPClientError:
+    """Return an error the way the SmartThings API reports them."""
+    return exception(
+        text=json.dumps(
+            {
+                "requestId": str(uuid.uuid4()),
+                "error": {"code": code, "message": message, "details": []},
+            }
+        ),
+        content_type="application/json",
+    )
@@ -0,0 +1,178 @@
+"""Home Assistant instances with the integration set up against the fake cloud.
+
+The benchmarks that need Home Assistant start an instance in a temporary
+configuration directory with the integration linked into
+``custom_components``. The config entry gets an API session that sends
+every SmartThings request to the fake cloud, so the integration runs its
+real code path without the SmartThings cloud.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+import tempfile
+import time
+from types import MappingProxyType, ModuleType
+from typing import Any
+from unittest.mock import patch
+import uuid
+
+from homeassistant import bootstrap, loader
+from homeassistant.auth import auth_manager_from_config
+from homeassistant.config_entries import (
+    SOURCE_USER,
+    ConfigEntries,
+    ConfigEntry,
+    ConfigEntryState,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.setup import async_setup_component
+
+from .fake_cloud import APPLIANCES, FakeCloud, Fleet, build_fleet
+
+INTEGRATION_DIR = (
+    Path(__file__).parent.parent / "custom_components" / "smartthingswasher"
+)
+DOMAIN = "smartthings"
+
+# Share of every appliance in a fleet, in the order of APPLIANCES
+FLEET_MIX = {
+    "washer": 0.3,
+    "dryer": 0.2,
+    "dishwasher": 0.15,
+    "oven": 0.1,
+    "dual_oven": 0.1,
+    "air_conditioner": 0.15,
+}
+
+# Integrations set up before the config entry, so only the entry is timed
+PREREQUISITES = ("http", "auth", "websocket_api", "application_credentials")
+
+
+def fleet_mix(size: int) -> dict[str, int]:
+    """Divide a fleet size over the appliances, largest remainders first."""
+    shares = {appliance: FLEET_MIX[appliance] * size for appliance in APPLIANCES}
+    counts = {appliance: int(share) for appliance, share in shares.items()}
+    by_remainder = sorted(
+        APPLIANCES, key=lambda appliance: shares[appliance] % 1, reverse=True
+    )
+    for appliance in by_remainder[: size - sum(counts.values())]:
+        counts[appliance] += 1
+    return counts
+
+
+def build_mixed_fleet(size: int, seed: int) -> Fleet:
+    """Build a fleet of a size with the benchmark mix of appliances."""
+    counts = fleet_mix(size)
+    return build_fleet(
+        washers=counts["washer"],
+        dryers=counts["dryer"],
+        dishwashers=counts["dishwasher"],
+        ovens=counts["oven"],
+        dual_ovens=counts["dual_oven"],
+        air_conditioners=counts["air_conditioner"],
+        seed=seed,
+    )
+
+
+@contextmanager
+def config_dir() -> Iterator[Path]:
+    """Return a configuration directory with the integration installed."""
+    with tempfile.TemporaryDirectory(prefix="smartthings_benchmark_") as directory:
+        custom_components = Path(directory) / "custom_components"
+        custom_components.mkdir()
+        (custom_components / DOMAIN).symlink_to(INTEGRATION_DIR)
+        yield Path(directory)
+
+
+async def async_start_hass(directory: Path) -> HomeAssistant:
+    """Return a Home Assistant instance ready to set up config entries."""
+    hass = HomeAssistant(str(directory))
+    hass.config.skip_pip = True
+    hass.auth = await auth_manager_from_config(hass, [], [])
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    for domain in PREREQUISITES:
+        await async_setup_component(hass, domain, {})
+    return hass
+
+
+@asynccontextmanager
+async def running_hass(fleet: Fleet) -> AsyncIterator[tuple[HomeAssistant, FakeCloud]]:
+    """Run Home Assistant next to a fake cloud serving a fleet."""
+    with config_dir() as directory:
+        async with FakeCloud(fleet) as cloud:
+            hass = await async_start_hass(directory)
+            try:
+                yield hass, cloud
+            finally:
+                await hass.async_stop(force=True)
+
+
+async def async_prepare_integration(hass: HomeAssistant) -> ModuleType:
+    """Load the integration and its platforms ahead of a config entry setup."""
+    integration = await loader.async_get_integration(hass, DOMAIN)
+    component = await integration.async_get_component()
+    # Importing the platforms isn't part of the setup of an entry
+    await integration.async_get_platforms(component.PLATFORMS)
+    for platform_domain in component.PLATFORMS:
+        await async_setup_component(hass, platform_domain, {})
+    await async_setup_component(hass, DOMAIN, {})
+    config_entry_oauth2_flow.async_register_implementation(
+        hass,
+        DOMAIN,
+        config_entry_oauth2_flow.LocalOAuth2Implementation(
+            hass,
+            DOMAIN,
+            "client",
+            "secret",
+            "https://api.smartthings.com/oauth/authorize",
+            "https://auth-global.api.smartthings.com/oauth/token",
+        ),
+    )
+    return component
+
+
+def create_entry(fleet: Fleet, options: Mapping[str, Any] | None = None) -> ConfigEntry:
+    """Return a config entry for the location of a fleet."""
+    return ConfigEntry(
+        data={
+            "auth_implementation": DOMAIN,
+            "token": {
+                "access_token": "token",
+                "refresh_token": "refresh",
+                "token_type": "Bearer",
+                "expires_at": time.time() + 86400,
+                "installed_app_id": str(uuid.uuid4()),
+            },
+            "location_id": fleet.location_id,
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=3,
+        options=options or {},
+        source=SOURCE_USER,
+        subentries_data=None,
+        title=fleet.name,
+        unique_id=fleet.location_id,
+        version=3,
+    )
+
+
+async def async_add_entry(
+    hass: HomeAssistant, cloud: FakeCloud, component: ModuleType, entry: ConfigEntry
+) -> None:
+    """Set up a config entry with its API session going to the fake cloud."""
+    with patch.object(
+        component,
+        "async_get_clientsession",
+        lambda _hass: cloud.client_session(),
+    ):
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+    if entry.state is not ConfigEntryState.LOADED:
+        raise RuntimeError(f"Setup of {len(cloud.fleet.devices)} devices failed")
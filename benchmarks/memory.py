@@ -0,0 +1,158 @@
+"""Benchmark the memory held by the integration for fleets of different sizes.
+
+Every run sets up a config entry against the fake cloud with tracemalloc
+tracing. The memory allocated by the setup and still held afterwards is
+grouped by the package that allocated it, and the memory report of the
+diagnostics divides what the entry holds over the devices, the program
+catalogs and the entity classes.
+
+Example::
+
+    python -m benchmarks.memory --sizes 100 250 --output memory.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from functools import cache
+import gc
+import importlib
+import json
+import logging
+from pathlib import Path
+import platform
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.const import __version__ as HA_VERSION
+
+from .fake_cloud import Fleet
+from .harness import (
+    INTEGRATION_DIR,
+    async_add_entry,
+    async_prepare_integration,
+    build_mixed_fleet,
+    create_entry,
+    fleet_mix,
+    running_hass,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (100, 250)
+BENCHMARKS_DIR = Path(__file__).parent
+# Lines of the integration listed by the memory they allocated
+TOP_LINES = 15
+
+
+@cache
+def package_of(filename: str) -> str:
+    """Return the package of a source file, or other for the rest."""
+    path = Path(filename).resolve()
+    if path.is_relative_to(INTEGRATION_DIR.resolve()):
+        return "integration"
+    if path.is_relative_to(BENCHMARKS_DIR):
+        return "fake_cloud"
+    if "site-packages" in path.parts:
+        return path.parts[path.parts.index("site-packages") + 1]
+    return "other"
+
+
+def allocations(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> dict[str, Any]:
+    """Return the memory allocated between snapshots, by package and line."""
+    statistics = after.compare_to(before, "lineno")
+    packages: Counter[str] = Counter()
+    lines = []
+    for statistic in statistics:
+        frame = statistic.traceback[0]
+        package = package_of(frame.filename)
+        packages[package] += statistic.size_diff
+        if package == "integration":
+            lines.append(
+                (f"{Path(frame.filename).name}:{frame.lineno}", statistic.size_diff)
+            )
+    lines.sort(key=lambda line: line[1], reverse=True)
+    return {
+        "total": sum(packages.values()),
+        "packages": dict(packages.most_common()),
+        "integration_lines": dict(lines[:TOP_LINES]),
+    }
+
+
+async def async_benchmark(fleet: Fleet) -> dict[str, Any]:
+    """Set up a config entry for a fleet and measure the memory it holds."""
+    async with running_hass(fleet) as (hass, cloud):
+        component = await async_prepare_integration(hass)
+        # The report is imported now, so its import isn't traced
+        memory = await hass.async_add_import_executor_job(
+            importlib.import_module, f"{component.__name__}.memory"
+        )
+        entry = create_entry(fleet)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            await async_add_entry(hass, cloud, component, entry)
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        allocated = allocations(before, after)
+        report = memory.async_memory_report(hass, entry)
+        await hass.config_entries.async_unload(entry.entry_id)
+    devices = len(fleet.devices)
+    return {
+        "size": devices,
+        "mix": fleet_mix(devices),
+        "peak_memory": peak,
+        "allocated": allocated,
+        "allocated_per_device": allocated["total"] // devices,
+        "report": report,
+    }
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark for every fleet size."""
+    results = []
+    for size in args.sizes:
+        _LOGGER.info("Measuring the memory of %s devices", size)
+        results.append(await async_benchmark(build_mixed_fleet(size, args.seed)))
+    return {
+        "benchmark": "memory",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "seed": args.seed,
+        "results": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="file to write, or stdout")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark and write the results as JSON."""
+    args = parse_args()
+    logging.getLogger("homeassistant").setLevel(logging.WARNING)
+    result = json.dumps(asyncio.run(async_main(args)), indent=2)
+    if args.output is None:
+        print(result)  # noqa: T201
+    else:
+        args.output.write_text(result + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
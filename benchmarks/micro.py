@@ -0,0 +1,299 @@
+"""Micro benchmarks of the program catalog parsing against the corpus.
+
+Every case calls a parsing function for the payloads of the corpus in a
+loop. The loops are repeated for a number of rounds, and the minimum and
+median time per call are reported in microseconds. A run is saved as a
+baseline, and later runs are compared against it and fail when a case got
+slower than the threshold allows.
+
+Example::
+
+    python -m benchmarks.micro --save micro_baseline.json
+    python -m benchmarks.micro --compare micro_baseline.json --threshold 1.25
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import time
+from typing import Any
+
+from pysmartthings import ComponentStatus, DeviceStatus
+
+from custom_components.smartthingswasher import (
+    _parse_oven_options,
+    _process_oven_programs,
+    process_programs,
+    process_status,
+)
+from custom_components.smartthingswasher.util import (
+    get_temperature_unit,
+    time_to_minutes,
+    translate_oven_mode,
+    translate_program_course,
+)
+
+from .corpus import CorpusEntry, load_corpus
+
+# A round lasts at least this long, in seconds
+MIN_ROUND_TIME = 0.05
+DEFAULT_ROUNDS = 7
+# A case regresses when its median is this much slower than the baseline
+DEFAULT_THRESHOLD = 1.25
+
+type Status = dict[str, ComponentStatus]
+
+
+@dataclass
+class Case:
+    """A function and the arguments of every call in a loop."""
+
+    name: str
+    func: Callable[..., Any]
+    calls: list[tuple[Any, ...]]
+    # Returns fresh arguments for functions that change them
+    copy: Callable[[tuple[Any, ...]], tuple[Any, ...]] | None = None
+
+
+def build_status(entry: CorpusEntry) -> Status:
+    """Return the status of a payload as the integration gets it."""
+    return DeviceStatus.from_dict(entry.status).components
+
+
+def copy_status(args: tuple[Any, ...]) -> tuple[Any, ...]:
+    """Return a status that can be changed without changing the original."""
+    status: Status = args[0]
+    return ({component: dict(status[component]) for component in status},)
+
+
+def oven_modes(entry: CorpusEntry) -> list[tuple[str, dict[str, Any]]]:
+    """Return the cavity and the data of every mode of an oven."""
+    modes = []
+    for component_id, capabilities in entry.status["components"].items():
+        spec = capabilities.get("samsungce.kitchenModeSpecification")
+        if spec is None:
+            continue
+        specification = spec["specification"]["value"]
+        if isinstance(specification, list):
+            specification = {"single": specification}
+        for cavity, mode_list in specification.items():
+            target = "second" if component_id == "cavity-02" else cavity
+            modes.extend((target, mode) for mode in mode_list)
+    return modes
+
+
+def course_codes(entry: CorpusEntry) -> list[str]:
+    """Return the course codes of a washer, dryer or dishwasher."""
+    codes = []
+    for capabilities in entry.status["components"].values():
+        for capability in capabilities.values():
+            if "supportedCycles" in capability:
+                codes.extend(
+                    cycle["cycle"] for cycle in capability["supportedCycles"]["value"]
+                )
+            if "predefinedCourses" in capability:
+                codes.extend(
+                    course["courseName"]
+                    for course in capability["predefinedCourses"]["value"]
+                )
+            if "supportedCourses" in capability:
+                codes.extend(capability["supportedCourses"]["value"])
+    return codes
+
+
+def build_cases(corpus: list[CorpusEntry]) -> list[Case]:
+    """Build the cases for the payloads of the corpus."""
+    statuses = {entry.name: build_status(entry) for entry in corpus}
+    appliances = sorted({entry.appliance for entry in corpus})
+    ovens = [entry for entry in corpus if entry.appliance == "oven"]
+    cases = [
+        Case(
+            f"process_programs[{appliance}]",
+            process_programs,
+            [
+                (statuses[entry.name],)
+                for entry in corpus
+                if entry.appliance == appliance
+            ],
+        )
+        for appliance in appliances
+    ]
+    cases.append(
+        Case(
+            "_process_oven_programs",
+            _process_oven_programs,
+            [(statuses[entry.name],) for entry in ovens],
+        )
+    )
+    cases.extend(
+        Case(
+            f"process_status[{appliance}]",
+            process_status,
+            [
+                (statuses[entry.name],)
+                for entry in corpus
+                if entry.appliance == appliance
+            ],
+            copy=copy_status,
+        )
+        for appliance in appliances
+    )
+    mode_calls = [
+        (entry, cavity, mode) for entry in ovens for cavity, mode in oven_modes(entry)
+    ]
+    cases.append(
+        Case(
+            "_parse_oven_options",
+            _parse_oven_options,
+            [
+                (
+                    mode.get("supportedOptions", {}),
+                    get_temperature_unit(statuses[entry.name]),
+                )
+                for entry, _, mode in mode_calls
+            ],
+        )
+    )
+    cases.append(
+        Case(
+            "translate_oven_mode",
+            translate_oven_mode,
+            [(mode["mode"], cavity) for _, cavity, mode in mode_calls],
+        )
+    )
+    cases.append(
+        Case(
+            "translate_program_course",
+            translate_program_course,
+            [
+                (code,)
+                for entry in corpus
+                if entry.appliance != "oven"
+                for code in course_codes(entry)
+            ],
+        )
+    )
+    cases.append(
+        Case(
+            "time_to_minutes",
+            time_to_minutes,
+            [
+                (value,)
+                for _, _, mode in mode_calls
+                for value in mode.get("supportedOptions", {})
+                .get("operationTime", {})
+                .values()
+            ],
+        )
+    )
+    return [case for case in cases if case.calls]
+
+
+def run_round(case: Case, loops: int) -> float:
+    """Return the seconds taken by a number of loops over the calls."""
+    if case.copy is None:
+        batch = case.calls * loops
+    else:
+        batch = [case.copy(args) for _ in range(loops) for args in case.calls]
+    func = case.func
+    start = time.perf_counter()
+    for args in batch:
+        func(*args)
+    return time.perf_counter() - start
+
+
+def calibrate(case: Case) -> int:
+    """Return the loops that make a round last at least the minimum time."""
+    loops = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            if run_round(case, loops * multiplier) >= MIN_ROUND_TIME:
+                return loops * multiplier
+        loops *= 10
+
+
+def measure(case: Case, rounds: int) -> dict[str, Any]:
+    """Measure the time per call of a case in microseconds."""
+    loops = calibrate(case)
+    calls = loops * len(case.calls)
+    times = [run_round(case, loops) / calls * 1e6 for _ in range(rounds)]
+    return {
+        "calls": calls,
+        "min": round(min(times), 3),
+        "median": round(statistics.median(times), 3),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Add the ratio to the baseline to the results, return the regressions."""
+    regressions = []
+    for name, result in results.items():
+        if (reference := baseline.get(name)) is None:
+            continue
+        ratio = result["median"] / reference["median"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--filter", help="only run cases containing this text")
+    parser.add_argument("--save", type=Path, help="file to write the results to")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed ratio of the median to the baseline",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the benchmarks, print them and check them against a baseline."""
+    args = parse_args()
+    results = {
+        case.name: measure(case, args.rounds)
+        for case in build_cases(load_corpus())
+        if args.filter is None or args.filter in case.name
+    }
+    regressions = []
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline["results"], args.threshold)
+    for name, result in results.items():
+        ratio = f"{result['ratio']:>7.2f}x" if "ratio" in result else ""
+        flag = "  REGRESSION" if name in regressions else ""
+        print(  # noqa: T201
+            f"{name:40} {result['median']:>10.3f} us {result['min']:>10.3f} us"
+            f"{ratio}{flag}"
+        )
+    if args.save is not None:
+        output = {
+            "benchmark": "micro",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "rounds": args.rounds,
+            "results": results,
+        }
+        args.save.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
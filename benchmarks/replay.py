@@ -0,0 +1,299 @@
+"""Replay a recorded SmartThings event stream.
+
+Recordings are written by the ``smartthings.record_events`` action, the
+diagnostics of a config entry or a device can be replayed as well. The
+recorded devices are served by the fake cloud and the events are sent at
+their original pace, a multiple of it or as fast as possible.
+
+Example::
+
+    python -m benchmarks.replay smartthings_events_1760000000.ndjson --speed 10
+    python -m benchmarks.replay config_entry-smartthings-01J.json --max-speed
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+import uuid
+
+from pysmartthings import DeviceEvent, SmartThings
+
+from .fake_cloud import FakeCloud, FakeDevice, Fleet
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+# Time to wait for the last events after sending them
+DRAIN_TIMEOUT = 10.0
+
+# Fields of device events in diagnostics, as dumped from DeviceEvent
+DIAGNOSTICS_EVENT_FIELDS = {
+    "event_id": "eventId",
+    "location_id": "locationId",
+    "owner_id": "ownerId",
+    "device_id": "deviceId",
+    "component_id": "componentId",
+    "capability": "capability",
+    "attribute": "attribute",
+    "value": "value",
+    "data": "data",
+}
+
+
+@dataclass
+class RecordedEvent:
+    """An event of a recording."""
+
+    offset: float
+    event_type: str
+    data: dict[str, Any]
+
+
+@dataclass
+class Recording:
+    """Devices with their status and the events that followed."""
+
+    devices: list[tuple[dict[str, Any], dict[str, Any]]] = field(default_factory=list)
+    events: list[RecordedEvent] = field(default_factory=list)
+
+
+def load_recording(path: Path) -> Recording:
+    """Load a recording written by the record events action."""
+    recording = Recording()
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["type"] == "header":
+                if record["version"] > RECORDING_VERSION:
+                    raise ValueError(f"Unsupported version {record['version']}")
+            elif record["type"] == "device":
+                recording.devices.append(
+                    (record["device"], record["status"] or {"components": {}})
+                )
+            elif record["type"] == "event" and isinstance(record["data"], dict):
+                recording.events.append(
+                    RecordedEvent(
+                        record["offset"], record["event_type"], record["data"]
+                    )
+                )
+    return recording
+
+
+def load_diagnostics(path: Path) -> Recording:
+    """Load the diagnostics of a config entry or a device as a recording.
+
+    The device info and status become the devices, the buffered events of
+    every device become the events at the pace they were received.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))["data"]
+    bundles = data["devices"].values() if "devices" in data else [data]
+    recording = Recording()
+    received: list[tuple[datetime, dict[str, Any]]] = []
+    for bundle in bundles:
+        if "info" not in bundle:
+            continue
+        recording.devices.append(
+            (bundle["info"], bundle.get("status") or {"components": {}})
+        )
+        for event in bundle.get("events", []):
+            device_event = {
+                name: event[key]
+                for key, name in DIAGNOSTICS_EVENT_FIELDS.items()
+                if key in event
+            }
+            received.append((datetime.fromisoformat(event["received"]), device_event))
+    received.sort(key=lambda item: item[0])
+    if received:
+        start = received[0][0]
+        recording.events = [
+            RecordedEvent(
+                (time_received - start).total_seconds(),
+                "DEVICE_EVENT",
+                {"deviceEvent": device_event},
+            )
+            for time_received, device_event in received
+        ]
+    return recording
+
+
+def load(path: Path) -> Recording:
+    """Load a recording or diagnostics, depending on the file."""
+    if path.suffix == ".ndjson":
+        return load_recording(path)
+    return load_diagnostics(path)
+
+
+def build_recorded_fleet(recording: Recording) -> Fleet:
+    """Build a fleet serving the devices of a recording."""
+    location_id = next(
+        (info["locationId"] for info, _ in recording.devices if "locationId" in info),
+        str(uuid.uuid4()),
+    )
+    room_ids = sorted(
+        {info["roomId"] for info, _ in recording.devices if info.get("roomId")}
+    )
+    devices = {
+        info["deviceId"]: FakeDevice(
+            device_id=info["deviceId"],
+            appliance="recorded",
+            label=info.get("label") or info.get("name") or info["deviceId"],
+            room_id=info.get("roomId"),
+            components=status.get("components", {}),
+            info=info,
+        )
+        for info, status in recording.devices
+    }
+    return Fleet(
+        location_id=location_id,
+        name="Recorded home",
+        rooms={room_id: f"Room {index}" for index, room_id in enumerate(room_ids, 1)},
+        devices=devices,
+    )
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Return the percentiles of values in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def percentile(fraction: float) -> float:
+        index = min(int(fraction * len(ordered)), len(ordered) - 1)
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class Replayer:
+    """Send the events of a recording through a fake cloud.
+
+    Device events are stamped when they are sent, a listener of the client
+    under test calls ``mark_handled`` with the event id once the event is
+    handled, which gives the latency of every event.
+    """
+
+    def __init__(
+        self, cloud: FakeCloud, recording: Recording, speed: float | None
+    ) -> None:
+        """Initialize the replayer, a speed of None sends as fast as possible."""
+        self._cloud = cloud
+        self._recording = recording
+        self._speed = speed
+        self._sent: dict[str, float] = {}
+        self._handled = asyncio.Event()
+        self.latencies: list[float] = []
+        self.lags: list[float] = []
+
+    def mark_handled(self, event_id: str) -> None:
+        """Mark a device event as handled."""
+        if (sent := self._sent.pop(event_id, None)) is None:
+            return
+        self.latencies.append(time.perf_counter() - sent)
+        if not self._sent:
+            self._handled.set()
+
+    def device_event(self, event: DeviceEvent) -> None:
+        """Mark a device event of a pysmartthings client as handled."""
+        self.mark_handled(event.event_id)
+
+    async def run(self) -> dict[str, Any]:
+        """Send every event and wait until the device events are handled."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        started = time.perf_counter()
+        for event in self._recording.events:
+            if self._speed is not None:
+                scheduled = start + event.offset / self._speed
+                if (delay := scheduled - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                self.lags.append(max(loop.time() - scheduled, 0.0))
+            if (device_event := event.data.get("deviceEvent")) is not None:
+                event_id = device_event.setdefault("eventId", str(uuid.uuid4()))
+                self._sent[event_id] = time.perf_counter()
+            self._cloud.push_raw_event(event.event_type, event.data)
+            if self._speed is None:
+                # Let the stream and the client keep up
+                await asyncio.sleep(0)
+        if self._sent:
+            self._handled.clear()
+            try:
+                async with asyncio.timeout(DRAIN_TIMEOUT):
+                    await self._handled.wait()
+            except TimeoutError:
+                _LOGGER.warning("%s events weren't handled", len(self._sent))
+        duration = time.perf_counter() - started
+        return {
+            "events": len(self._recording.events),
+            "handled": len(self.latencies),
+            "lost": len(self._sent),
+            "duration": round(duration, 3),
+            "throughput": round(len(self.latencies) / duration, 1) if duration else 0,
+            "latency_ms": percentiles(self.latencies),
+            "schedule_lag_ms": percentiles(self.lags),
+        }
+
+
+async def replay(recording: Recording, speed: float | None) -> dict[str, Any]:
+    """Replay a recording to a pysmartthings client subscribed to a fake cloud."""
+    fleet = build_recorded_fleet(recording)
+    async with (
+        FakeCloud(fleet) as cloud,
+        cloud.client_session() as session,
+    ):
+        client = SmartThings(session=session)
+        client.authenticate("token")
+        replayer = Replayer(cloud, recording, speed)
+        client.add_unspecified_device_event_listener(replayer.device_event)
+        subscription = await client.create_subscription(fleet.location_id, "replay")
+        task = asyncio.create_task(
+            client.subscribe(fleet.location_id, "replay", subscription)
+        )
+        try:
+            await cloud.wait_for_stream()
+            result = await replayer.run()
+        finally:
+            task.cancel()
+    return {"devices": len(fleet.devices), **result}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", type=Path, help="recording or diagnostics file")
+    pace = parser.add_mutually_exclusive_group()
+    pace.add_argument(
+        "--speed", type=float, default=1.0, help="multiple of the original pace"
+    )
+    pace.add_argument(
+        "--max-speed", action="store_true", help="send events as fast as possible"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Replay a file and print the results as JSON."""
+    args = parse_args()
+    recording = load(args.file)
+    result = asyncio.run(replay(recording, None if args.max_speed else args.speed))
+    print(json.dumps(result, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
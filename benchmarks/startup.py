@@ -0,0 +1,153 @@
+"""Benchmark the setup of a config entry for fleets of different sizes.
+
+Every run starts a Home Assistant instance in a temporary configuration
+directory with the integration linked into ``custom_components``, and sets
+up a config entry against the fake cloud. The setup of the entry and all
+its platforms is timed, the entities, the event listeners and the peak
+memory are counted, and the results are written as JSON.
+
+Example::
+
+    python -m benchmarks.startup --sizes 10 100 500 --output startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .fake_cloud import FakeCloud, Fleet
+from .harness import (
+    async_add_entry,
+    async_prepare_integration,
+    build_mixed_fleet,
+    create_entry,
+    fleet_mix,
+    running_hass,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10, 100, 500)
+
+
+async def async_measure_setup(
+    hass: HomeAssistant, cloud: FakeCloud, trace_memory: bool
+) -> dict[str, Any]:
+    """Set up a config entry for the fleet of a cloud and measure it."""
+    component = await async_prepare_integration(hass)
+    entry = create_entry(cloud.fleet)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        await async_add_entry(hass, cloud, component, entry)
+        wall_time = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        tracemalloc.stop()
+    result = {
+        "wall_time": wall_time,
+        "peak_memory": peak_memory,
+        "devices": len(
+            dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)
+        ),
+        "entities": len(
+            er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        ),
+        "states": hass.states.async_entity_ids_count(),
+        "listeners": entry.runtime_data.dispatcher.listener_count,
+        "setup_timings": entry.runtime_data.setup_timings.as_dict(),
+        "requests": sum(cloud.requests.values()),
+    }
+    await hass.config_entries.async_unload(entry.entry_id)
+    return result
+
+
+async def async_run_setup(fleet: Fleet, trace_memory: bool) -> dict[str, Any]:
+    """Start Home Assistant and the fake cloud, and measure a setup."""
+    async with running_hass(fleet) as (hass, cloud):
+        return await async_measure_setup(hass, cloud, trace_memory)
+
+
+async def async_benchmark(size: int, repeat: int, seed: int) -> dict[str, Any]:
+    """Benchmark the setup for a fleet size."""
+    runs = [
+        await async_run_setup(build_mixed_fleet(size, seed), trace_memory=False)
+        for _ in range(repeat)
+    ]
+    # Tracing slows the setup down, so memory is measured in a run of its own
+    traced = await async_run_setup(build_mixed_fleet(size, seed), trace_memory=True)
+    wall_times = [run["wall_time"] for run in runs]
+    last = runs[-1]
+    return {
+        "size": size,
+        "mix": fleet_mix(size),
+        "wall_time": {
+            "min": round(min(wall_times), 4),
+            "median": round(statistics.median(wall_times), 4),
+            "max": round(max(wall_times), 4),
+        },
+        "peak_memory": traced["peak_memory"],
+        "devices": last["devices"],
+        "entities": last["entities"],
+        "states": last["states"],
+        "listeners": last["listeners"],
+        "requests": last["requests"],
+        "setup_timings": last["setup_timings"],
+    }
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark for every fleet size."""
+    results = []
+    for size in args.sizes:
+        _LOGGER.info("Benchmarking the setup of %s devices", size)
+        results.append(await async_benchmark(size, args.repeat, args.seed))
+    return {
+        "benchmark": "startup",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="file to write, or stdout")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark and write the results as JSON."""
+    args = parse_args()
+    logging.getLogger("homeassistant").setLevel(logging.WARNING)
+    result = json.dumps(asyncio.run(async_main(args)), indent=2)
+    if args.output is None:
+        print(result)  # noqa: T201
+    else:
+        args.output.write_text(result + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 import contextlib
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from functools import partial
 from http import HTTPStatus
 import logging
+import time
 from typing import TYPE_CHECKING, Any, cast
 
 from aiohttp import ClientResponseError
@@ -40,31 +43,40 @@ from homeassistant.const import (
     ATTR_VIA_DEVICE,
     CONF_ACCESS_TOKEN,
     CONF_TOKEN,
-    EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import Event, HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.config_entry_oauth2_flow import (
     ImplementationUnavailableError,
     OAuth2Session,
     async_get_config_entry_implementation,
 )
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
+from .connection import SmartThingsConnection
 from .const import (
     CAPABILITIES_WITH_PROGRAMS,
     CAVITY_LOWER,
     CAVITY_SECOND,
     CAVITY_SINGLE,
     CAVITY_UPPER,
-    CONF_INSTALLED_APP_ID,
+    CONF_COUNTDOWN_RESOLUTION,
+    CONF_EVENT_BUFFER_MEMORY,
+    CONF_EVENT_BUFFER_SIZE,
+    CONF_LATENCY_TRACING,
     CONF_LOCATION_ID,
     CONF_SUBSCRIPTION_ID,
+    DEFAULT_COUNTDOWN_RESOLUTION,
+    DEFAULT_EVENT_BUFFER_MEMORY,
+    DEFAULT_EVENT_BUFFER_SIZE,
     DOMAIN,
     EVENT_BUTTON,
     MAIN,
+    PROGRAM_CATALOG_ATTRIBUTES,
     PROGRAM_COURSE_NAME,
     PROGRAM_CYCLE,
     PROGRAM_CYCLE_TYPE,
@@ -78,8 +90,20 @@ from .const import (
     PROGRAM_OPTION_STEP,
     PROGRAM_SUPPORTED_OPERATIONS,
     PROGRAM_SUPPORTED_OPTIONS,
+    SIGNAL_DEVICE_UPDATED,
 )
+from .countdown import CountdownTicker
+from .dispatcher import EventDispatcher
+from .event_buffer import DeviceEventBuffer
+from .history import CycleHistory
+from .liveness import LivenessMonitor
+from .metrics import IntegrationMetrics
 from .models import CavityMode, CavityType, Program, ProgramOptions, SupportedOption
+from .recorder import EventRecorder
+from .resync import diff_status, merge_status
+from .services import async_setup_services
+from .timing import SetupTimer, get_setup_history
+from .tracing import LatencyTracer
 from .util import (
     get_temperature_unit,
     time_to_minutes,
@@ -103,6 +127,16 @@ class SmartThingsData:
     scenes: dict[str, Scene]
     rooms: dict[str, str]
     client: SmartThings
+    dispatcher: EventDispatcher
+    connection: SmartThingsConnection
+    liveness: LivenessMonitor
+    metrics: IntegrationMetrics
+    event_buffer: DeviceEventBuffer
+    tracer: LatencyTracer | None
+    setup_timings: SetupTimer
+    history: CycleHistory
+    countdown: CountdownTicker
+    recorder: EventRecorder | None = None
 
 
 @dataclass
@@ -141,6 +175,14 @@ PLATFORMS = [
     Platform.WATER_HEATER,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the SmartThings integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: SmartThingsConfigEntry) -> bool:
     """Initialize config entry which represents an installed SmartApp."""
@@ -157,13 +199,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: SmartThingsConfigEntry)
         ) from err
     session = OAuth2Session(hass, entry, implementation)
 
+    timer = SetupTimer()
+    get_setup_history(hass, entry.entry_id).append(timer)
+
     try:
-        await session.async_ensure_token_valid()
+        with timer.phase("token"):
+            await session.async_ensure_token_valid()
     except ClientResponseError as err:
         if err.status == HTTPStatus.BAD_REQUEST:
             raise ConfigEntryAuthFailed("Token not valid, trigger renewal") from err
         raise ConfigEntryNotReady from err
 
+    metrics = IntegrationMetrics(hass, entry)
+    entry.async_on_unload(metrics.start())
     client = SmartThings(session=async_get_clientsession(hass))
 
     async def _refresh_token() -> str:
@@ -175,119 +223,75 @@ async def async_setup_entry(hass: HomeAssistant, entry: SmartThingsConfigEntry)
 
     client.refresh_token_function = _refresh_token
 
-    def _handle_max_connections() -> None:
-        _LOGGER.debug(
-            "We hit the limit of max connections or we could not remove the old one, so retrying"
-        )
-        hass.config_entries.async_schedule_reload(entry.entry_id)
-
-    client.max_connections_reached_callback = _handle_max_connections
-
-    def _handle_new_subscription_identifier(identifier: str | None) -> None:
-        """Handle a new subscription identifier."""
-        hass.config_entries.async_update_entry(
-            entry,
-            data={
-                **entry.data,
-                CONF_SUBSCRIPTION_ID: identifier,
-            },
-        )
-        if identifier is not None:
-            _LOGGER.debug("Updating subscription ID to %s", identifier)
-        else:
-            _LOGGER.debug("Removing subscription ID")
-
-    client.new_subscription_id_callback = _handle_new_subscription_identifier
-
-    if (old_identifier := entry.data.get(CONF_SUBSCRIPTION_ID)) is not None:
-        _LOGGER.debug("Trying to delete old subscription %s", old_identifier)
-        try:
-            await client.delete_subscription(old_identifier)
-        except SmartThingsConnectionError as err:
-            raise ConfigEntryNotReady("Could not delete old subscription") from err
-
-    _LOGGER.debug("Trying to create a new subscription")
-    try:
-        subscription = await client.create_subscription(
-            entry.data[CONF_LOCATION_ID],
-            entry.data[CONF_TOKEN][CONF_INSTALLED_APP_ID],
-        )
-    except SmartThingsSinkError as err:
-        _LOGGER.exception("Couldn't create a new subscription")
-        raise ConfigEntryNotReady from err
-    subscription_id = subscription.subscription_id
-    _handle_new_subscription_identifier(subscription_id)
-
-    entry.async_create_background_task(
-        hass,
-        client.subscribe(
-            entry.data[CONF_LOCATION_ID],
-            entry.data[CONF_TOKEN][CONF_INSTALLED_APP_ID],
-            subscription,
-        ),
-        "smartthings_socket",
+    event_buffer = DeviceEventBuffer(
+        entry.options.get(CONF_EVENT_BUFFER_SIZE, DEFAULT_EVENT_BUFFER_SIZE),
+        entry.options.get(CONF_EVENT_BUFFER_MEMORY, DEFAULT_EVENT_BUFFER_MEMORY) * 1024,
     )
+    dispatcher = EventDispatcher(client, metrics, event_buffer)
+    if entry.options.get(CONF_LATENCY_TRACING, False):
+        dispatcher.tracer = LatencyTracer()
+        entry.async_on_unload(dispatcher.tracer.start(hass))
+    entry.async_on_unload(dispatcher.start())
+    connection = SmartThingsConnection(hass, entry, client, metrics)
+    client.max_connections_reached_callback = connection.schedule_reconnect
+    client.new_subscription_id_callback = connection.handle_new_subscription_identifier
+
+    with timer.phase("subscription"):
+        if (subscription := connection.restore_subscription()) is None:
+            try:
+                with timer.phase("subscription_delete"):
+                    await connection.async_delete_subscription()
+            except SmartThingsConnectionError as err:
+                raise ConfigEntryNotReady("Could not delete old subscription") from err
+            try:
+                with timer.phase("subscription_create"):
+                    subscription = await connection.async_create_subscription()
+            except SmartThingsSinkError as err:
+                _LOGGER.exception("Couldn't create a new subscription")
+                raise ConfigEntryNotReady from err
+            timer.details["subscription"] = "created"
+        else:
+            timer.details["subscription"] = "reused_unchecked"
+    connection.start(subscription)
+    liveness = LivenessMonitor(hass, entry, client, connection)
+    entry.async_on_unload(liveness.start())
 
     device_status: dict[str, FullDevice] = {}
     try:
-        rooms = {
-            room.room_id: room.name
-            for room in await client.get_rooms(location_id=entry.data[CONF_LOCATION_ID])
-        }
-        devices = await client.get_devices()
-        for device in devices:
-            if (
-                (main_component := device.components.get(MAIN)) is not None
-                and main_component.manufacturer_category is Category.BLUETOOTH_TRACKER
-            ):
-                device_status[device.device_id] = FullDevice(
-                    device=device,
-                    status={},
-                    programs={},
-                    selected_course = None,
-                    modes={},
-                    online=True,
+        with timer.phase("rooms"):
+            metrics.api_call("get_rooms")
+            rooms = {
+                room.room_id: room.name
+                for room in await client.get_rooms(
+                    location_id=entry.data[CONF_LOCATION_ID]
+                )
+            }
+        with timer.phase("devices"):
+            metrics.api_call("get_devices")
+            devices = await client.get_devices()
+        with timer.phase("device_status"):
+            for device in devices:
+                device_status[device.device_id] = await async_get_full_device(
+                    client, metrics, device, timer, parse_catalog=False
                 )
-                continue
-            status = process_status(await client.get_device_status(device.device_id))
-            programs = process_programs(status)
-            selected_course = set_selected_course(status)
-            oven_modes = set_oven_modes(status)
-            online = await client.get_device_health(device.device_id)
-            device_status[device.device_id] = FullDevice(
-                device=device,
-                status=status,
-                programs=programs,
-                selected_course=selected_course,
-                modes=oven_modes,
-                online=online.state == HealthStatus.ONLINE,
-            )
     except SmartThingsAuthenticationFailedError as err:
         raise ConfigEntryAuthFailed from err
 
-    device_registry = dr.async_get(hass)
-    create_devices(device_registry, device_status, entry, rooms)
-
-    scenes = {
-        scene.scene_id: scene
-        for scene in await client.get_scenes(location_id=entry.data[CONF_LOCATION_ID])
-    }
+    with timer.phase("programs"):
+        await async_parse_program_catalogs(hass, device_status.values(), timer)
 
-    def handle_deleted_device(device_id: str) -> None:
-        """Handle a deleted device."""
-        dev_entry = device_registry.async_get_device(
-            identifiers={(DOMAIN, device_id)},
-        )
-        if dev_entry is not None:
-            device_registry.async_update_device(
-                dev_entry.id, remove_config_entry_id=entry.entry_id
+    device_registry = dr.async_get(hass)
+    with timer.phase("create_devices"):
+        create_devices(device_registry, device_status, entry, rooms)
+
+    with timer.phase("scenes"):
+        metrics.api_call("get_scenes")
+        scenes = {
+            scene.scene_id: scene
+            for scene in await client.get_scenes(
+                location_id=entry.data[CONF_LOCATION_ID]
             )
-
-    entry.async_on_unload(
-        client.add_device_lifecycle_event_listener(
-            Lifecycle.DELETE, handle_deleted_device
-        )
-    )
+        }
 
     entry.runtime_data = SmartThingsData(
         devices={
@@ -298,7 +302,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: SmartThingsConfigEntry)
         client=client,
         scenes=scenes,
         rooms=rooms,
+        dispatcher=dispatcher,
+        connection=connection,
+        liveness=liveness,
+        metrics=metrics,
+        event_buffer=event_buffer,
+        tracer=dispatcher.tracer,
+        setup_timings=timer,
+        history=CycleHistory(hass, entry),
+        countdown=CountdownTicker(
+            hass,
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_COUNTDOWN_RESOLUTION, DEFAULT_COUNTDOWN_RESOLUTION
+                )
+            ),
+        ),
+    )
+
+    for lifecycle in (Lifecycle.CREATE, Lifecycle.UPDATE):
+        entry.async_on_unload(
+            client.add_device_lifecycle_event_listener(
+                lifecycle, partial(handle_new_device, hass, entry)
+            )
+        )
+    entry.async_on_unload(
+        client.add_device_lifecycle_event_listener(
+            Lifecycle.DELETE, partial(handle_deleted_device, hass, entry)
+        )
+    )
+
+    entry.async_on_unload(
+        dispatcher.add_pre_dispatch_listener(
+            partial(handle_program_catalog_event, hass, entry)
+        )
+    )
+    entry.async_on_unload(
+        client.add_unspecified_device_event_listener(
+            partial(handle_disabled_event, hass, entry)
+        )
     )
+    entry.async_on_unload(await entry.runtime_data.history.async_start())
+    entry.async_on_unload(entry.runtime_data.countdown.stop)
 
     # Events are deprecated and will be removed in 2025.10
     def handle_button_press(event: DeviceEvent) -> None:
@@ -323,15 +368,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: SmartThingsConfigEntry)
         client.add_unspecified_device_event_listener(handle_button_press)
     )
 
-    async def _handle_shutdown(_: Event) -> None:
-        """Handle shutdown."""
-        await client.delete_subscription(subscription_id)
-
-    entry.async_on_unload(
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _handle_shutdown)
-    )
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # This covers the whole setup of every platform, the platforms that plan
+    # their entities with async_setup_device_entities time only that planning
+    # in a planning_<platform> phase nested in this one
+    with timer.phase("platforms"):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     device_entries = dr.async_entries_for_config_entry(device_registry, entry.entry_id)
     for device_entry in device_entries:
@@ -340,15 +381,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: SmartThingsConfigEntry)
             for identifier in device_entry.identifiers
             if identifier[0] == DOMAIN
         )
-        if any(
+        if device_id == entry.entry_id or any(
             device_id.startswith(device_identifier)
             for device_identifier in device_status
         ):
+            # The integration health device is identified by the entry
             continue
         device_registry.async_update_device(
             device_entry.id, remove_config_entry_id=entry.entry_id
         )
 
+    timer.finish()
+    _LOGGER.debug(
+        "Setup of %s with %s devices took %.3fs: %s",
+        entry.title,
+        len(device_status),
+        timer.total,
+        timer.summary(),
+    )
     return True
 
 
@@ -357,12 +407,264 @@ async def async_unload_entry(
 ) -> bool:
     """Unload a config entry."""
     client = entry.runtime_data.client
+    if (recorder := entry.runtime_data.recorder) is not None:
+        recorder.stop()
     if (subscription_id := entry.data.get(CONF_SUBSCRIPTION_ID)) is not None:
+        entry.runtime_data.metrics.api_call("delete_subscription")
         with contextlib.suppress(SmartThingsConnectionError):
             await client.delete_subscription(subscription_id)
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+@callback
+def handle_new_device(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, device_id: str
+) -> None:
+    """Handle a created or updated device."""
+    entry.async_create_background_task(
+        hass,
+        async_add_device(hass, entry, device_id),
+        f"smartthings_add_device_{device_id}",
+    )
+
+
+async def async_add_device(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, device_id: str
+) -> None:
+    """Add a created or updated device to a loaded entry.
+
+    Only the device itself is fetched. An updated device keeps its full
+    device and status objects, which its entities hold, and is changed in
+    place. The platforms then add and remove the entities of just this device.
+    """
+    entry_data = entry.runtime_data
+    client = entry_data.client
+    metrics = entry_data.metrics
+    try:
+        metrics.api_call("get_device")
+        device = await client.get_device(device_id)
+        full_device = await async_get_full_device(client, metrics, device)
+        if (room_id := device.room_id) is not None and room_id not in entry_data.rooms:
+            metrics.api_call("get_rooms")
+            entry_data.rooms.update(
+                {
+                    room.room_id: room.name
+                    for room in await client.get_rooms(
+                        location_id=entry.data[CONF_LOCATION_ID]
+                    )
+                }
+            )
+    except SmartThingsConnectionError:
+        _LOGGER.warning("Couldn't fetch device %s", device_id)
+        return
+    create_devices(
+        dr.async_get(hass), {device_id: full_device}, entry, entry_data.rooms
+    )
+    if MAIN in full_device.status:
+        async_store_device(hass, entry, full_device)
+
+
+@callback
+def async_store_device(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, full_device: FullDevice
+) -> None:
+    """Store a fetched device on a loaded entry and plan its entities.
+
+    A known device keeps its full device and status objects, which its
+    entities hold, and is changed in place. Its programs, with the option
+    values selected at runtime, are only replaced when the catalog changed.
+    Values that changed are dispatched once the platforms added and removed
+    the entities of just this device.
+    """
+    entry_data = entry.runtime_data
+    device_id = full_device.device.device_id
+    events: list[DeviceEvent] = []
+    if (existing := entry_data.devices.get(device_id)) is not None:
+        existing.device = full_device.device
+        existing.online = full_device.online
+        events = diff_status(existing, full_device.status, entry.data[CONF_LOCATION_ID])
+        merge_status(existing.status, full_device.status)
+        if programs_changed(existing.programs, full_device.programs):
+            existing.programs = full_device.programs
+        existing.selected_course = full_device.selected_course
+        if existing.modes.keys() != full_device.modes.keys():
+            existing.modes = full_device.modes
+    else:
+        entry_data.devices[device_id] = full_device
+    entry_data.history.add_device(device_id)
+    async_dispatcher_send(hass, SIGNAL_DEVICE_UPDATED.format(entry.entry_id), device_id)
+    for event in events:
+        entry_data.dispatcher.dispatch_event(event)
+
+
+@callback
+def handle_disabled_event(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, event: DeviceEvent
+) -> None:
+    """Handle a change of the disabled components or capabilities of a device."""
+    if DISABLED_ATTRIBUTES.get(event.capability) != event.attribute:
+        return
+    if event.device_id not in entry.runtime_data.devices:
+        return
+    entry.async_create_background_task(
+        hass,
+        async_refresh_device_status(hass, entry, event.device_id),
+        f"smartthings_refresh_device_{event.device_id}",
+    )
+
+
+async def async_refresh_device_status(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, device_id: str
+) -> None:
+    """Fetch and apply the status of a known device.
+
+    Disabled components and capabilities were dropped from the status, so
+    enabling them again needs the full status of the device. It is processed
+    like during setup, which keeps the KEEP_CAPABILITY_QUIRK semantics.
+    """
+    entry_data = entry.runtime_data
+    entry_data.metrics.api_call("get_device_status")
+    try:
+        status = process_status(await entry_data.client.get_device_status(device_id))
+    except SmartThingsConnectionError:
+        _LOGGER.warning("Couldn't fetch the status of device %s", device_id)
+        return
+    if (device := entry_data.devices.get(device_id)) is None:
+        return
+    async_store_device(
+        hass,
+        entry,
+        FullDevice(
+            device=device.device,
+            status=status,
+            programs=process_programs(status),
+            selected_course=set_selected_course(status),
+            modes=set_oven_modes(status),
+            online=device.online,
+        ),
+    )
+
+
+@callback
+def handle_deleted_device(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, device_id: str
+) -> None:
+    """Handle a deleted device."""
+    entry_data = entry.runtime_data
+    if entry_data.devices.pop(device_id, None) is not None:
+        entry_data.liveness.remove_device(device_id)
+        entry_data.event_buffer.remove_device(device_id)
+        entry_data.history.remove_device(device_id)
+        # Let the platforms remove the entities of the device
+        async_dispatcher_send(
+            hass, SIGNAL_DEVICE_UPDATED.format(entry.entry_id), device_id
+        )
+    device_registry = dr.async_get(hass)
+    dev_entry = device_registry.async_get_device(
+        identifiers={(DOMAIN, device_id)},
+    )
+    if dev_entry is not None:
+        device_registry.async_update_device(
+            dev_entry.id, remove_config_entry_id=entry.entry_id
+        )
+
+
+@callback
+def handle_program_catalog_event(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, event: DeviceEvent
+) -> None:
+    """Rebuild the program catalog of a device when its source changed.
+
+    Only the catalog of the device of the event is parsed again. When it
+    differs from the current one, the platforms add, remove and update the
+    program entities of that device. This runs before the dispatcher hands
+    the event to the entities of the capability, so they see the new catalog.
+    """
+    if PROGRAM_CATALOG_ATTRIBUTES.get(event.capability) != event.attribute:
+        return
+    entry_data = entry.runtime_data
+    if (device := entry_data.devices.get(event.device_id)) is None:
+        return
+    try:
+        attribute_status = device.status[event.component_id][event.capability][
+            event.attribute
+        ]
+    except KeyError:
+        return
+    attribute_status.value = event.value
+    attribute_status.data = event.data
+    programs, selected_course, modes = parse_program_catalog(device.status)
+    if (
+        not programs_changed(device.programs, programs)
+        and device.modes.keys() == modes.keys()
+    ):
+        return
+    _LOGGER.debug(
+        "Program catalog of device %s changed: %s added, %s removed",
+        event.device_id,
+        len(programs.keys() - device.programs.keys()),
+        len(device.programs.keys() - programs.keys()),
+    )
+    device.programs = programs
+    if device.selected_course not in programs:
+        device.selected_course = selected_course
+    # The cavities keep their active mode unless the cavities changed
+    if device.modes.keys() != modes.keys():
+        device.modes = modes
+    async_dispatcher_send(
+        hass, SIGNAL_DEVICE_UPDATED.format(entry.entry_id), event.device_id
+    )
+
+
+async def async_get_full_device(
+    client: SmartThings,
+    metrics: IntegrationMetrics,
+    device: Device,
+    timer: SetupTimer | None = None,
+    *,
+    parse_catalog: bool = True,
+) -> FullDevice:
+    """Fetch the status of a device and build its full device.
+
+    Without parsing the catalog, the programs and modes are left empty, for
+    the setup to parse the catalogs of all devices at once.
+    """
+    if timer is None:
+        timer = SetupTimer()
+    if (
+        (main_component := device.components.get(MAIN)) is not None
+        and main_component.manufacturer_category is Category.BLUETOOTH_TRACKER
+    ):
+        return FullDevice(
+            device=device,
+            status={},
+            programs={},
+            selected_course=None,
+            modes={},
+            online=True,
+        )
+    with timer.sample("device_status"):
+        metrics.api_call("get_device_status")
+        status = process_status(await client.get_device_status(device.device_id))
+    programs: dict[str, Program] = {}
+    selected_course: str | None = None
+    oven_modes: dict[CavityType | str, CavityMode] = {}
+    if parse_catalog:
+        with timer.sample("programs"):
+            programs, selected_course, oven_modes = parse_program_catalog(status)
+    with timer.sample("device_health"):
+        metrics.api_call("get_device_health")
+        online = await client.get_device_health(device.device_id)
+    return FullDevice(
+        device=device,
+        status=status,
+        programs=programs,
+        selected_course=selected_course,
+        modes=oven_modes,
+        online=online.state == HealthStatus.ONLINE,
+    )
+
+
 def create_devices(
     device_registry: dr.DeviceRegistry,
     devices: dict[str, FullDevice],
@@ -391,8 +693,13 @@ def create_devices(
                         format_zigbee_address(device.device.hub.hub_eui),
                     )
                 )
-        if device.device.parent_device_id and device.device.parent_device_id in devices:
-            kwargs[ATTR_VIA_DEVICE] = (DOMAIN, device.device.parent_device_id)
+        if (parent_device_id := device.device.parent_device_id) and (
+            parent_device_id in devices
+            or device_registry.async_get_device(
+                identifiers={(DOMAIN, parent_device_id)}
+            )
+        ):
+            kwargs[ATTR_VIA_DEVICE] = (DOMAIN, parent_device_id)
         if (ocf := device.device.ocf) is not None:
             kwargs.update(
                 {
@@ -477,6 +784,12 @@ def create_devices(
         )
 
 
+# Attributes that decide which components and capabilities are dropped
+DISABLED_ATTRIBUTES: dict[Capability | str, Attribute] = {
+    Capability.CUSTOM_DISABLED_COMPONENTS: Attribute.DISABLED_COMPONENTS,
+    Capability.CUSTOM_DISABLED_CAPABILITIES: Attribute.DISABLED_CAPABILITIES,
+}
+
 KEEP_CAPABILITY_QUIRK: dict[
     Capability | str, Callable[[dict[Attribute | str, Status]], bool]
 ] = {
@@ -697,6 +1010,114 @@ def _process_oven_programs(status: dict[str, ComponentStatus]) -> dict[str, Prog
     return programs
 
 
+type ProgramCatalog = tuple[
+    dict[str, Program], str | None, dict[CavityType | str, CavityMode]
+]
+
+# Cycles, courses and modes up to which a catalog is parsed on the event loop,
+# where handing it to the executor costs more than parsing it
+CATALOG_INLINE_SIZE = 20
+
+
+def program_catalog_size(status: dict[str, ComponentStatus]) -> int:
+    """Return the number of cycles, courses and modes in a status."""
+    size = 0
+    for component_status in status.values():
+        for capability, attribute in PROGRAM_CATALOG_ATTRIBUTES.items():
+            if (capability_status := component_status.get(capability)) is None or (
+                attribute_status := capability_status.get(attribute)
+            ) is None:
+                continue
+            value = attribute_status.value
+            if isinstance(value, list):
+                size += len(value)
+            elif isinstance(value, dict):
+                size += sum(
+                    len(item) for item in value.values() if isinstance(item, list)
+                )
+    return size
+
+
+def programs_changed(current: dict[str, Program], fresh: dict[str, Program]) -> bool:
+    """Return if freshly parsed programs differ from the current ones.
+
+    The selected values of the options are changed at runtime, so they are
+    left out of the comparison.
+    """
+    if current.keys() != fresh.keys():
+        return True
+    for program_id, program in fresh.items():
+        current_program = current[program_id]
+        if (
+            program.program_type != current_program.program_type
+            or program.supports_start != current_program.supports_start
+            or program.supportedoptions.keys()
+            != current_program.supportedoptions.keys()
+        ):
+            return True
+        for option_id, option in program.supportedoptions.items():
+            if replace(option, selected_value=None) != replace(
+                current_program.supportedoptions[option_id], selected_value=None
+            ):
+                return True
+    return False
+
+
+def parse_program_catalog(status: dict[str, ComponentStatus]) -> ProgramCatalog:
+    """Parse the programs, the selected course and the oven modes of a status."""
+    return process_programs(status), set_selected_course(status), set_oven_modes(status)
+
+
+def _parse_program_catalogs(
+    statuses: list[dict[str, ComponentStatus]],
+) -> list[tuple[ProgramCatalog, float]]:
+    """Parse the catalogs of statuses with the time spent on each of them."""
+    results = []
+    for status in statuses:
+        start = time.perf_counter()
+        catalog = parse_program_catalog(status)
+        results.append((catalog, time.perf_counter() - start))
+    return results
+
+
+async def async_parse_program_catalogs(
+    hass: HomeAssistant, devices: Iterable[FullDevice], timer: SetupTimer
+) -> None:
+    """Parse the program catalogs of the devices of a setup.
+
+    The catalogs are parsed in a single executor job, so the specifications
+    of ovens and the courses of dishwashers don't block the event loop while
+    Home Assistant starts. Tiny catalogs are parsed inline. The devices aren't
+    stored on the entry yet, so no event changes a status being parsed.
+    """
+    inline: list[FullDevice] = []
+    offloaded: list[FullDevice] = []
+    for device in devices:
+        if program_catalog_size(device.status) > CATALOG_INLINE_SIZE:
+            offloaded.append(device)
+        else:
+            inline.append(device)
+    for device in inline:
+        with timer.sample("programs"):
+            device.programs, device.selected_course, device.modes = (
+                parse_program_catalog(device.status)
+            )
+    durations: list[float] = []
+    if offloaded:
+        results = await hass.async_add_executor_job(
+            _parse_program_catalogs, [device.status for device in offloaded]
+        )
+        for device, (catalog, duration) in zip(offloaded, results, strict=True):
+            device.programs, device.selected_course, device.modes = catalog
+            durations.append(duration)
+        timer.add_samples("programs", durations)
+    timer.details["program_catalogs"] = {
+        "inline": len(inline),
+        "offloaded": len(offloaded),
+        "loop_time_saved": round(sum(durations), 4),
+    }
+
+
 def process_programs(status: dict[str, ComponentStatus]) -> dict[str, Program]:
     """Build a program list from status."""
     programs: dict[str, Program] = {}
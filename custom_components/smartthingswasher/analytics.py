@@ -0,0 +1,333 @@
+"""Cycle statistics for SmartThings."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, tzinfo
+import math
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Quantiles reported for every metric, by name
+QUANTILES = {"median": 0.5, "p95": 0.95}
+# Decimals the metrics are reported with, durations are in minutes, energy in
+# kWh and water in L
+METRICS = {"duration": 1, "energy": 3, "water": 1}
+
+type Aggregates = tuple[dict[str, list[float]], list[int], list[int]]
+
+
+@dataclass
+class CycleColumns:
+    """Cycles as columns, one row per cycle.
+
+    Programs are stored as their code in the column cache, missing energy and
+    water readings as NaN.
+    """
+
+    start: array[float] = field(default_factory=lambda: array("d"))
+    end: array[float] = field(default_factory=lambda: array("d"))
+    program: array[int] = field(default_factory=lambda: array("l"))
+    energy: array[float] = field(default_factory=lambda: array("d"))
+    water: array[float] = field(default_factory=lambda: array("d"))
+
+    def extend(self, other: CycleColumns) -> None:
+        """Add the rows of other columns."""
+        self.start.extend(other.start)
+        self.end.extend(other.end)
+        self.program.extend(other.program)
+        self.energy.extend(other.energy)
+        self.water.extend(other.water)
+
+
+@dataclass
+class _CachedLog:
+    """The columns of a log and how far it was read."""
+
+    head: bytes
+    offset: int = 0
+    columns: CycleColumns = field(default_factory=CycleColumns)
+
+
+def parse_cycles(data: bytes) -> list[dict[str, Any]]:
+    """Return the cycles of complete log lines.
+
+    The lines are parsed as a single JSON array, which is much faster than
+    parsing them one by one. Lines cut short are skipped, by parsing the
+    lines one by one after all.
+    """
+    if not (data := data.strip()):
+        return []
+    try:
+        return orjson.loads(b"[" + data.replace(b"\n", b",") + b"]")
+    except orjson.JSONDecodeError:
+        cycles = []
+        for line in data.splitlines():
+            try:
+                cycles.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+        return cycles
+
+
+class CycleColumnCache:
+    """Keep the cycle logs as columns between statistics.
+
+    Rotated logs never change and are parsed once. The current log of a
+    device only has the lines appended since the last time parsed. A log that
+    starts with another line than before was rotated and is parsed again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self.programs: list[str | None] = []
+        self._codes: dict[str | None, int] = {}
+        self._logs: dict[Path, _CachedLog] = {}
+
+    def load(self, paths: Iterable[Path]) -> CycleColumns:
+        """Return the cycles of logs as columns."""
+        columns = CycleColumns()
+        for path in paths:
+            try:
+                file = path.open("rb")
+            except FileNotFoundError:
+                self._logs.pop(path, None)
+                continue
+            with file:
+                head = file.readline()
+                if (cached := self._logs.get(path)) is None or cached.head != head:
+                    cached = self._logs[path] = _CachedLog(head)
+                file.seek(cached.offset)
+                data = file.read()
+            # A line being appended is read the next time
+            if complete := data.rfind(b"\n") + 1:
+                self._add_cycles(cached.columns, parse_cycles(data[:complete]))
+                cached.offset += complete
+            columns.extend(cached.columns)
+        return columns
+
+    def _add_cycles(self, columns: CycleColumns, cycles: list[dict[str, Any]]) -> None:
+        """Add cycles to columns."""
+        codes = self._codes
+        for program in {cycle["program"] for cycle in cycles} - codes.keys():
+            codes[program] = len(self.programs)
+            self.programs.append(program)
+        # A column at a time, which is much faster than a cycle at a time
+        nan = math.nan
+        columns.start.extend([cycle["start"] for cycle in cycles])
+        columns.end.extend([cycle["end"] for cycle in cycles])
+        columns.program.extend([codes[cycle["program"]] for cycle in cycles])
+        columns.energy.extend(
+            [
+                nan if (value := cycle.get("energy")) is None else value
+                for cycle in cycles
+            ]
+        )
+        columns.water.extend(
+            [
+                nan if (value := cycle.get("water")) is None else value
+                for cycle in cycles
+            ]
+        )
+
+
+def day_starts(first: float, last: float, time_zone: tzinfo) -> list[float]:
+    """Return the start of every local day from the day of first to that of last."""
+    day = datetime.fromtimestamp(first, time_zone).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    starts = []
+    while (timestamp := day.timestamp()) <= last:
+        starts.append(timestamp)
+        # Adding to the wall time keeps every start at midnight across DST
+        day = (day.replace(tzinfo=None) + timedelta(days=1)).replace(tzinfo=time_zone)
+    return starts
+
+
+def _aggregate_numpy(
+    columns: CycleColumns,
+    groups: int,
+    since: float | None,
+    until: float | None,
+    time_zone: tzinfo,
+) -> tuple[Aggregates, list[float]]:
+    """Aggregate the cycles per program with NumPy.
+
+    Every metric is sorted by program and value at once, so the quantiles of
+    all programs are read from the sorted column by index, without a loop
+    over the programs.
+    """
+    start = np.frombuffer(columns.start, dtype=np.float64)
+    end = np.frombuffer(columns.end, dtype=np.float64)
+    codes = np.frombuffer(columns.program, dtype=np.dtype(columns.program.typecode))
+    metrics = {
+        "duration": (end - start) / 60,
+        "energy": np.frombuffer(columns.energy, dtype=np.float64),
+        "water": np.frombuffer(columns.water, dtype=np.float64),
+    }
+    mask = np.ones(len(start), dtype=bool)
+    if since is not None:
+        mask &= end >= since
+    if until is not None:
+        mask &= start <= until
+    if not mask.all():
+        start, codes = start[mask], codes[mask]
+        metrics = {metric: column[mask] for metric, column in metrics.items()}
+    if not len(start):
+        return ({}, [], []), []
+
+    result: dict[str, list[float]] = {}
+    for metric, column in metrics.items():
+        valid = ~np.isnan(column)
+        valid_codes, values = codes[valid], column[valid]
+        counts = np.bincount(valid_codes, minlength=groups)
+        sums = np.bincount(valid_codes, weights=values, minlength=groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[f"{metric}_mean"] = (sums / counts).tolist()
+        if not len(values):
+            for name in QUANTILES:
+                result[f"{metric}_{name}"] = [math.nan] * groups
+            continue
+        ordered = values[np.lexsort((values, valid_codes))]
+        offsets = np.cumsum(counts) - counts
+        last = np.minimum(offsets + np.maximum(counts - 1, 0), len(ordered) - 1)
+        for name, quantile in QUANTILES.items():
+            # The position within the program, interpolated like _quantile
+            position = np.maximum(counts - 1, 0) * quantile
+            floor = np.floor(position)
+            low = np.minimum(offsets + floor.astype(np.intp), last)
+            high = np.minimum(low + 1, last)
+            value = ordered[low] + (ordered[high] - ordered[low]) * (position - floor)
+            result[f"{metric}_{name}"] = np.where(counts > 0, value, np.nan).tolist()
+
+    starts = day_starts(float(start.min()), float(start.max()), time_zone)
+    days = np.searchsorted(np.asarray(starts), start, side="right") - 1
+    return (
+        result,
+        np.bincount(codes, minlength=groups).tolist(),
+        np.bincount(days, minlength=len(starts)).tolist(),
+    ), starts
+
+
+def _quantile(ordered: Sequence[float], quantile: float) -> float:
+    """Return a quantile of sorted values, interpolating linearly."""
+    position = (len(ordered) - 1) * quantile
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _aggregate_python(
+    columns: CycleColumns,
+    groups: int,
+    since: float | None,
+    until: float | None,
+    time_zone: tzinfo,
+) -> tuple[Aggregates, list[float]]:
+    """Aggregate the cycles per program without NumPy."""
+    rows = [
+        row
+        for row in range(len(columns.start))
+        if (since is None or columns.end[row] >= since)
+        and (until is None or columns.start[row] <= until)
+    ]
+    if not rows:
+        return ({}, [], []), []
+    program_counts = [0] * groups
+    buckets: dict[str, list[list[float]]] = {
+        metric: [[] for _ in range(groups)] for metric in METRICS
+    }
+    for row in rows:
+        code = columns.program[row]
+        program_counts[code] += 1
+        buckets["duration"][code].append((columns.end[row] - columns.start[row]) / 60)
+        if not math.isnan(energy := columns.energy[row]):
+            buckets["energy"][code].append(energy)
+        if not math.isnan(water := columns.water[row]):
+            buckets["water"][code].append(water)
+
+    result: dict[str, list[float]] = {}
+    for metric, metric_buckets in buckets.items():
+        for bucket in metric_buckets:
+            bucket.sort()
+        result[f"{metric}_mean"] = [
+            math.fsum(bucket) / len(bucket) if bucket else math.nan
+            for bucket in metric_buckets
+        ]
+        for name, quantile in QUANTILES.items():
+            result[f"{metric}_{name}"] = [
+                _quantile(bucket, quantile) if bucket else math.nan
+                for bucket in metric_buckets
+            ]
+
+    row_starts = [columns.start[row] for row in rows]
+    starts = day_starts(min(row_starts), max(row_starts), time_zone)
+    day_counts = [0] * len(starts)
+    for start in row_starts:
+        day_counts[bisect_right(starts, start) - 1] += 1
+    return (result, program_counts, day_counts), starts
+
+
+def cycle_statistics(
+    columns: CycleColumns,
+    programs: list[str | None],
+    since: float | None,
+    until: float | None,
+    time_zone: tzinfo,
+    *,
+    use_numpy: bool = True,
+) -> dict[str, Any]:
+    """Return the statistics per program of the cycles that ran between two times.
+
+    Durations, energy and water get their mean, median and 95th percentile,
+    and the cycles are counted per local day they started on.
+    """
+    if use_numpy and np is not None:
+        engine = "numpy"
+        aggregate = _aggregate_numpy
+    else:
+        engine = "array"
+        aggregate = _aggregate_python
+    (values, program_counts, day_counts), starts = aggregate(
+        columns, len(programs), since, until, time_zone
+    )
+
+    def _value(name: str, code: int, decimals: int) -> float | None:
+        value = values[name][code]
+        return None if math.isnan(value) else round(value, decimals)
+
+    return {
+        "cycles": sum(program_counts),
+        "engine": engine,
+        "programs": {
+            program or "unknown": {
+                "count": count,
+                **{
+                    metric: {
+                        statistic: _value(f"{metric}_{statistic}", code, decimals)
+                        for statistic in ("mean", *QUANTILES)
+                    }
+                    for metric, decimals in METRICS.items()
+                },
+            }
+            for code, (program, count) in enumerate(
+                zip(programs, program_counts, strict=False)
+            )
+            if count
+        },
+        "days": {
+            datetime.fromtimestamp(start, time_zone).date().isoformat(): count
+            for start, count in zip(starts, day_counts, strict=True)
+            if count
+        },
+    }
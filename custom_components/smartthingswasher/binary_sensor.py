@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 from typing import cast
 
 from pysmartthings import Attribute, Capability, Category, SmartThings, Status
@@ -17,11 +18,10 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import CAPABILITY_COURSES, MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 from .models import SupportedOption
 from .util import translate_program_course
 
@@ -434,11 +434,54 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add binary sensors for a config entry."""
-    entry_data = entry.runtime_data
+
+    @callback
+    def oven_status_listener(
+        sensor: SmartThingsBinarySensor, event: Event[EventStateChangedData]
+    ) -> None:
+        """Handle state changes of an oven cavity status sensor."""
+        new_state = event.data["new_state"]
+        old_state = event.data["old_state"]
+
+        if new_state is None or new_state.state in ("unknown", "unavailable"):
+            return
+
+        if old_state is not None and old_state.state == new_state.state:
+            return
+
+        device_id = sensor.device.device.device_id
+        is_divided = new_state.state == "on"
+
+        async_dispatcher_send(
+            hass, f"smartthings_oven_state_changed_{device_id}", is_divided
+        )
+
+    @callback
+    def entities_added(entities: list[SmartThingsEntity]) -> None:
+        """Follow the state of added oven cavity status sensors.
+
+        The listeners are removed together with the sensors.
+        """
+        for entity in entities:
+            if (
+                isinstance(entity, SmartThingsBinarySensor)
+                and entity.capability == Capability.CUSTOM_OVEN_CAVITY_STATUS
+            ):
+                entity.async_track_own_state(partial(oven_status_listener, entity))
+
+    async_setup_device_entities(
+        hass, entry, async_add_entities, create_entities, entities_added
+    )
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the binary sensors of devices."""
     sensor_entities: list[SmartThingsBinarySensor] = []
     program_sensor_entities: list[SmartThingsProgramBinarySensor] = []
 
-    for device in entry_data.devices.values():
+    for device in devices:
         sensor_entities.extend(
             SmartThingsBinarySensor(
                 entry_data.client,
@@ -520,45 +563,7 @@ async def async_setup_entry(
             for description in descriptions
         )
 
-    async_add_entities(sensor_entities + program_sensor_entities)
-    oven_status_sensors = [
-        ent
-        for ent in sensor_entities
-        if ent.capability == Capability.CUSTOM_OVEN_CAVITY_STATUS
-    ]
-    oven_status_entity_ids = [ent.entity_id for ent in oven_status_sensors]
-
-    @callback
-    def select_state_listener(event: Event[EventStateChangedData]) -> None:
-        """Handle state changes of the sensor entity."""
-        new_state = event.data["new_state"]
-        old_state = event.data["old_state"]
-
-        if new_state is None or new_state.state in ("unknown", "unavailable"):
-            return
-
-        if old_state is not None and old_state.state == new_state.state:
-            return
-
-        source_entity_id = event.data["entity_id"]
-        target_sensor = next(
-            (ent for ent in oven_status_sensors if ent.entity_id == source_entity_id),
-            None,
-        )
-        if target_sensor:
-            device_id = target_sensor.device.device.device_id
-            is_divided = new_state.state == "on"
-
-            async_dispatcher_send(
-                hass, f"smartthings_oven_state_changed_{device_id}", is_divided
-            )
-
-    if oven_status_entity_ids:
-        entry.async_on_unload(
-            async_track_state_change_event(
-                hass, oven_status_entity_ids, select_state_listener
-            )
-        )
+    return [*sensor_entities, *program_sensor_entities]
 
 
 class SmartThingsBinarySensor(SmartThingsEntity, BinarySensorEntity):
@@ -13,9 +13,9 @@ from homeassistant.components.button import ButtonEntity, ButtonEntityDescriptio
 from homeassistant.core import _LOGGER, HomeAssistant, ServiceValidationError
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import CAVITY_01, CAVITY_SINGLE, HOOD, MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 from .models import SupportedOption
 from .util import command_oven_mode, get_current_cavity_id
 
@@ -336,8 +336,14 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add buttons for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the buttons of devices."""
+    return [
         SmartThingsButton(
             entry_data.client,
             device,
@@ -346,7 +352,7 @@ async def async_setup_entry(
             command,
             component,
         )
-        for device in entry_data.devices.values()
+        for device in devices
         for capability, commands in CAPABILITY_TO_BUTTONS.items()
         for component, capabilities in device.status.items()
         if capability in capabilities
@@ -377,7 +383,7 @@ async def async_setup_entry(
             description.supported_fn is None
             or description.supported_fn(device, component)
         )
-    )
+    ]
 
 
 class SmartThingsButton(SmartThingsEntity, ButtonEntity):
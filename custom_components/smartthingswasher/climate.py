@@ -31,9 +31,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import DOMAIN, MAIN, UNIT_MAP
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 ATTR_OPERATION_STATE = "operation_state"
 MODE_TO_STATE = {
@@ -153,22 +153,28 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add climate entities for a config entry."""
-    entry_data = entry.runtime_data
-    entities: list[ClimateEntity] = [
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the climate entities of devices."""
+    entities: list[SmartThingsEntity] = [
         SmartThingsAirConditioner(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if all(capability in device.status[MAIN] for capability in AC_CAPABILITIES)
     ]
     entities.extend(
         SmartThingsThermostat(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if all(
             capability in device.status[MAIN] for capability in THERMOSTAT_CAPABILITIES
         )
     )
     entities.extend(
         SmartThingsHeatPumpZone(entry_data.client, device, component)
-        for device in entry_data.devices.values()
+        for device in devices
         for component in device.status
         if component in {"INDOOR", "INDOOR1", "INDOOR2"}
         and all(
@@ -176,7 +182,7 @@ async def async_setup_entry(
             for capability in HEAT_PUMP_CAPABILITIES
         )
     )
-    async_add_entities(entities)
+    return entities
 
 
 class SmartThingsThermostat(SmartThingsEntity, ClimateEntity):
@@ -5,13 +5,39 @@ import logging
 from typing import Any
 
 from pysmartthings import SmartThings
-
-from homeassistant.config_entries import SOURCE_REAUTH, ConfigFlowResult
+import voluptuous as vol
+
+from homeassistant.config_entries import (
+    SOURCE_REAUTH,
+    ConfigEntry,
+    ConfigFlowResult,
+    OptionsFlowWithReload,
+)
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_TOKEN
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.config_entry_oauth2_flow import AbstractOAuth2FlowHandler
-
-from .const import CONF_LOCATION_ID, DOMAIN, OLD_DATA, REQUESTED_SCOPES, SCOPES
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+)
+
+from .const import (
+    CONF_COUNTDOWN_RESOLUTION,
+    CONF_EVENT_BUFFER_MEMORY,
+    CONF_EVENT_BUFFER_SIZE,
+    CONF_LATENCY_TRACING,
+    CONF_LOCATION_ID,
+    DEFAULT_COUNTDOWN_RESOLUTION,
+    DEFAULT_EVENT_BUFFER_MEMORY,
+    DEFAULT_EVENT_BUFFER_SIZE,
+    DOMAIN,
+    OLD_DATA,
+    REQUESTED_SCOPES,
+    SCOPES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +49,12 @@ class SmartThingsConfigFlow(AbstractOAuth2FlowHandler, domain=DOMAIN):
     MINOR_VERSION = 3
     DOMAIN = DOMAIN
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> "OptionsFlowHandler":
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     @property
     def logger(self) -> logging.Logger:
         """Return logger."""
@@ -95,3 +127,61 @@ class SmartThingsConfigFlow(AbstractOAuth2FlowHandler, domain=DOMAIN):
                 step_id="reauth_confirm",
             )
         return await self.async_step_user()
+
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_EVENT_BUFFER_SIZE, default=DEFAULT_EVENT_BUFFER_SIZE
+        ): vol.All(
+            NumberSelector(
+                NumberSelectorConfig(min=0, max=1000, mode=NumberSelectorMode.BOX)
+            ),
+            vol.Coerce(int),
+        ),
+        vol.Required(
+            CONF_EVENT_BUFFER_MEMORY, default=DEFAULT_EVENT_BUFFER_MEMORY
+        ): vol.All(
+            NumberSelector(
+                NumberSelectorConfig(
+                    min=0,
+                    max=4096,
+                    mode=NumberSelectorMode.BOX,
+                    unit_of_measurement="KiB",
+                )
+            ),
+            vol.Coerce(int),
+        ),
+        vol.Required(CONF_LATENCY_TRACING, default=False): BooleanSelector(),
+        vol.Required(
+            CONF_COUNTDOWN_RESOLUTION, default=DEFAULT_COUNTDOWN_RESOLUTION
+        ): vol.All(
+            NumberSelector(
+                NumberSelectorConfig(
+                    min=5,
+                    max=600,
+                    mode=NumberSelectorMode.BOX,
+                    unit_of_measurement="s",
+                )
+            ),
+            vol.Coerce(int),
+        ),
+    }
+)
+
+
+class OptionsFlowHandler(OptionsFlowWithReload):
+    """Handle the options of a SmartThings config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
@@ -0,0 +1,213 @@
+"""Subscription and socket handling for SmartThings."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError, ClientResponseError
+from pysmartthings import (
+    SmartThings,
+    SmartThingsAuthenticationFailedError,
+    SmartThingsConnectionError,
+    SmartThingsError,
+    SmartThingsForbiddenError,
+    SmartThingsSinkError,
+    Subscription,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_INSTALLED_APP_ID,
+    CONF_LOCATION_ID,
+    CONF_SUBSCRIPTION_ID,
+    CONF_SUBSCRIPTION_URL,
+)
+from .resync import async_resync_devices
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+    from .metrics import IntegrationMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+RECONNECT_MIN_DELAY = 2
+RECONNECT_MAX_DELAY = 300
+
+
+class SmartThingsConnection:
+    """Keep the event socket of a config entry connected.
+
+    A lost or rejected socket is recovered by recreating only the subscription
+    and the socket, the devices and entities of the entry stay loaded.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: SmartThingsConfigEntry,
+        client: SmartThings,
+        metrics: IntegrationMetrics,
+    ) -> None:
+        """Initialize the connection."""
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._metrics = metrics
+        self._socket_task: asyncio.Task[None] | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self.reconnects = 0
+
+    @property
+    def location_id(self) -> str:
+        """Return the location the subscription is for."""
+        return self._entry.data[CONF_LOCATION_ID]
+
+    @property
+    def installed_app_id(self) -> str:
+        """Return the installed app the subscription is for."""
+        return self._entry.data[CONF_TOKEN][CONF_INSTALLED_APP_ID]
+
+    @property
+    def subscription_id(self) -> str | None:
+        """Return the identifier of the current subscription."""
+        return self._entry.data.get(CONF_SUBSCRIPTION_ID)
+
+    @callback
+    def handle_new_subscription_identifier(self, identifier: str | None) -> None:
+        """Handle a new subscription identifier.
+
+        The client only reports the identifier of a subscription it created,
+        so its registration URL is unknown and it can't be restored later.
+        This is also how a reused subscription that the cloud rejected gets
+        replaced.
+        """
+        self._store_subscription(identifier, None)
+
+    @callback
+    def _store_subscription(self, identifier: str | None, url: str | None) -> None:
+        """Store the subscription in the config entry."""
+        self._hass.config_entries.async_update_entry(
+            self._entry,
+            data={
+                **self._entry.data,
+                CONF_SUBSCRIPTION_ID: identifier,
+                CONF_SUBSCRIPTION_URL: url,
+            },
+        )
+        if identifier is not None:
+            _LOGGER.debug("Updating subscription ID to %s", identifier)
+        else:
+            _LOGGER.debug("Removing subscription ID")
+
+    @callback
+    def restore_subscription(self) -> Subscription | None:
+        """Return the stored subscription to reuse, without checking it.
+
+        This is reuse with fallback: the client has no call to look up or
+        list subscriptions, so a subscription the cloud no longer knows is
+        only noticed when opening its socket fails. The client then deletes
+        it and creates a new one, at the cost of one failed connect.
+        """
+        if (subscription_id := self.subscription_id) is None or (
+            registration_url := self._entry.data.get(CONF_SUBSCRIPTION_URL)
+        ) is None:
+            return None
+        _LOGGER.debug("Reusing subscription %s without checking it", subscription_id)
+        return Subscription(
+            subscription_id=subscription_id,
+            registration_url=registration_url,
+            name="",
+        )
+
+    async def async_delete_subscription(self) -> None:
+        """Delete the stored subscription."""
+        if (old_identifier := self.subscription_id) is not None:
+            _LOGGER.debug("Trying to delete old subscription %s", old_identifier)
+            self._metrics.api_call("delete_subscription")
+            await self._client.delete_subscription(old_identifier)
+
+    async def async_create_subscription(self) -> Subscription:
+        """Create a new subscription and store it."""
+        _LOGGER.debug("Trying to create a new subscription")
+        self._metrics.api_call("create_subscription")
+        subscription = await self._client.create_subscription(
+            self.location_id, self.installed_app_id
+        )
+        self._store_subscription(
+            subscription.subscription_id, subscription.registration_url
+        )
+        return subscription
+
+    @callback
+    def start(self, subscription: Subscription) -> None:
+        """Start the socket for a subscription."""
+        self._socket_task = self._entry.async_create_background_task(
+            self._hass,
+            self._client.subscribe(
+                self.location_id, self.installed_app_id, subscription
+            ),
+            "smartthings_socket",
+        )
+
+    @callback
+    def schedule_reconnect(self) -> None:
+        """Schedule recreating the subscription and the socket."""
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        _LOGGER.debug(
+            "We hit the limit of max connections or we could not remove the old one, so reconnecting"
+        )
+        self._reconnect_task = self._entry.async_create_background_task(
+            self._hass, self._async_reconnect(), "smartthings_reconnect"
+        )
+
+    async def _async_reconnect(self) -> None:
+        """Recreate the subscription and the socket with backoff."""
+        if self._socket_task is not None:
+            self._socket_task.cancel()
+            await asyncio.wait((self._socket_task,))
+            self._socket_task = None
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                with contextlib.suppress(SmartThingsConnectionError):
+                    await self.async_delete_subscription()
+                subscription = await self.async_create_subscription()
+            except (SmartThingsAuthenticationFailedError, SmartThingsForbiddenError):
+                _LOGGER.warning("Couldn't create a new subscription, reauthenticating")
+                self._entry.async_start_reauth(self._hass)
+                return
+            except (SmartThingsError, ClientError, TimeoutError) as err:
+                # Refreshing a token that was revoked fails with a bad request
+                if (
+                    isinstance(err, ClientResponseError)
+                    and err.status == HTTPStatus.BAD_REQUEST
+                ):
+                    self._entry.async_start_reauth(self._hass)
+                    return
+                _LOGGER.log(
+                    logging.DEBUG
+                    if isinstance(
+                        err, SmartThingsConnectionError | SmartThingsSinkError
+                    )
+                    else logging.WARNING,
+                    "Couldn't create a new subscription, retrying in %s seconds: %s",
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            break
+        self.reconnects += 1
+        self.start(subscription)
+        if self._entry.state is ConfigEntryState.LOADED:
+            # During setup the devices are fetched after the socket is started
+            await async_resync_devices(self._entry)
@@ -46,7 +46,16 @@ HOOD = "hood"
 OLD_DATA = "old_data"
 
 CONF_SUBSCRIPTION_ID = "subscription_id"
+CONF_SUBSCRIPTION_URL = "subscription_url"
+CONF_EVENT_BUFFER_SIZE = "event_buffer_size"
+CONF_EVENT_BUFFER_MEMORY = "event_buffer_memory"
+DEFAULT_EVENT_BUFFER_SIZE = 100
+DEFAULT_EVENT_BUFFER_MEMORY = 64
+CONF_LATENCY_TRACING = "latency_tracing"
+CONF_COUNTDOWN_RESOLUTION = "countdown_resolution"
+DEFAULT_COUNTDOWN_RESOLUTION = 60
 EVENT_BUTTON = "smartthings.button"
+SIGNAL_DEVICE_UPDATED = "smartthings_device_updated_{}"
 
 PROGRAM_COURSE_NAME = "courseName"
 PROGRAM_CYCLE = "cycle"
@@ -71,6 +80,25 @@ CAPABILITIES_WITH_PROGRAMS: dict[Capability, Attribute] = {
     Capability.SAMSUNG_CE_KITCHEN_MODE_SPECIFICATION: Attribute.SPECIFICATION,
 }
 
+# Attributes the program catalog of a device is parsed from
+PROGRAM_CATALOG_ATTRIBUTES: dict[Capability | str, Attribute] = {
+    Capability.CUSTOM_SUPPORTED_OPTIONS: Attribute.SUPPORTED_COURSES,
+    Capability.SAMSUNG_CE_DRYER_CYCLE: Attribute.SUPPORTED_CYCLES,
+    Capability.SAMSUNG_CE_STEAM_CLOSET_CYCLE: Attribute.SUPPORTED_CYCLES,
+    Capability.SAMSUNG_CE_WASHER_CYCLE: Attribute.SUPPORTED_CYCLES,
+    Capability.SAMSUNG_CE_DISHWASHER_WASHING_COURSE_DETAILS: Attribute.PREDEFINED_COURSES,
+    Capability.SAMSUNG_CE_KITCHEN_MODE_SPECIFICATION: Attribute.SPECIFICATION,
+}
+
+# Operating states whose machine state tells whether a cycle runs, with the
+# attribute of their job state
+CYCLE_OPERATING_STATES: dict[Capability, Attribute] = {
+    Capability.WASHER_OPERATING_STATE: Attribute.WASHER_JOB_STATE,
+    Capability.DRYER_OPERATING_STATE: Attribute.DRYER_JOB_STATE,
+    Capability.DISHWASHER_OPERATING_STATE: Attribute.DISHWASHER_JOB_STATE,
+}
+CYCLE_RUNNING_STATES = {"run", "pause"}
+
 CAPABILITY_COURSES: dict[Capability, Attribute] = {
     Capability.SAMSUNG_CE_DRYER_CYCLE: Attribute.DRYER_CYCLE,
     Capability.SAMSUNG_CE_STEAM_CLOSET_CYCLE: Attribute.STEAM_CLOSET_CYCLE,
@@ -0,0 +1,71 @@
+"""Shared countdown ticker for SmartThings."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+
+class CountdownTicker:
+    """Tick the countdowns of all running appliances together.
+
+    Countdowns are added while they run and every tick hands them the same
+    time, so all of them update at once at the resolution. The timer only
+    runs while a countdown is added, an entry without running appliances has
+    no timer at all.
+    """
+
+    def __init__(self, hass: HomeAssistant, resolution: timedelta) -> None:
+        """Initialize the ticker."""
+        self._hass = hass
+        self.resolution = resolution
+        self._countdowns: set[Callable[[float], None]] = set()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self.ticks = 0
+
+    @callback
+    def async_add(self, countdown: Callable[[float], None]) -> None:
+        """Add a countdown, starting the timer for the first one."""
+        self._countdowns.add(countdown)
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self._hass,
+                self._async_tick,
+                self.resolution,
+                name="SmartThings countdown ticker",
+            )
+
+    @callback
+    def async_remove(self, countdown: Callable[[float], None]) -> None:
+        """Remove a countdown, stopping the timer after the last one."""
+        self._countdowns.discard(countdown)
+        if not self._countdowns:
+            self.stop()
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Update every countdown."""
+        self.ticks += 1
+        timestamp = now.timestamp()
+        # A countdown that reaches zero removes itself
+        for countdown in list(self._countdowns):
+            countdown(timestamp)
+
+    @callback
+    def stop(self) -> None:
+        """Stop the timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the ticker state for diagnostics."""
+        return {
+            "resolution": self.resolution.total_seconds(),
+            "running": len(self._countdowns),
+            "ticks": self.ticks,
+        }
@@ -17,9 +17,9 @@ from homeassistant.const import ATTR_BATTERY_LEVEL
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 VALUE_TO_STATE = {
     "closed": CoverState.CLOSED,
@@ -39,13 +39,19 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add covers for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the covers of devices."""
+    return [
         SmartThingsCover(entry_data.client, device, Capability(capability))
-        for device in entry_data.devices.values()
+        for device in devices
         for capability in device.status[MAIN]
         if capability in CAPABILITIES
-    )
+    ]
 
 
 class SmartThingsCover(SmartThingsEntity, CoverEntity):
@@ -3,18 +3,20 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import asdict
 from typing import Any
 
-from pysmartthings import DeviceEvent
+from pysmartthings import SmartThingsError
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
 from . import SmartThingsConfigEntry
 from .const import DOMAIN
+from .memory import async_memory_report
+from .timing import get_setup_history
 
-EVENT_WAIT_TIME = 5
+# Devices fetched at the same time, to stay clear of the API rate limits
+DIAGNOSTICS_CONCURRENCY = 8
 
 
 async def async_get_config_entry_diagnostics(
@@ -22,35 +24,82 @@ async def async_get_config_entry_diagnostics(
     entry: SmartThingsConfigEntry,
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    client = entry.runtime_data.client
-    return {"devices": await client.get_raw_devices()}
+    entry_data = entry.runtime_data
+    # One paginated call returns the info of all devices
+    entry_data.metrics.api_call("get_raw_devices")
+    pages = await entry_data.client.get_raw_devices()
+    device_info = {
+        item["deviceId"]: item for page in pages for item in page.get("items", [])
+    }
+    semaphore = asyncio.Semaphore(DIAGNOSTICS_CONCURRENCY)
+
+    async def get_device_bundle(device_id: str) -> dict[str, Any]:
+        async with semaphore:
+            return await _async_get_device_bundle(
+                entry, device_id, device_info[device_id]
+            )
+
+    bundles = await asyncio.gather(
+        *(get_device_bundle(device_id) for device_id in device_info)
+    )
+    return {
+        "setup": [timer.as_dict() for timer in get_setup_history(hass, entry.entry_id)],
+        "liveness": entry_data.liveness.as_dict(),
+        "metrics": entry_data.metrics.as_dict(),
+        "event_buffer": entry_data.event_buffer.as_dict(),
+        "countdown": entry_data.countdown.as_dict(),
+        "latency_tracing": (
+            entry_data.tracer.as_dict() if entry_data.tracer is not None else None
+        ),
+        "memory": async_memory_report(hass, entry),
+        "devices": dict(zip(device_info, bundles, strict=True)),
+    }
 
 
 async def async_get_device_diagnostics(
     hass: HomeAssistant, entry: SmartThingsConfigEntry, device: DeviceEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a device entry."""
-    client = entry.runtime_data.client
+    entry_data = entry.runtime_data
     device_id = next(
         identifier for identifier in device.identifiers if identifier[0] == DOMAIN
     )[1]
+    if device_id == entry.entry_id:
+        return {"metrics": entry_data.metrics.as_dict()}
 
-    device_status = await client.get_raw_device_status(device_id)
-    device_info = await client.get_raw_device(device_id)
-
-    events: list[DeviceEvent] = []
+    entry_data.metrics.api_call("get_raw_device")
+    return await _async_get_device_bundle(
+        entry, device_id, await entry_data.client.get_raw_device(device_id)
+    )
 
-    def register_event(event: DeviceEvent) -> None:
-        events.append(event)
 
-    listener = client.add_device_event_listener(device_id, register_event)
-
-    await asyncio.sleep(EVENT_WAIT_TIME)
-
-    listener()
-
-    return {
-        "events": [asdict(event) for event in events],
-        "status": device_status,
-        "info": device_info,
-    }
+async def _async_get_device_bundle(
+    entry: SmartThingsConfigEntry, device_id: str, device_info: dict[str, Any]
+) -> dict[str, Any]:
+    """Return everything known about a device."""
+    entry_data = entry.runtime_data
+    client = entry_data.client
+    bundle: dict[str, Any] = {"info": device_info}
+    entry_data.metrics.api_call("get_raw_device_status")
+    entry_data.metrics.api_call("get_device_health")
+    try:
+        status, health = await asyncio.gather(
+            client.get_raw_device_status(device_id),
+            client.get_device_health(device_id),
+        )
+    except SmartThingsError as err:
+        bundle["error"] = repr(err)
+    else:
+        bundle["status"] = status
+        bundle["health"] = health.to_dict()
+    if (full_device := entry_data.devices.get(device_id)) is not None:
+        bundle["programs"] = {
+            program_id: program.to_dict()
+            for program_id, program in full_device.programs.items()
+        }
+        bundle["selected_course"] = full_device.selected_course
+        bundle["modes"] = {
+            cavity: mode.to_dict() for cavity, mode in full_device.modes.items()
+        }
+    bundle["events"] = entry_data.event_buffer.get_events(device_id)
+    return bundle
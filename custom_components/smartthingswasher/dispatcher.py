@@ -0,0 +1,165 @@
+"""Event dispatching for SmartThings entities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import TYPE_CHECKING
+
+from pysmartthings import Capability, DeviceEvent, DeviceHealthEvent, SmartThings
+
+if TYPE_CHECKING:
+    from .event_buffer import DeviceEventBuffer
+    from .metrics import IntegrationMetrics
+    from .profiler import DispatchProfiler
+    from .tracing import LatencyTracer
+
+_LOGGER = logging.getLogger(__name__)
+
+AVAILABILITY = "availability"
+
+
+class EventDispatcher:
+    """Fan out SmartThings events to the entities of a config entry.
+
+    The client delivers every device event once to the dispatcher, which then
+    routes it to the listeners registered for that device, component and
+    capability. Owning the fan-out keeps the listeners alive when the socket
+    is recreated and allows events to be injected after a resync.
+    """
+
+    def __init__(
+        self,
+        client: SmartThings,
+        metrics: IntegrationMetrics,
+        event_buffer: DeviceEventBuffer,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self._client = client
+        self._metrics = metrics
+        self._event_buffer = event_buffer
+        self._capability_listeners: dict[
+            tuple[str, str, Capability | str], list[Callable[[DeviceEvent], None]]
+        ] = {}
+        self._availability_listeners: dict[
+            str, list[Callable[[DeviceHealthEvent], None]]
+        ] = {}
+        self._availability_unsubscribers: dict[str, Callable[[], None]] = {}
+        self._pre_dispatch_listeners: list[Callable[[DeviceEvent], None]] = []
+        # Only set while the profile service runs
+        self.profiler: DispatchProfiler | None = None
+        # Only set when latency tracing is enabled in the options
+        self.tracer: LatencyTracer | None = None
+
+    @property
+    def listener_count(self) -> int:
+        """Return the number of registered listeners."""
+        return sum(
+            len(listeners) for listeners in self._capability_listeners.values()
+        ) + sum(len(listeners) for listeners in self._availability_listeners.values())
+
+    def start(self) -> Callable[[], None]:
+        """Start receiving events from the client."""
+        remove_listener = self._client.add_unspecified_device_event_listener(
+            self.dispatch_event
+        )
+
+        def stop() -> None:
+            remove_listener()
+            for unsubscribe in self._availability_unsubscribers.values():
+                unsubscribe()
+            self._availability_unsubscribers.clear()
+
+        return stop
+
+    def add_capability_listener(
+        self,
+        device_id: str,
+        component_id: str,
+        capability: Capability | str,
+        listener: Callable[[DeviceEvent], None],
+    ) -> Callable[[], None]:
+        """Add a listener for events of a capability of a device component."""
+        key = (device_id, component_id, capability)
+        self._capability_listeners.setdefault(key, []).append(listener)
+
+        def remove() -> None:
+            listeners = self._capability_listeners[key]
+            listeners.remove(listener)
+            if not listeners:
+                del self._capability_listeners[key]
+
+        return remove
+
+    def add_pre_dispatch_listener(
+        self, listener: Callable[[DeviceEvent], None]
+    ) -> Callable[[], None]:
+        """Add a listener for every device event, called before the fan-out.
+
+        These listeners update state the capability listeners depend on, so
+        the capability listeners see the event with that state up to date.
+        """
+        self._pre_dispatch_listeners.append(listener)
+        return lambda: self._pre_dispatch_listeners.remove(listener)
+
+    def add_availability_listener(
+        self, device_id: str, listener: Callable[[DeviceHealthEvent], None]
+    ) -> Callable[[], None]:
+        """Add a listener for availability events of a device."""
+        if device_id not in self._availability_unsubscribers:
+            self._availability_unsubscribers[device_id] = (
+                self._client.add_device_availability_event_listener(
+                    device_id, self.dispatch_availability
+                )
+            )
+        self._availability_listeners.setdefault(device_id, []).append(listener)
+
+        def remove() -> None:
+            listeners = self._availability_listeners[device_id]
+            listeners.remove(listener)
+            if not listeners:
+                del self._availability_listeners[device_id]
+                if (
+                    unsubscribe := self._availability_unsubscribers.pop(device_id, None)
+                ) is not None:
+                    unsubscribe()
+
+        return remove
+
+    def dispatch_event(self, event: DeviceEvent) -> None:
+        """Dispatch a device event to the listeners of its capability."""
+        self._metrics.event_received()
+        self._event_buffer.record(event)
+        for pre_dispatch_listener in self._pre_dispatch_listeners:
+            pre_dispatch_listener(event)
+        key = (event.device_id, event.component_id, event.capability)
+        if (listeners := self._capability_listeners.get(key)) is None:
+            self._metrics.dispatch_finished()
+            return
+        if (tracer := self.tracer) is not None:
+            tracer.event_started(event)
+        try:
+            # Copy, a listener can remove itself while handling the event
+            for listener in list(listeners):
+                if tracer is not None:
+                    tracer.listener_started()
+                if self.profiler is None:
+                    listener(event)
+                else:
+                    self.profiler.call(listener, event.capability, event)
+        finally:
+            self._metrics.dispatch_finished()
+            if tracer is not None:
+                tracer.event_finished()
+
+    def dispatch_availability(self, event: DeviceHealthEvent) -> None:
+        """Dispatch an availability event to the listeners of its device."""
+        self._metrics.availability_received()
+        try:
+            for listener in list(self._availability_listeners.get(event.device_id, ())):
+                if self.profiler is None:
+                    listener(event)
+                else:
+                    self.profiler.call(listener, AVAILABILITY, event)
+        finally:
+            self._metrics.dispatch_finished()
@@ -0,0 +1,190 @@
+"""Learned durations of the programs of SmartThings appliances."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import math
+from typing import Any
+
+# Durations kept per program for the quantiles
+RECENT_DURATIONS = 25
+# Cycles with options of their own before their durations are used instead of
+# the durations of the program
+MIN_OPTION_SAMPLES = 3
+# Cycles shorter than this were cancelled and aren't learned from, in seconds
+MIN_DURATION = 300
+# Cycles of a program the confidence in its duration is halved at
+CONFIDENCE_SAMPLES = 5
+
+
+def options_key(options: dict[str, Any]) -> str:
+    """Return a key for the options a cycle runs with."""
+    return ",".join(f"{option}={value}" for option, value in sorted(options.items()))
+
+
+class DurationStatistics:
+    """Running statistics of the durations of a program.
+
+    The mean and variance are updated with Welford's algorithm, so adding a
+    cycle takes constant time whatever the number of cycles. The quantiles
+    are those of the most recent cycles, so they follow a device whose
+    programs change over time.
+    """
+
+    __slots__ = ("count", "m2", "mean", "quantiles", "recent")
+
+    def __init__(
+        self,
+        count: int = 0,
+        mean: float = 0.0,
+        m2: float = 0.0,
+        recent: Iterable[float] = (),
+    ) -> None:
+        """Initialize the statistics."""
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.recent: deque[float] = deque(recent, maxlen=RECENT_DURATIONS)
+        self.quantiles: tuple[float, float, float] = (0.0, 0.0, 0.0)
+        if self.recent:
+            self._update_quantiles()
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a cycle in seconds."""
+        self.count += 1
+        delta = duration - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (duration - self.mean)
+        self.recent.append(duration)
+        self._update_quantiles()
+
+    def _update_quantiles(self) -> None:
+        """Update the 10th, 50th and 90th percentile of the recent cycles."""
+        durations = sorted(self.recent)
+        last = len(durations) - 1
+        self.quantiles = (
+            durations[round(last * 0.1)],
+            durations[round(last * 0.5)],
+            durations[round(last * 0.9)],
+        )
+
+    @property
+    def std(self) -> float:
+        """Return the standard deviation of the durations."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def confidence(self) -> float:
+        """Return how much the learned duration can be relied on, from 0 to 1.
+
+        The confidence grows with the cycles learned from and drops as the
+        durations vary more relative to their mean.
+        """
+        if not self.count or self.mean <= 0:
+            return 0.0
+        return (self.count / (self.count + CONFIDENCE_SAMPLES)) / (
+            1 + self.std / self.mean
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics to store."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "recent": list(self.recent),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DurationStatistics:
+        """Return stored statistics."""
+        return cls(data["count"], data["mean"], data["m2"], data["recent"])
+
+
+class DurationModel:
+    """Learn how long the programs of devices run.
+
+    Durations are kept for every program of a device, and for every
+    combination of options it ran with. An estimate uses the durations of the
+    options once there are enough of them, and of the program until then.
+    """
+
+    def __init__(
+        self, statistics: dict[tuple[str, ...], DurationStatistics] | None = None
+    ) -> None:
+        """Initialize the model."""
+        self._statistics = statistics or {}
+
+    def add_cycle(self, device_id: str, cycle: dict[str, Any]) -> None:
+        """Learn from a finished cycle of the cycle history."""
+        if cycle.get("partial") or cycle["program"] is None:
+            return
+        if (duration := cycle["end"] - cycle["start"]) < MIN_DURATION:
+            return
+        program = (device_id, cycle["program"])
+        for key in (program, (*program, options_key(cycle["options"]))):
+            if (statistics := self._statistics.get(key)) is None:
+                statistics = self._statistics[key] = DurationStatistics()
+            statistics.add(duration)
+
+    def statistics(
+        self, device_id: str, program: str | None, options: dict[str, Any]
+    ) -> DurationStatistics | None:
+        """Return the durations that apply to a program and its options."""
+        if program is None:
+            return None
+        options_statistics = self._statistics.get(
+            (device_id, program, options_key(options))
+        )
+        if (
+            options_statistics is not None
+            and options_statistics.count >= MIN_OPTION_SAMPLES
+        ):
+            return options_statistics
+        return self._statistics.get((device_id, program))
+
+    def remove_device(self, device_id: str) -> None:
+        """Forget the durations of a device."""
+        for key in [key for key in self._statistics if key[0] == device_id]:
+            del self._statistics[key]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the model to store."""
+        return {
+            "|".join(key): statistics.as_dict()
+            for key, statistics in self._statistics.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DurationModel:
+        """Return a stored model."""
+        return cls(
+            {
+                tuple(key.split("|", 2)): DurationStatistics.from_dict(statistics)
+                for key, statistics in data.items()
+            }
+        )
+
+
+def estimate_end(
+    started: float,
+    now: float,
+    device_end: float | None,
+    statistics: DurationStatistics | None,
+) -> float | None:
+    """Return the estimated end of a cycle.
+
+    The learned end is the start plus the median duration. It is weighed
+    against the end the device reports by the confidence in the durations,
+    less as the cycle nears its typical end, when the device knows best.
+    """
+    if statistics is None or not statistics.count:
+        return device_end
+    median = statistics.quantiles[1]
+    learned_end = max(started + median, now)
+    if device_end is None:
+        return learned_end
+    progress = min(max((now - started) / median, 0.0), 1.0)
+    weight = statistics.confidence * (1 - progress)
+    return weight * learned_end + (1 - weight) * device_end
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Callable, Iterable
+import time
+from typing import TYPE_CHECKING, Any
 
 from pysmartthings import (
     Attribute,
@@ -15,11 +17,18 @@ from pysmartthings import (
 )
 from pysmartthings.models import HealthStatus
 
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers import entity_platform, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
 
-from . import FullDevice, Program
-from .const import CAPABILITY_EXCEPTIONS, DOMAIN, MAIN
+from . import FullDevice, Program, SmartThingsConfigEntry, SmartThingsData
+from .const import CAPABILITY_EXCEPTIONS, DOMAIN, MAIN, SIGNAL_DEVICE_UPDATED
+from .metrics import IntegrationMetrics
+from .tracing import LatencyTracer
 
 
 class SmartThingsEntity(Entity):
@@ -27,6 +36,9 @@ class SmartThingsEntity(Entity):
 
     _attr_should_poll = False
     _attr_has_entity_name = True
+    _tracer: LatencyTracer | None = None
+    _metrics: IntegrationMetrics | None = None
+    _state_listener: Callable[[Event[EventStateChangedData]], None] | None = None
 
     def __init__(
         self,
@@ -62,10 +74,16 @@ class SmartThingsEntity(Entity):
     async def async_added_to_hass(self) -> None:
         """Subscribe to updates."""
         await super().async_added_to_hass()
+        if TYPE_CHECKING:
+            assert self.platform.config_entry is not None
+        entry_data = self.platform.config_entry.runtime_data
+        dispatcher = entry_data.dispatcher
+        self._tracer = dispatcher.tracer
+        self._metrics = entry_data.metrics
         for capability in self._internal_state:
             target_comp = CAPABILITY_EXCEPTIONS.get(capability, self.component)
             self.async_on_remove(
-                self.client.add_device_capability_event_listener(
+                dispatcher.add_capability_listener(
                     self.device.device.device_id,
                     target_comp,
                     capability,
@@ -73,21 +91,49 @@ class SmartThingsEntity(Entity):
                 )
             )
         self.async_on_remove(
-            self.client.add_device_availability_event_listener(
+            dispatcher.add_availability_listener(
                 self.device.device.device_id, self._availability_handler
             )
         )
+        if self._state_listener is not None:
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass, self.entity_id, self._state_listener
+                )
+            )
         self._update_attr()
 
     def _availability_handler(self, event: DeviceHealthEvent) -> None:
         self._attr_available = event.status != HealthStatus.OFFLINE
         self.async_write_ha_state()
+        if self._metrics is not None:
+            self._metrics.state_written()
 
     def _update_handler(self, event: DeviceEvent) -> None:
         self._internal_state[event.capability][event.attribute].value = event.value
         self._internal_state[event.capability][event.attribute].data = event.data
         self._handle_update()
 
+    @callback
+    def async_track_own_state(
+        self, listener: Callable[[Event[EventStateChangedData]], None]
+    ) -> None:
+        """Follow the state of the entity from when it has its entity ID.
+
+        Must be called before the entity is added. The listener is removed
+        together with the entity.
+        """
+        self._state_listener = listener
+
+    @callback
+    def async_update_from_plan(self, planned: SmartThingsEntity) -> None:
+        """Update the entity from a newly planned entity with its unique ID."""
+        if planned.program == self.program:
+            return
+        self.program = planned.program
+        if self.hass is not None:
+            self._handle_update()
+
     def supports_capability(self, capability: Capability) -> bool:
         """Test if device supports a capability."""
         return capability in self.device.status[self.component]
@@ -101,8 +147,13 @@ class SmartThingsEntity(Entity):
 
     def _handle_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._update_attr()
-        self.async_write_ha_state()
+        if self._tracer is not None and self._tracer.active:
+            self._tracer.trace_update(self)
+        else:
+            self._update_attr()
+            self.async_write_ha_state()
+        if self._metrics is not None:
+            self._metrics.state_written()
 
     async def execute_device_command(
         self,
@@ -114,6 +165,103 @@ class SmartThingsEntity(Entity):
         kwargs = {}
         if argument is not None:
             kwargs["argument"] = argument
-        await self.client.execute_device_command(
-            self.device.device.device_id, capability, command, self.component, **kwargs
+        if TYPE_CHECKING:
+            assert self.platform.config_entry is not None
+        metrics = self.platform.config_entry.runtime_data.metrics
+        metrics.api_call("execute_device_command")
+        start = time.perf_counter()
+        try:
+            await self.client.execute_device_command(
+                self.device.device.device_id,
+                capability,
+                command,
+                self.component,
+                **kwargs,
+            )
+        finally:
+            metrics.command_latency.record(time.perf_counter() - start)
+
+
+type EntityPlanner = Callable[
+    [SmartThingsData, list[FullDevice]], Iterable[SmartThingsEntity]
+]
+
+
+@callback
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    entry: SmartThingsConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+    planner: EntityPlanner,
+    entities_added_fn: Callable[[list[SmartThingsEntity]], None] | None = None,
+    entities_removed_fn: Callable[[list[SmartThingsEntity]], None] | None = None,
+) -> None:
+    """Add the entities of a platform and keep them in sync with the devices.
+
+    The planner creates the entities of the platform for the given devices. It
+    runs for all devices on setup and again for a single device whenever that
+    device is added, updated or removed. Only the entities whose unique ID
+    appeared are added and only those whose unique ID disappeared are removed,
+    the others are updated from their newly planned counterpart.
+
+    Entities of a device that is still there keep their registry entry, so a
+    transient change of the device doesn't lose the name, area or entity ID
+    the user gave them. Only entities of a removed device leave the registry.
+    """
+    entry_data = entry.runtime_data
+    entity_registry = er.async_get(hass)
+    planned: dict[str, dict[str, SmartThingsEntity]] = {}
+
+    def add_entities(entities: Iterable[SmartThingsEntity]) -> None:
+        new_entities: list[SmartThingsEntity] = []
+        for entity in entities:
+            if TYPE_CHECKING:
+                assert entity.unique_id is not None
+            device_entities = planned.setdefault(entity.device.device.device_id, {})
+            if entity.unique_id in device_entities:
+                continue
+            device_entities[entity.unique_id] = entity
+            new_entities.append(entity)
+        if not new_entities:
+            return
+        # Adding may start right away, the platform sees the entities first
+        if entities_added_fn is not None:
+            entities_added_fn(new_entities)
+        async_add_entities(new_entities)
+
+    def remove_entity(entity: SmartThingsEntity, device_removed: bool) -> None:
+        if device_removed and entity.entity_id in entity_registry.entities:
+            # Removing the registry entry also removes the entity
+            entity_registry.async_remove(entity.entity_id)
+        elif entity.hass is not None:
+            # A registered entity becomes unavailable until it is planned again
+            hass.async_create_task(entity.async_remove())
+
+    @callback
+    def plan_device(device_id: str) -> None:
+        """Plan the entities of a single device."""
+        current = planned.pop(device_id, {})
+        entities: list[SmartThingsEntity] = []
+        if (device := entry_data.devices.get(device_id)) is not None:
+            entities = list(planner(entry_data, [device]))
+        wanted = {entity.unique_id: entity for entity in entities}
+        removed: list[SmartThingsEntity] = []
+        for unique_id, entity in current.items():
+            if (planned_entity := wanted.get(unique_id)) is not None:
+                planned.setdefault(device_id, {})[unique_id] = entity
+                entity.async_update_from_plan(planned_entity)
+            else:
+                remove_entity(entity, device is None)
+                removed.append(entity)
+        if removed and entities_removed_fn is not None:
+            entities_removed_fn(removed)
+        add_entities(entities)
+
+    platform = entity_platform.async_get_current_platform()
+    with entry_data.setup_timings.phase(f"planning_{platform.domain}"):
+        add_entities(planner(entry_data, list(entry_data.devices.values())))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICE_UPDATED.format(entry.entry_id), plan_device
         )
+    )
@@ -10,8 +10,8 @@ from homeassistant.components.event import EventDeviceClass, EventEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
-from .entity import SmartThingsEntity
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 
 async def async_setup_entry(
@@ -20,15 +20,21 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add events for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the events of devices."""
+    return [
         SmartThingsButtonEvent(
             entry_data.client, device, device.device.components[component]
         )
-        for device in entry_data.devices.values()
+        for device in devices
         for component, capabilities in device.status.items()
         if Capability.BUTTON in capabilities
-    )
+    ]
 
 
 class SmartThingsButtonEvent(SmartThingsEntity, EventEntity):
@@ -0,0 +1,86 @@
+"""Recent device events for SmartThings diagnostics."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict
+import sys
+import time
+from typing import Any
+
+from pysmartthings import DeviceEvent
+
+from homeassistant.util import dt as dt_util
+
+# Rough size of an event without its value, the strings of the identifiers
+# and the dataclass itself
+EVENT_OVERHEAD = 600
+
+
+def event_size(event: DeviceEvent) -> int:
+    """Return an estimate of the memory an event takes in bytes."""
+    size = EVENT_OVERHEAD
+    for value in (event.value, event.data):
+        if isinstance(value, (dict, list)):
+            # Catalogs and option lists are the large values, their text
+            # length is close enough to what they take
+            size += len(repr(value))
+        elif value is not None:
+            size += sys.getsizeof(value)
+    return size
+
+
+class DeviceEventBuffer:
+    """Keep the last events of every device.
+
+    Every device has a ring buffer limited both in the number of events and in
+    their estimated size, the oldest events are dropped first.
+    """
+
+    def __init__(self, max_events: int, max_bytes: int) -> None:
+        """Initialize the buffer."""
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self._events: dict[str, deque[tuple[float, int, DeviceEvent]]] = {}
+        self._sizes: dict[str, int] = {}
+
+    def record(self, event: DeviceEvent) -> None:
+        """Add an event to the buffer of its device."""
+        device_id = event.device_id
+        if (events := self._events.get(device_id)) is None:
+            events = self._events[device_id] = deque()
+            self._sizes[device_id] = 0
+        size = event_size(event)
+        events.append((time.time(), size, event))
+        total = self._sizes[device_id] + size
+        while len(events) > self.max_events or (
+            total > self.max_bytes and len(events) > 1
+        ):
+            total -= events.popleft()[1]
+        self._sizes[device_id] = total
+
+    def remove_device(self, device_id: str) -> None:
+        """Forget the events of a removed device."""
+        self._events.pop(device_id, None)
+        self._sizes.pop(device_id, None)
+
+    def get_events(self, device_id: str) -> list[dict[str, Any]]:
+        """Return the buffered events of a device, oldest first."""
+        return [
+            {
+                "received": dt_util.utc_from_timestamp(received).isoformat(),
+                **asdict(event),
+            }
+            for received, _, event in self._events.get(device_id, ())
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the usage of the buffer for diagnostics."""
+        return {
+            "max_events": self.max_events,
+            "max_bytes": self.max_bytes,
+            "devices": {
+                device_id: {"events": len(events), "bytes": self._sizes[device_id]}
+                for device_id, events in self._events.items()
+            },
+        }
@@ -18,9 +18,9 @@ from homeassistant.util.percentage import (
 )
 from homeassistant.util.scaling import int_states_in_range
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 SPEED_RANGE = (1, 3)  # off is not included
 
@@ -34,10 +34,16 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add fans for a config entry."""
-    entry_data = entry.runtime_data
-    entities: list[FanEntity] = [
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the fans of devices."""
+    entities: list[SmartThingsEntity] = [
         SmartThingsFan(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if Capability.SWITCH in device.status[MAIN]
         and any(
             capability in device.status[MAIN]
@@ -50,7 +56,7 @@ async def async_setup_entry(
     ]
     entities.extend(
         SmartThingsHood(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if Capability.SWITCH in device.status[MAIN]
         and Capability.SAMSUNG_CE_HOOD_FAN_SPEED in device.status[MAIN]
         and (
@@ -60,7 +66,7 @@ async def async_setup_entry(
             == SMART
         )
     )
-    async_add_entities(entities)
+    return entities
 
 
 class SmartThingsFan(SmartThingsEntity, FanEntity):
@@ -0,0 +1,611 @@
+"""Cycle history for SmartThings."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import os
+from pathlib import Path
+import time
+from typing import IO, TYPE_CHECKING, Any
+
+import orjson
+from pysmartthings import Attribute, Capability, ComponentStatus, DeviceEvent
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .analytics import CycleColumnCache, cycle_statistics
+from .const import (
+    CAPABILITY_COURSES,
+    CYCLE_OPERATING_STATES,
+    CYCLE_RUNNING_STATES,
+    DOMAIN,
+    MAIN,
+)
+from .duration import DurationModel
+from .models import SupportedOption
+from .util import get_energy_reading, get_water_reading, translate_program_course
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_DIR = f"{DOMAIN}_cycle_history"
+SIGNAL_CYCLE_UPDATED = "smartthings_cycle_updated_{}"
+SIGNAL_CYCLE_READINGS = "smartthings_cycle_readings_{}"
+STORAGE_VERSION = 1
+# Seconds before the open cycles are saved, so bursts of events save once
+SAVE_DELAY = 10
+# A stopped cycle ends with the next reading of its meters, which still counts
+# towards it. Meters that don't report again within this time aren't waited for.
+FINISH_TIMEOUT = timedelta(minutes=15)
+
+# A log is rotated when it would grow past this size. A device keeps this many
+# rotated logs, which keeps its history below about 1 MiB.
+MAX_LOG_SIZE = 256 * 1024
+ROTATED_LOGS = 3
+# Rotated logs that weren't written to for this long are removed
+RETENTION = timedelta(days=730)
+
+# Capabilities holding the options a cycle runs with
+CYCLE_OPTIONS: dict[Capability, tuple[Attribute, SupportedOption]] = {
+    Capability.CUSTOM_DRYER_DRY_LEVEL: (
+        Attribute.DRYER_DRY_LEVEL,
+        SupportedOption.DRYING_LEVEL,
+    ),
+    Capability.CUSTOM_WASHER_RINSE_CYCLES: (
+        Attribute.WASHER_RINSE_CYCLES,
+        SupportedOption.RINSE_CYCLE,
+    ),
+    Capability.CUSTOM_WASHER_SOIL_LEVEL: (
+        Attribute.WASHER_SOIL_LEVEL,
+        SupportedOption.SOIL_LEVEL,
+    ),
+    Capability.CUSTOM_WASHER_SPIN_LEVEL: (
+        Attribute.WASHER_SPIN_LEVEL,
+        SupportedOption.SPIN_LEVEL,
+    ),
+    Capability.CUSTOM_WASHER_WATER_TEMPERATURE: (
+        Attribute.WASHER_WATER_TEMPERATURE,
+        SupportedOption.WATER_TEMPERATURE,
+    ),
+    Capability.SAMSUNG_CE_DRYER_DRYING_TEMPERATURE: (
+        Attribute.DRYING_TEMPERATURE,
+        SupportedOption.DRYING_TEMPERATURE,
+    ),
+}
+
+# Meters whose use is recorded per cycle, by the capability reporting them
+CYCLE_METERS: dict[
+    Capability, tuple[str, Attribute, Callable[[dict[str, Any]], float | None]]
+] = {
+    Capability.POWER_CONSUMPTION_REPORT: (
+        "energy",
+        Attribute.POWER_CONSUMPTION,
+        get_energy_reading,
+    ),
+    Capability.SAMSUNG_CE_WATER_CONSUMPTION_REPORT: (
+        "water",
+        Attribute.WATER_CONSUMPTION,
+        get_water_reading,
+    ),
+}
+
+
+def _meter_reading(capability: Capability | str, value: Any) -> float | None:
+    """Return the reading of a meter from the value of its attribute."""
+    if not isinstance(value, dict):
+        return None
+    return CYCLE_METERS[capability][2](value)
+
+
+def _status_value(
+    status: ComponentStatus, capability: Capability, attribute: Attribute
+) -> Any:
+    """Return the value of an attribute, or None when it isn't reported."""
+    if (capability_status := status.get(capability)) is None or (
+        attribute_status := capability_status.get(attribute)
+    ) is None:
+        return None
+    return attribute_status.value
+
+
+def _operating_state(status: ComponentStatus) -> Capability | None:
+    """Return the operating state capability telling whether a cycle runs."""
+    return next(
+        (capability for capability in CYCLE_OPERATING_STATES if capability in status),
+        None,
+    )
+
+
+def _meter_readings(status: ComponentStatus) -> dict[str, float]:
+    """Return the readings of the meters in a status by their name."""
+    return {
+        name: reading
+        for capability, (name, attribute, _) in CYCLE_METERS.items()
+        if (
+            reading := _meter_reading(
+                capability, _status_value(status, capability, attribute)
+            )
+        )
+        is not None
+    }
+
+
+def _cycle_use(cycle: dict[str, Any], meter: str) -> float | None:
+    """Return the use of a meter during a cycle."""
+    start_readings = cycle["start_readings"]
+    readings = cycle["readings"]
+    if meter not in start_readings or meter not in readings:
+        return None
+    # A reset meter reads lower than at the start of the cycle
+    return round(max(readings[meter] - start_readings[meter], 0), 3)
+
+
+def _start_cycle(status: ComponentStatus, started: float) -> dict[str, Any]:
+    """Return a cycle starting with the program, options and meters of a status."""
+    program = next(
+        (
+            translate_program_course(str(value))
+            for capability, attribute in CAPABILITY_COURSES.items()
+            if (value := _status_value(status, capability, attribute))
+        ),
+        None,
+    )
+    readings = _meter_readings(status)
+    return {
+        "start": round(started),
+        "program": program,
+        "options": {
+            option: value
+            for capability, (attribute, option) in CYCLE_OPTIONS.items()
+            if (value := _status_value(status, capability, attribute)) is not None
+        },
+        "start_readings": readings,
+        "readings": dict(readings),
+        "job_state": None,
+    }
+
+
+def _seek_end(file: IO[bytes], since: float) -> None:
+    """Move to the first cycle of a log that ended at or after a time.
+
+    Cycles are appended as they end, so the log is ordered by their end and
+    is bisected on the byte offsets of its lines.
+    """
+    low, high = 0, os.fstat(file.fileno()).st_size
+    while low < high:
+        middle = (low + high) // 2
+        # Start of the first line at or after the middle
+        file.seek(middle - 1 if middle else 0)
+        if middle:
+            file.readline()
+        start = file.tell()
+        if start >= high:
+            high = middle
+            continue
+        try:
+            ended = orjson.loads(file.readline())["end"]
+        except orjson.JSONDecodeError:
+            ended = None
+        if ended is not None and ended < since:
+            low = file.tell()
+        else:
+            high = start
+    file.seek(low)
+
+
+class CycleHistory:
+    """Keep the history of the cycles of washers, dryers and dishwashers.
+
+    Every device has an append-only log with a JSON record per finished
+    cycle, written in the executor. Logs are rotated by size and removed after
+    the retention. A cycle in progress and the last cycle are kept in a store,
+    so they survive a restart. A cycle stops when the machine does, and ends
+    with the next reading of its meters. The durations of the finished cycles
+    are learned per program.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: SmartThingsConfigEntry) -> None:
+        """Initialize the history."""
+        self._hass = hass
+        self._entry = entry
+        self.directory = Path(hass.config.path(STORAGE_DIR, HISTORY_DIR))
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}_open_cycles_{entry.entry_id}"
+        )
+        self._durations_store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}_cycle_durations_{entry.entry_id}"
+        )
+        # Cycles in progress, and stopped cycles waiting for their meters
+        self._cycles: dict[str, dict[str, Any]] = {}
+        self._last_cycles: dict[str, dict[str, Any]] = {}
+        self._finish_timers: dict[str, CALLBACK_TYPE] = {}
+        # Listeners of the dispatcher per followed device
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+        self.durations = DurationModel()
+        self._columns = CycleColumnCache()
+        self._lock = asyncio.Lock()
+
+    async def async_start(self) -> Callable[[], None]:
+        """Restore the cycles in progress and start following the devices.
+
+        Cycles that ended while Home Assistant was stopped end now, cycles
+        that started are recorded from now on and marked as partial. The
+        durations are learned from the logs when they weren't stored yet.
+        The events are received through the dispatcher, so the events a
+        resync injects after a gap end and start cycles like live ones.
+        """
+        stored = await self._store.async_load() or {}
+        self._cycles = stored.get("cycles", {})
+        self._last_cycles = stored.get("last_cycles", {})
+        devices = self._entry.runtime_data.devices
+        if (durations := await self._durations_store.async_load()) is not None:
+            self.durations = DurationModel.from_dict(durations)
+        else:
+            self.durations = await self._hass.async_add_executor_job(
+                self._learn_durations, list(devices)
+            )
+            self._async_schedule_durations_save()
+        now = time.time()
+        for cycles in (self._cycles, self._last_cycles):
+            for device_id in cycles.keys() - devices.keys():
+                del cycles[device_id]
+        for device_id, device in devices.items():
+            status = device.status.get(MAIN, {})
+            if (operating_state := _operating_state(status)) is None:
+                continue
+            running = (
+                _status_value(status, operating_state, Attribute.MACHINE_STATE)
+                in CYCLE_RUNNING_STATES
+            )
+            cycle = self._cycles.get(device_id)
+            if cycle is not None and ("end" in cycle or not running):
+                if not running:
+                    # The meters reported while Home Assistant was stopped
+                    cycle["readings"].update(_meter_readings(status))
+                cycle.setdefault("end", round(now))
+                self._finish_cycle(device_id)
+                cycle = None
+            if running and cycle is None:
+                self._cycles[device_id] = _start_cycle(status, now)
+                self._cycles[device_id]["partial"] = True
+        self._async_schedule_save()
+        await self._hass.async_add_executor_job(self._remove_expired)
+        for device_id in devices:
+            self.add_device(device_id)
+
+        def stop() -> None:
+            for listeners in self._listeners.values():
+                for remove in listeners:
+                    remove()
+            self._listeners.clear()
+            # Stopped cycles are finished from the store on the next start
+            for cancel in self._finish_timers.values():
+                cancel()
+            self._finish_timers.clear()
+
+        return stop
+
+    @callback
+    def add_device(self, device_id: str) -> None:
+        """Follow the events of a device that can run cycles."""
+        if device_id in self._listeners:
+            return
+        status = self._entry.runtime_data.devices[device_id].status.get(MAIN, {})
+        if (operating_state := _operating_state(status)) is None:
+            return
+        dispatcher = self._entry.runtime_data.dispatcher
+        self._listeners[device_id] = [
+            dispatcher.add_capability_listener(
+                device_id, MAIN, capability, self.handle_event
+            )
+            for capability in (operating_state, *CYCLE_METERS)
+        ]
+
+    @callback
+    def handle_event(self, event: DeviceEvent) -> None:
+        """Follow the cycle of a device through its events."""
+        capability = event.capability
+        device_id = event.device_id
+        cycle = self._cycles.get(device_id)
+        if capability in CYCLE_METERS:
+            name, attribute, _ = CYCLE_METERS[capability]
+            if (
+                cycle is None
+                or event.attribute != attribute
+                or (reading := _meter_reading(capability, event.value)) is None
+            ):
+                return
+            cycle["readings"][name] = reading
+            if "end" in cycle and name in cycle["awaiting"]:
+                cycle["awaiting"].remove(name)
+                if not cycle["awaiting"]:
+                    self._finish_cycle(device_id)
+                    return
+            async_dispatcher_send(self._hass, SIGNAL_CYCLE_READINGS.format(device_id))
+            return
+        if event.attribute == CYCLE_OPERATING_STATES[capability]:
+            if (
+                cycle is not None
+                and "end" not in cycle
+                and event.value not in (None, "none")
+            ):
+                cycle["job_state"] = event.value
+                self._async_schedule_save()
+            return
+        if event.attribute != Attribute.MACHINE_STATE or (
+            (device := self._entry.runtime_data.devices.get(device_id)) is None
+        ):
+            return
+        running = event.value in CYCLE_RUNNING_STATES
+        if running and (cycle is None or "end" in cycle):
+            if cycle is not None:
+                # The meters didn't report before the next cycle started
+                self._finish_cycle(device_id)
+            self._cycles[device_id] = _start_cycle(
+                device.status.get(MAIN, {}), time.time()
+            )
+            self._async_schedule_save()
+            async_dispatcher_send(self._hass, SIGNAL_CYCLE_UPDATED.format(device_id))
+        elif not running and cycle is not None and "end" not in cycle:
+            self._stop_cycle(device_id, time.time())
+
+    def _stop_cycle(self, device_id: str, ended: float) -> None:
+        """Stop the cycle of a device and wait for the next reading of its meters."""
+        cycle = self._cycles[device_id]
+        cycle["end"] = round(ended)
+        if not (awaiting := list(cycle["start_readings"])):
+            self._finish_cycle(device_id)
+            return
+        cycle["awaiting"] = awaiting
+        self._finish_timers[device_id] = async_call_later(
+            self._hass, FINISH_TIMEOUT, partial(self._async_finish_timeout, device_id)
+        )
+        self._async_schedule_save()
+        async_dispatcher_send(self._hass, SIGNAL_CYCLE_UPDATED.format(device_id))
+
+    @callback
+    def _async_finish_timeout(self, device_id: str, now: datetime) -> None:
+        """Finish a stopped cycle whose meters didn't report again."""
+        del self._finish_timers[device_id]
+        self._finish_cycle(device_id)
+
+    def _finish_cycle(self, device_id: str) -> None:
+        """End the stopped cycle of a device and append it to its log."""
+        cycle = self._cycles.pop(device_id)
+        if (cancel := self._finish_timers.pop(device_id, None)) is not None:
+            cancel()
+        record = {
+            "start": cycle["start"],
+            "end": cycle["end"],
+            "program": cycle["program"],
+            "options": cycle["options"],
+            **{name: _cycle_use(cycle, name) for name, _, _ in CYCLE_METERS.values()},
+            "job_state": cycle["job_state"],
+        }
+        if cycle.get("partial"):
+            record["partial"] = True
+        self._last_cycles[device_id] = record
+        self.durations.add_cycle(device_id, record)
+        self._async_schedule_save()
+        self._async_schedule_durations_save()
+        async_dispatcher_send(self._hass, SIGNAL_CYCLE_UPDATED.format(device_id))
+        self._entry.async_create_background_task(
+            self._hass,
+            self._async_append(device_id, json_bytes(record) + b"\n"),
+            f"smartthings_cycle_history_{device_id}",
+        )
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the cycles in progress after a delay."""
+        self._store.async_delay_save(
+            lambda: {"cycles": self._cycles, "last_cycles": self._last_cycles},
+            SAVE_DELAY,
+        )
+
+    @callback
+    def _async_schedule_durations_save(self) -> None:
+        """Save the learned durations after a delay."""
+        self._durations_store.async_delay_save(self.durations.as_dict, SAVE_DELAY)
+
+    @callback
+    def remove_device(self, device_id: str) -> None:
+        """Forget the cycle in progress and the durations of a removed device."""
+        for remove in self._listeners.pop(device_id, ()):
+            remove()
+        if (cancel := self._finish_timers.pop(device_id, None)) is not None:
+            cancel()
+        self._cycles.pop(device_id, None)
+        self._last_cycles.pop(device_id, None)
+        self.durations.remove_device(device_id)
+        self._async_schedule_save()
+        self._async_schedule_durations_save()
+
+    def cycle(self, device_id: str) -> dict[str, Any] | None:
+        """Return the cycle in progress of a device."""
+        if (cycle := self._cycles.get(device_id)) is None or "end" in cycle:
+            return None
+        return cycle
+
+    def cycle_use(self, device_id: str, meter: str) -> float | None:
+        """Return the use of a meter during the current cycle of a device.
+
+        A stopped cycle counts until its meters reported again.
+        """
+        if (cycle := self._cycles.get(device_id)) is None:
+            return None
+        return _cycle_use(cycle, meter)
+
+    def cycle_start(self, device_id: str) -> float | None:
+        """Return the start of the current cycle of a device."""
+        if (cycle := self._cycles.get(device_id)) is None:
+            return None
+        return cycle["start"]
+
+    def last_cycle(self, device_id: str) -> dict[str, Any] | None:
+        """Return the last finished cycle of a device."""
+        return self._last_cycles.get(device_id)
+
+    def log_path(self, device_id: str, index: int = 0) -> Path:
+        """Return the path of the log of a device, or of a rotated log."""
+        if index:
+            return self.directory / f"{device_id}.{index}.ndjson"
+        return self.directory / f"{device_id}.ndjson"
+
+    async def _async_append(self, device_id: str, line: bytes) -> None:
+        """Append a cycle to the log of a device."""
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._append, device_id, line)
+
+    def _append(self, device_id: str, line: bytes) -> None:
+        """Append a cycle to a log, rotating the log when it is full."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.log_path(device_id)
+        if path.exists() and path.stat().st_size + len(line) > MAX_LOG_SIZE:
+            self.log_path(device_id, ROTATED_LOGS).unlink(missing_ok=True)
+            for index in range(ROTATED_LOGS - 1, -1, -1):
+                if (source := self.log_path(device_id, index)).exists():
+                    source.rename(self.log_path(device_id, index + 1))
+        with path.open("ab") as file:
+            file.write(line)
+
+    def _learn_durations(self, device_ids: list[str]) -> DurationModel:
+        """Learn the durations of the cycles in the logs of devices."""
+        model = DurationModel()
+        for device_id in device_ids:
+            for index in range(ROTATED_LOGS, -1, -1):
+                try:
+                    file = self.log_path(device_id, index).open("rb")
+                except FileNotFoundError:
+                    continue
+                with file:
+                    for line in file:
+                        try:
+                            model.add_cycle(device_id, orjson.loads(line))
+                        except orjson.JSONDecodeError:
+                            continue
+        return model
+
+    def _remove_expired(self) -> None:
+        """Remove the rotated logs that are past the retention."""
+        if not self.directory.is_dir():
+            return
+        cutoff = time.time() - RETENTION.total_seconds()
+        for path in self.directory.glob("*.*.ndjson"):
+            if path.stat().st_mtime < cutoff:
+                _LOGGER.debug("Removing expired cycle history %s", path.name)
+                path.unlink()
+
+    async def async_query(
+        self,
+        device_ids: Iterable[str],
+        since: float | None,
+        until: float | None,
+        program: str | None,
+        limit: int,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Return the last cycles of devices that ran between two times."""
+        # A log isn't read while it is being rotated
+        async with self._lock:
+            return await self._hass.async_add_executor_job(
+                self._query, list(device_ids), since, until, program, limit
+            )
+
+    async def async_statistics(
+        self, device_ids: Iterable[str], since: float | None, until: float | None
+    ) -> dict[str, Any]:
+        """Return the statistics per program of the cycles of devices."""
+        # The column cache is only used by one job at a time
+        async with self._lock:
+            return await self._hass.async_add_executor_job(
+                self._statistics, list(device_ids), since, until
+            )
+
+    def _statistics(
+        self, device_ids: list[str], since: float | None, until: float | None
+    ) -> dict[str, Any]:
+        """Load the logs of devices as columns and aggregate them."""
+        columns = self._columns.load(
+            self.log_path(device_id, index)
+            for device_id in device_ids
+            for index in range(ROTATED_LOGS, -1, -1)
+        )
+        return cycle_statistics(
+            columns,
+            self._columns.programs,
+            since,
+            until,
+            dt_util.get_default_time_zone(),
+        )
+
+    def _query(
+        self,
+        device_ids: list[str],
+        since: float | None,
+        until: float | None,
+        program: str | None,
+        limit: int,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Read the matching cycles of devices from their logs."""
+        result = {}
+        for device_id in device_ids:
+            if cycles := self._query_device(device_id, since, until, program, limit):
+                result[device_id] = [
+                    {
+                        **cycle,
+                        "start": dt_util.utc_from_timestamp(cycle["start"]).isoformat(),
+                        "end": dt_util.utc_from_timestamp(cycle["end"]).isoformat(),
+                    }
+                    for cycle in cycles
+                ]
+        return result
+
+    def _query_device(
+        self,
+        device_id: str,
+        since: float | None,
+        until: float | None,
+        program: str | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Read the matching cycles of a device, keeping only the last ones.
+
+        The logs are read from the oldest, starting at the first cycle that
+        ended at or after since, and stop at the first cycle that started
+        after until, so only the lines in the range are read.
+        """
+        cycles: deque[dict[str, Any]] = deque(maxlen=limit)
+        for index in range(ROTATED_LOGS, -1, -1):
+            try:
+                file = self.log_path(device_id, index).open("rb")
+            except FileNotFoundError:
+                continue
+            with file:
+                if since is not None:
+                    if os.fstat(file.fileno()).st_mtime < since:
+                        # The last cycle of the log ended before since
+                        continue
+                    _seek_end(file, since)
+                for line in file:
+                    try:
+                        cycle = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # A line cut short when Home Assistant stopped
+                        continue
+                    if until is not None and cycle["start"] > until:
+                        return list(cycles)
+                    if program is None or cycle["program"] == program:
+                        cycles.append(cycle)
+        return list(cycles)
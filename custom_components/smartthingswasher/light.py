@@ -35,9 +35,9 @@ from homeassistant.util.percentage import (
     percentage_to_ordered_list_item,
 )
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 CAPABILITIES = (
     Capability.SWITCH_LEVEL,
@@ -68,10 +68,16 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add lights for a config entry."""
-    entry_data = entry.runtime_data
-    entities: list[LightEntity] = [
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the lights of devices."""
+    entities: list[SmartThingsEntity] = [
         SmartThingsLight(entry_data.client, device, component)
-        for device in entry_data.devices.values()
+        for device in devices
         for component in device.status
         if (
             Capability.SWITCH in device.status[MAIN]
@@ -81,13 +87,13 @@ async def async_setup_entry(
     ]
     entities.extend(
         SmartThingsLamp(entry_data.client, device, component)
-        for device in entry_data.devices.values()
+        for device in devices
         for component, exists_fn in LAMP_CAPABILITY_EXISTS.items()
         if component in device.status
         and Capability.SAMSUNG_CE_LAMP in device.status[component]
         and exists_fn(device, device.status[component])
     )
-    async_add_entities(entities)
+    return entities
 
 
 def convert_scale(
@@ -0,0 +1,139 @@
+"""Event socket liveness monitoring for SmartThings."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from pysmartthings import Attribute, Capability, DeviceEvent, SmartThings
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import MAIN
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+    from .connection import SmartThingsConnection
+
+_LOGGER = logging.getLogger(__name__)
+
+LIVENESS_CHECK_INTERVAL = timedelta(minutes=1)
+SILENCE_THRESHOLD = timedelta(minutes=15)
+
+SIGNAL_LIVENESS_UPDATED = "smartthings_liveness_updated_{}"
+
+# Running appliances report progress regularly, a silent socket is suspicious
+RUNNING_STATES: dict[Capability, tuple[Attribute, set[str]]] = {
+    Capability.WASHER_OPERATING_STATE: (Attribute.MACHINE_STATE, {"run"}),
+    Capability.DRYER_OPERATING_STATE: (Attribute.MACHINE_STATE, {"run"}),
+    Capability.DISHWASHER_OPERATING_STATE: (Attribute.MACHINE_STATE, {"run"}),
+    Capability.OVEN_OPERATING_STATE: (Attribute.MACHINE_STATE, {"running"}),
+}
+
+
+class LivenessMonitor:
+    """Track whether events are still flowing over the event socket.
+
+    The last event is kept for the location and for every device. Devices
+    that received events are signalled once per check instead of per event,
+    so the sensors showing the last event don't write a state for every
+    event. When the socket stays silent past the threshold while an
+    appliance is running, the socket is recreated.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: SmartThingsConfigEntry,
+        client: SmartThings,
+        connection: SmartThingsConnection,
+    ) -> None:
+        """Initialize the monitor."""
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._connection = connection
+        self._silent_since = dt_util.utcnow()
+        self._updated_devices: set[str] = set()
+        self.last_event: datetime | None = None
+        self.device_last_event: dict[str, datetime] = {}
+        self.silence_reconnects = 0
+
+    @callback
+    def start(self) -> Callable[[], None]:
+        """Start monitoring the event socket."""
+        remove_listener = self._client.add_unspecified_device_event_listener(
+            self._handle_device_event
+        )
+        remove_interval = async_track_time_interval(
+            self._hass, self._async_check, LIVENESS_CHECK_INTERVAL
+        )
+
+        def stop() -> None:
+            remove_listener()
+            remove_interval()
+
+        return stop
+
+    @callback
+    def _handle_device_event(self, event: DeviceEvent) -> None:
+        """Record the arrival of a device event."""
+        now = dt_util.utcnow()
+        self.last_event = now
+        self.device_last_event[event.device_id] = now
+        self._updated_devices.add(event.device_id)
+
+    def remove_device(self, device_id: str) -> None:
+        """Forget a removed device."""
+        self.device_last_event.pop(device_id, None)
+        self._updated_devices.discard(device_id)
+
+    def is_running(self) -> bool:
+        """Return if any appliance of the entry is running."""
+        for device in self._entry.runtime_data.devices.values():
+            main_status = device.status.get(MAIN, {})
+            for capability, (attribute, states) in RUNNING_STATES.items():
+                if (
+                    capability in main_status
+                    and (status := main_status[capability].get(attribute)) is not None
+                    and status.value in states
+                ):
+                    return True
+        return False
+
+    @callback
+    def _async_check(self, now: datetime) -> None:
+        """Signal the devices that received events and check for silence.
+
+        The socket is recreated when it went silent while appliances run.
+        """
+        for device_id in self._updated_devices:
+            async_dispatcher_send(self._hass, SIGNAL_LIVENESS_UPDATED.format(device_id))
+        self._updated_devices.clear()
+        if self.last_event is not None and self.last_event > self._silent_since:
+            self._silent_since = self.last_event
+        if now - self._silent_since < SILENCE_THRESHOLD or not self.is_running():
+            return
+        _LOGGER.warning(
+            "No events received since %s while an appliance is running, reconnecting",
+            self._silent_since,
+        )
+        self._silent_since = now
+        self.silence_reconnects += 1
+        self._connection.schedule_reconnect()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the liveness state for diagnostics."""
+        return {
+            "last_event": self.last_event.isoformat() if self.last_event else None,
+            "silence_reconnects": self.silence_reconnects,
+            "devices": {
+                device_id: last_event.isoformat()
+                for device_id, last_event in self.device_last_event.items()
+            },
+        }
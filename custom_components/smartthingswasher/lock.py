@@ -10,9 +10,9 @@ from homeassistant.components.lock import LockEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 ST_STATE_LOCKED = "locked"
 ST_LOCK_ATTR_MAP = {
@@ -31,12 +31,18 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add locks for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the locks of devices."""
+    return [
         SmartThingsLock(entry_data.client, device, {Capability.LOCK})
-        for device in entry_data.devices.values()
+        for device in devices
         if Capability.LOCK in device.status[MAIN]
-    )
+    ]
 
 
 class SmartThingsLock(SmartThingsEntity, LockEntity):
@@ -16,9 +16,9 @@ from homeassistant.components.media_player import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 MEDIA_PLAYER_CAPABILITIES = (
     Capability.AUDIO_MUTE,
@@ -58,16 +58,21 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add media players for a config entry."""
-    entry_data = entry.runtime_data
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
 
-    async_add_entities(
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the media players of devices."""
+    return [
         SmartThingsMediaPlayer(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if all(
             capability in device.status[MAIN]
             for capability in MEDIA_PLAYER_CAPABILITIES
         )
-    )
+    ]
 
 
 class SmartThingsMediaPlayer(SmartThingsEntity, MediaPlayerEntity):
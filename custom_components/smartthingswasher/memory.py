@@ -0,0 +1,170 @@
+"""Memory accounting for SmartThings."""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from enum import Enum
+import sys
+from types import FunctionType, MethodType, ModuleType
+from typing import Any
+
+from pysmartthings import SmartThings
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity_platform import EntityPlatform, async_get_platforms
+from homeassistant.helpers.entity_registry import RegistryEntry
+
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
+from .const import DOMAIN
+from .countdown import CountdownTicker
+from .dispatcher import EventDispatcher
+from .event_buffer import DeviceEventBuffer
+from .history import CycleHistory
+from .metrics import IntegrationMetrics
+from .tracing import LatencyTracer
+
+# Devices listed by size in the report
+LARGEST_DEVICES = 10
+
+# Objects shared by the whole entry or Home Assistant, that are never counted
+# as part of the object referring to them
+SHARED_TYPES: tuple[type, ...] = (
+    type,
+    ModuleType,
+    Enum,
+    HomeAssistant,
+    ConfigEntry,
+    EntityPlatform,
+    RegistryEntry,
+    DeviceEntry,
+    SmartThings,
+    SmartThingsData,
+    EventDispatcher,
+    IntegrationMetrics,
+    DeviceEventBuffer,
+    LatencyTracer,
+    CycleHistory,
+    CountdownTicker,
+)
+
+
+def deep_size(obj: Any, seen: set[int], stop: tuple[type, ...] = SHARED_TYPES) -> int:
+    """Return the bytes of an object and everything it refers to.
+
+    Objects in seen are skipped and every counted object is added, so objects
+    shared between calls are counted once, by the first call that reaches
+    them. Objects of the stop types are not followed, unless it is the object
+    itself, and the code of functions is never counted.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or (item is not obj and isinstance(item, stop)):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif isinstance(item, FunctionType):
+            stack.extend(cell.cell_contents for cell in item.__closure__ or ())
+        elif isinstance(item, MethodType):
+            stack.append(item.__self__)
+        else:
+            if (attributes := getattr(item, "__dict__", None)) is not None:
+                stack.append(attributes)
+            for cls in type(item).__mro__:
+                stack.extend(
+                    getattr(item, slot)
+                    for slot in getattr(cls, "__slots__", ())
+                    if hasattr(item, slot)
+                )
+    return size
+
+
+@callback
+def async_memory_report(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry
+) -> dict[str, Any]:
+    """Return the bytes held by the devices, catalogs and entities of an entry.
+
+    Statuses are shared by the device and its entities, so they are counted
+    for the device, and programs for the program catalog of the device. The
+    entities are counted for what they hold on top of that.
+    """
+    entry_data = entry.runtime_data
+    seen: set[int] = set()
+    devices: dict[str, dict[str, int]] = {}
+    for device_id, full_device in entry_data.devices.items():
+        status = deep_size(full_device.status, seen)
+        catalog = deep_size(full_device.programs, seen)
+        devices[device_id] = {
+            "status": status,
+            "catalog": catalog,
+            "total": status + catalog + deep_size(full_device, seen),
+        }
+
+    descriptions: dict[int, EntityDescription] = {}
+    classes: dict[str, list[int]] = defaultdict(list)
+    entity_stop = (*SHARED_TYPES, FullDevice, EntityDescription)
+    for platform in async_get_platforms(hass, DOMAIN):
+        if platform.config_entry is not entry:
+            continue
+        for entity in platform.entities.values():
+            if (description := getattr(entity, "entity_description", None)) is not None:
+                descriptions[id(description)] = description
+            classes[type(entity).__name__].append(deep_size(entity, seen, entity_stop))
+    description_bytes = sum(
+        deep_size(description, seen) for description in descriptions.values()
+    )
+    dispatcher_bytes = deep_size(entry_data.dispatcher, seen)
+    event_buffer_bytes = deep_size(entry_data.event_buffer, seen)
+
+    programs = sum(len(device.programs) for device in entry_data.devices.values())
+    catalogs = [device["catalog"] for device in devices.values() if device["catalog"]]
+    device_bytes = sum(device["total"] for device in devices.values())
+    entity_bytes = sum(sum(sizes) for sizes in classes.values())
+    largest = sorted(devices.items(), key=lambda item: item[1]["total"], reverse=True)
+    return {
+        "devices": {
+            "count": len(devices),
+            "bytes": device_bytes,
+            "per_device": device_bytes // max(len(devices), 1),
+            "status_bytes": sum(device["status"] for device in devices.values()),
+            "largest": dict(largest[:LARGEST_DEVICES]),
+        },
+        "program_catalogs": {
+            "count": len(catalogs),
+            "programs": programs,
+            "bytes": sum(catalogs),
+            "per_catalog": sum(catalogs) // max(len(catalogs), 1),
+            "per_program": sum(catalogs) // max(programs, 1),
+        },
+        "entity_classes": {
+            name: {
+                "count": len(sizes),
+                "bytes": sum(sizes),
+                "per_entity": sum(sizes) // len(sizes),
+            }
+            for name, sizes in sorted(classes.items())
+        },
+        "entity_descriptions": {
+            "count": len(descriptions),
+            "bytes": description_bytes,
+        },
+        "dispatcher_bytes": dispatcher_bytes,
+        "event_buffer_bytes": event_buffer_bytes,
+        "total": (
+            device_bytes
+            + entity_bytes
+            + description_bytes
+            + dispatcher_bytes
+            + event_buffer_bytes
+        ),
+    }
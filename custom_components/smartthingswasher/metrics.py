@@ -0,0 +1,142 @@
+"""Integration health metrics for SmartThings."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+
+METRICS_INTERVAL = timedelta(minutes=1)
+
+SIGNAL_METRICS_UPDATED = "smartthings_metrics_updated_{}"
+
+# Bucket bounds in seconds, growing by half from 1 ms up to about 2 minutes
+LATENCY_BUCKETS: tuple[float, ...] = tuple(0.001 * 1.5**i for i in range(30))
+
+# Halve the weight of older samples every interval, so percentiles follow the
+# recent latencies without keeping the samples
+DECAY = 0.5
+
+
+class LatencyHistogram:
+    """Fixed size histogram of latencies with logarithmic buckets."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self._counts = [0.0] * (len(LATENCY_BUCKETS) + 1)
+        self._total = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a latency."""
+        self._counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self._total += 1
+
+    def decay(self) -> None:
+        """Lower the weight of the recorded latencies."""
+        self._counts = [count * DECAY for count in self._counts]
+        self._total *= DECAY
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile in seconds."""
+        if self._total < 1:
+            return None
+        target = fraction * self._total
+        cumulative = 0.0
+        for bound, count in zip(LATENCY_BUCKETS, self._counts, strict=False):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+
+class IntegrationMetrics:
+    """Collect the health metrics of a config entry.
+
+    Everything is counted incrementally: events and API calls as counters
+    turned into rates every interval, latencies in fixed size histograms.
+    API calls are counted where the client is called, by client method.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: SmartThingsConfigEntry) -> None:
+        """Initialize the metrics."""
+        self._hass = hass
+        self._entry = entry
+        self.event_latency = LatencyHistogram()
+        self.command_latency = LatencyHistogram()
+        self._events = 0
+        self._api_calls: dict[str, int] = {}
+        self._last_update = time.monotonic()
+        self.dispatch_started: float | None = None
+        self.events_per_second: float | None = None
+        self.api_calls_per_minute: dict[str, float] = {}
+
+    @callback
+    def start(self) -> Callable[[], None]:
+        """Start updating the rates every interval."""
+        return async_track_time_interval(
+            self._hass, self._async_update, METRICS_INTERVAL
+        )
+
+    def api_call(self, method: str) -> None:
+        """Count a call to the cloud by the client method called."""
+        self._api_calls[method] = self._api_calls.get(method, 0) + 1
+
+    def event_received(self) -> None:
+        """Count an event and mark the start of its dispatch."""
+        self._events += 1
+        self.dispatch_started = time.perf_counter()
+
+    def availability_received(self) -> None:
+        """Mark the start of the dispatch of an availability event."""
+        self.dispatch_started = time.perf_counter()
+
+    def dispatch_finished(self) -> None:
+        """Mark the end of a dispatch, later state writes weren't caused by it."""
+        self.dispatch_started = None
+
+    def state_written(self) -> None:
+        """Record the latency from the dispatched event to a state write."""
+        if self.dispatch_started is not None:
+            self.event_latency.record(time.perf_counter() - self.dispatch_started)
+
+    @callback
+    def _async_update(self, now: datetime) -> None:
+        """Turn the counters into rates and age the histograms."""
+        monotonic = time.monotonic()
+        elapsed = max(monotonic - self._last_update, 1.0)
+        self._last_update = monotonic
+        self.events_per_second = round(self._events / elapsed, 3)
+        self._events = 0
+        self.api_calls_per_minute = {
+            endpoint: round(calls * 60 / elapsed, 2)
+            for endpoint, calls in sorted(self._api_calls.items())
+        }
+        self._api_calls = {}
+        async_dispatcher_send(
+            self._hass, SIGNAL_METRICS_UPDATED.format(self._entry.entry_id)
+        )
+        self.event_latency.decay()
+        self.command_latency.decay()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        entry_data = self._entry.runtime_data
+        return {
+            "events_per_second": self.events_per_second,
+            "event_latency_p50": self.event_latency.percentile(0.5),
+            "event_latency_p99": self.event_latency.percentile(0.99),
+            "command_latency_p50": self.command_latency.percentile(0.5),
+            "command_latency_p99": self.command_latency.percentile(0.99),
+            "api_calls_per_minute": self.api_calls_per_minute,
+            "reconnects": entry_data.connection.reconnects,
+            "listeners": entry_data.dispatcher.listener_count,
+        }
@@ -19,9 +19,9 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import HOOD, MAIN, UNIT_MAP
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 from .models import ProgramOptions, STType, SupportedOption
 from .util import (
     get_current_cavity_id,
@@ -257,8 +257,14 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add switches for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the numbers of devices."""
+    entities: list[SmartThingsEntity] = [
         SmartThingsNumber(
             entry_data.client,
             device,
@@ -267,7 +273,7 @@ async def async_setup_entry(
             attribute,
             component,
         )
-        for device in entry_data.devices.values()
+        for device in devices
         for capability, attributes in CAPABILITY_TO_NUMBERS.items()
         for component, capabilities in device.status.items()
         if capability in capabilities
@@ -291,8 +297,8 @@ async def async_setup_entry(
             description.supported_fn is None
             or description.supported_fn(device, component)
         )
-    )
-    async_add_entities(
+    ]
+    entities.extend(
         SmartThingsOvenOptionNumber(
             entry_data.client,
             device,
@@ -301,7 +307,7 @@ async def async_setup_entry(
             attribute,
             component,
         )
-        for device in entry_data.devices.values()
+        for device in devices
         if device.programs is not None
         for capability, support_options in OVEN_OPTIONS_TO_NUMBERS.items()
         for component, capabilities in device.status.items()
@@ -327,6 +333,7 @@ async def async_setup_entry(
             or description.supported_fn(device, component)
         )
     )
+    return entities
 
 
 class SmartThingsNumber(SmartThingsEntity, NumberEntity):
@@ -0,0 +1,122 @@
+"""Profiling of the event dispatch for SmartThings."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import cProfile
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+
+
+class DispatchProfiler:
+    """Profile the listeners called for dispatched events.
+
+    Every listener call runs under cProfile, so the entity updates and the
+    state writes with their property evaluation are captured. Next to that
+    the wall time is summed per entity class and capability.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.profile = cProfile.Profile()
+        self.started = time.perf_counter()
+        # Calls, total time and slowest call
+        self.timings: dict[tuple[str, str], list[float]] = {}
+
+    def call[_T](
+        self, listener: Callable[[_T], None], capability: str, event: _T
+    ) -> None:
+        """Call a listener while profiling it."""
+        owner = getattr(listener, "__self__", listener)
+        start = time.perf_counter()
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Another profiler, like the one of Home Assistant, is active
+            profiling = False
+        else:
+            profiling = True
+        try:
+            listener(event)
+        finally:
+            if profiling:
+                self.profile.disable()
+            elapsed = time.perf_counter() - start
+            key = (type(owner).__name__, capability)
+            if (timing := self.timings.get(key)) is None:
+                self.timings[key] = [1, elapsed, elapsed]
+            else:
+                timing[0] += 1
+                timing[1] += elapsed
+                timing[2] = max(timing[2], elapsed)
+
+    def summary(self, top: int) -> list[dict[str, Any]]:
+        """Return the entity classes and capabilities that took the most time."""
+        ordered = sorted(
+            self.timings.items(), key=lambda item: item[1][1], reverse=True
+        )
+        return [
+            {
+                "entity_class": entity_class,
+                "capability": capability,
+                "calls": int(calls),
+                "total": round(total, 6),
+                "mean": round(total / calls, 6),
+                "max": round(slowest, 6),
+            }
+            for (entity_class, capability), (calls, total, slowest) in ordered[:top]
+        ]
+
+    def write(self, path: str, top: int) -> list[dict[str, Any]]:
+        """Write the pstats file and return the most expensive functions."""
+        self.profile.dump_stats(path)
+        ordered = sorted(
+            self.profile.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][3],
+            reverse=True,
+        )
+        return [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total": round(total, 6),
+                "cumulative": round(cumulative, 6),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in ordered[
+                :top
+            ]
+        ]
+
+
+async def async_profile_dispatch(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, duration: float, top: int
+) -> dict[str, Any]:
+    """Profile the event dispatch of a config entry for a while."""
+    dispatcher = entry.runtime_data.dispatcher
+    if dispatcher.profiler is not None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="profile_running",
+        )
+    profiler = dispatcher.profiler = DispatchProfiler()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        dispatcher.profiler = None
+    path = hass.config.path(f"smartthings_profile_{int(time.time())}.pstats")
+    functions = await hass.async_add_executor_job(profiler.write, path, top)
+    return {
+        "pstats_file": path,
+        "duration": round(time.perf_counter() - profiler.started, 3),
+        "entities": profiler.summary(top),
+        "functions": functions,
+    }
@@ -0,0 +1,302 @@
+"""Event stream recording for SmartThings."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+from functools import partial
+import hashlib
+import logging
+from pathlib import Path
+import secrets
+import time
+from typing import TYPE_CHECKING, Any
+import uuid
+
+from pysmartthings import DeviceEvent, DeviceHealthEvent, Lifecycle, SmartThingsError
+from pysmartthings.models import EventType
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_LOCATION_ID, DOMAIN
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+FLUSH_INTERVAL = timedelta(seconds=5)
+STATUS_CONCURRENCY = 8
+
+# Identifiers replaced by stable pseudonyms, so a redacted recording can
+# still be replayed
+REDACT_IDENTIFIERS = {
+    "deviceId",
+    "hubId",
+    "installedAppId",
+    "locationId",
+    "ownerId",
+    "parentDeviceId",
+    "roomId",
+}
+# Names chosen by the user
+REDACT_NAMES = {"deviceName", "label"}
+
+# Fields of device events, as sent in the event stream
+DEVICE_EVENT_FIELDS = {
+    "event_id": "eventId",
+    "location_id": "locationId",
+    "owner_id": "ownerId",
+    "device_id": "deviceId",
+    "component_id": "componentId",
+    "capability": "capability",
+    "attribute": "attribute",
+    "value": "value",
+    "data": "data",
+}
+
+
+class Redactor:
+    """Replace identifiers and names with pseudonyms.
+
+    The pseudonyms are salted per recording, the same identifier gets the
+    same pseudonym within a recording but can't be traced back.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the redactor."""
+        self._salt = secrets.token_bytes(16)
+        self._names: dict[str, str] = {}
+
+    def _pseudonym(self, identifier: str) -> str:
+        """Return the pseudonym of an identifier."""
+        digest = hashlib.sha256(self._salt + identifier.encode()).digest()
+        return str(uuid.UUID(bytes=digest[:16], version=4))
+
+    def _name(self, name: str) -> str:
+        """Return the pseudonym of a name."""
+        if (pseudonym := self._names.get(name)) is None:
+            pseudonym = self._names[name] = f"Device {len(self._names) + 1}"
+        return pseudonym
+
+    def redact(self, data: Any) -> Any:
+        """Return data with its identifiers and names redacted."""
+        if isinstance(data, list):
+            return [self.redact(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+        redacted: dict[str, Any] = {}
+        for key, value in data.items():
+            if key in REDACT_IDENTIFIERS and isinstance(value, str):
+                redacted[key] = self._pseudonym(value)
+            elif key in REDACT_NAMES and isinstance(value, str):
+                redacted[key] = self._name(value)
+            else:
+                redacted[key] = self.redact(value)
+        return redacted
+
+
+class EventRecorder:
+    """Record the raw event stream of a config entry to an NDJSON file.
+
+    The file starts with a header and the device info and status of every
+    device, followed by every event the client receives, in the form of the
+    event stream, with its offset from the start in seconds. Lines are written in the executor every few seconds.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: SmartThingsConfigEntry,
+        path: str,
+        redact: bool,
+    ) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._entry = entry
+        self.path = Path(path)
+        self._redactor = Redactor() if redact else None
+        self._lines: list[bytes] = []
+        self._started = time.monotonic()
+        self._stop: Callable[[], None] | None = None
+        self.events = 0
+
+    def _add(self, record: dict[str, Any]) -> None:
+        """Queue a record for writing."""
+        if self._redactor is not None:
+            record = self._redactor.redact(record)
+        self._lines.append(json_bytes(record) + b"\n")
+
+    async def async_start(self) -> None:
+        """Record the current devices and start recording events."""
+        client = self._entry.runtime_data.client
+        metrics = self._entry.runtime_data.metrics
+        self._add(
+            {
+                "type": "header",
+                "version": RECORDING_VERSION,
+                "started": dt_util.utcnow().isoformat(),
+                "redacted": self._redactor is not None,
+            }
+        )
+        metrics.api_call("get_raw_devices")
+        pages = await client.get_raw_devices()
+        semaphore = asyncio.Semaphore(STATUS_CONCURRENCY)
+
+        async def get_status(device_id: str) -> dict[str, Any] | None:
+            async with semaphore:
+                metrics.api_call("get_raw_device_status")
+                try:
+                    return await client.get_raw_device_status(device_id)
+                except SmartThingsError as err:
+                    _LOGGER.debug("Couldn't record status of %s: %s", device_id, err)
+                    return None
+
+        devices = [
+            item
+            for page in pages
+            for item in page.get("items", [])
+            if item["deviceId"] in self._entry.runtime_data.devices
+        ]
+        statuses = await asyncio.gather(
+            *(get_status(device["deviceId"]) for device in devices)
+        )
+        for device, status in zip(devices, statuses, strict=True):
+            self._add({"type": "device", "device": device, "status": status})
+        self._started = time.monotonic()
+        self._stop = self._start_recording()
+
+    @callback
+    def _start_recording(self) -> Callable[[], None]:
+        """Listen to the events of the client and flush every interval."""
+        client = self._entry.runtime_data.client
+        location_id = self._entry.data[CONF_LOCATION_ID]
+        removers = [
+            client.add_unspecified_device_event_listener(self._record_device_event),
+            *(
+                client.add_device_availability_event_listener(
+                    device_id, self._record_health_event
+                )
+                for device_id in self._entry.runtime_data.devices
+            ),
+            *(
+                client.add_device_lifecycle_event_listener(
+                    lifecycle,
+                    partial(self._record_lifecycle_event, lifecycle, location_id),
+                )
+                for lifecycle in Lifecycle
+            ),
+            async_track_time_interval(self._hass, self._async_flush, FLUSH_INTERVAL),
+        ]
+
+        def stop() -> None:
+            for remove in removers:
+                remove()
+
+        return stop
+
+    def _record_event(self, event_type: EventType, data: dict[str, Any]) -> None:
+        """Queue an event in the form it is received from the event stream."""
+        self._add(
+            {
+                "type": "event",
+                "offset": round(time.monotonic() - self._started, 4),
+                "event_type": event_type,
+                "data": data,
+            }
+        )
+        self.events += 1
+
+    def _record_device_event(self, event: DeviceEvent) -> None:
+        """Queue a device event."""
+        self._record_event(
+            EventType.DEVICE_EVENT,
+            {
+                "deviceEvent": {
+                    name: getattr(event, key)
+                    for key, name in DEVICE_EVENT_FIELDS.items()
+                }
+            },
+        )
+
+    def _record_health_event(self, event: DeviceHealthEvent) -> None:
+        """Queue a device health event."""
+        self._record_event(
+            EventType.DEVICE_HEALTH_EVENT,
+            {
+                "deviceHealthEvent": {
+                    "deviceId": event.device_id,
+                    "locationId": event.location_id,
+                    "status": event.status,
+                }
+            },
+        )
+
+    def _record_lifecycle_event(
+        self, lifecycle: Lifecycle, location_id: str, device_id: str
+    ) -> None:
+        """Queue a device lifecycle event."""
+        self._record_event(
+            EventType.DEVICE_LIFECYCLE_EVENT,
+            {
+                "deviceLifecycleEvent": {
+                    "lifecycle": lifecycle,
+                    "deviceId": device_id,
+                    "locationId": location_id,
+                }
+            },
+        )
+
+    async def _async_flush(self, *_: Any) -> None:
+        """Append the queued lines to the file."""
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        await self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[bytes]) -> None:
+        """Append lines to the file."""
+        with self.path.open("ab") as file:
+            file.writelines(lines)
+
+    @callback
+    def stop(self) -> None:
+        """Stop recording events."""
+        if self._stop is not None:
+            self._stop()
+            self._stop = None
+
+    async def async_stop(self) -> None:
+        """Stop recording and write what is left."""
+        self.stop()
+        await self._async_flush()
+
+
+async def async_record_events(
+    hass: HomeAssistant,
+    entry: SmartThingsConfigEntry,
+    duration: float,
+    redact: bool,
+) -> dict[str, Any]:
+    """Record the event stream of a config entry for a while."""
+    entry_data = entry.runtime_data
+    if entry_data.recorder is not None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="recording_running",
+        )
+    path = hass.config.path(f"smartthings_events_{int(time.time())}.ndjson")
+    recorder = entry_data.recorder = EventRecorder(hass, entry, path, redact)
+    try:
+        await recorder.async_start()
+        await asyncio.sleep(duration)
+    finally:
+        entry_data.recorder = None
+        await recorder.async_stop()
+    return {"file": path, "events": recorder.events}
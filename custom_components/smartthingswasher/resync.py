@@ -0,0 +1,168 @@
+"""Status resynchronization for SmartThings."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+from typing import TYPE_CHECKING
+
+from pysmartthings import (
+    Capability,
+    ComponentStatus,
+    DeviceEvent,
+    DeviceHealthEvent,
+    SmartThingsConnectionError,
+)
+from pysmartthings.models import HealthStatus
+
+from .const import CONF_LOCATION_ID
+
+if TYPE_CHECKING:
+    from . import FullDevice, SmartThingsConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+RESYNC_CONCURRENCY = 4
+RESYNC_EVENT_ID = "resync"
+
+# Momentary capabilities, replaying their last value would fire them again
+SKIP_CAPABILITIES: set[Capability | str] = {Capability.BUTTON}
+
+
+def diff_status(
+    device: FullDevice,
+    fresh: dict[str, ComponentStatus],
+    location_id: str,
+) -> list[DeviceEvent]:
+    """Apply a fresh status to a device and return the changed attributes.
+
+    Only attributes the device already knows are compared, disabled components
+    and capabilities stay removed. Changed values are written into the existing
+    status objects, which the entities share, and returned as device events.
+    """
+    events: list[DeviceEvent] = []
+    for component_id, capabilities in device.status.items():
+        if (fresh_component := fresh.get(component_id)) is None:
+            continue
+        for capability, attributes in capabilities.items():
+            if capability in SKIP_CAPABILITIES:
+                continue
+            if (fresh_capability := fresh_component.get(capability)) is None:
+                continue
+            for attribute, status in attributes.items():
+                if (fresh_status := fresh_capability.get(attribute)) is None:
+                    continue
+                if (
+                    fresh_status.value == status.value
+                    and fresh_status.data == status.data
+                ):
+                    continue
+                status.value = fresh_status.value
+                status.data = fresh_status.data
+                status.unit = fresh_status.unit
+                status.timestamp = fresh_status.timestamp
+                events.append(
+                    DeviceEvent(
+                        event_id=RESYNC_EVENT_ID,
+                        location_id=location_id,
+                        owner_id=location_id,
+                        device_id=device.device.device_id,
+                        component_id=component_id,
+                        capability=capability,
+                        attribute=attribute,
+                        value=fresh_status.value,
+                        data=fresh_status.data,
+                    )
+                )
+    return events
+
+
+def merge_status(
+    status: dict[str, ComponentStatus], fresh: dict[str, ComponentStatus]
+) -> None:
+    """Merge the structure of a fresh status into a status in place.
+
+    Components, capabilities and attributes that disappeared are removed and
+    new ones are added. Existing dictionaries and status objects are kept, so
+    the entities holding them stay attached.
+    """
+    for component_id in status.keys() - fresh.keys():
+        del status[component_id]
+    for component_id, fresh_component in fresh.items():
+        if (component := status.get(component_id)) is None:
+            status[component_id] = fresh_component
+            continue
+        for capability in component.keys() - fresh_component.keys():
+            del component[capability]
+        for capability, fresh_capability in fresh_component.items():
+            if (attributes := component.get(capability)) is None:
+                component[capability] = fresh_capability
+                continue
+            for attribute in attributes.keys() - fresh_capability.keys():
+                del attributes[attribute]
+            for attribute, fresh_status in fresh_capability.items():
+                attributes.setdefault(attribute, fresh_status)
+
+
+async def async_resync_devices(
+    entry: SmartThingsConfigEntry, device_ids: Iterable[str] | None = None
+) -> int:
+    """Reconcile the devices of an entry with the cloud.
+
+    The current health and status of the devices are fetched with bounded
+    concurrency. Only the attributes that changed are dispatched to the
+    entities, no entities are recreated. Return the number of changed
+    attributes.
+    """
+    entry_data = entry.runtime_data
+    client = entry_data.client
+    dispatcher = entry_data.dispatcher
+    metrics = entry_data.metrics
+    location_id = entry.data[CONF_LOCATION_ID]
+    if device_ids is None:
+        devices = list(entry_data.devices.values())
+    else:
+        devices = [
+            entry_data.devices[device_id]
+            for device_id in device_ids
+            if device_id in entry_data.devices
+        ]
+    semaphore = asyncio.Semaphore(RESYNC_CONCURRENCY)
+
+    async def _resync_device(device: FullDevice) -> int:
+        device_id = device.device.device_id
+        async with semaphore:
+            try:
+                metrics.api_call("get_device_health")
+                health = await client.get_device_health(device_id)
+                if online := health.state == HealthStatus.ONLINE:
+                    metrics.api_call("get_device_status")
+                    fresh = await client.get_device_status(device_id)
+                else:
+                    fresh = {}
+            except SmartThingsConnectionError:
+                _LOGGER.debug("Couldn't resync device %s", device_id)
+                return 0
+        device.online = online
+        dispatcher.dispatch_availability(
+            DeviceHealthEvent(
+                device_id=device_id,
+                location_id=location_id,
+                status=health.state,
+            )
+        )
+        events = diff_status(device, fresh, location_id)
+        for event in events:
+            dispatcher.dispatch_event(event)
+        return len(events)
+
+    changed = sum(
+        await asyncio.gather(
+            *(_resync_device(device) for device in devices if device.status)
+        )
+    )
+    _LOGGER.debug(
+        "Resynchronized %s devices, %s attributes changed", len(devices), changed
+    )
+    return changed
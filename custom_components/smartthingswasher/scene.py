@@ -9,6 +9,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from . import SmartThingsConfigEntry
+from .metrics import IntegrationMetrics
 
 
 async def async_setup_entry(
@@ -18,22 +19,29 @@ async def async_setup_entry(
 ) -> None:
     """Add lights for a config entry."""
     client = entry.runtime_data.client
+    metrics = entry.runtime_data.metrics
     scenes = entry.runtime_data.scenes
-    async_add_entities(SmartThingsScene(scene, client) for scene in scenes.values())
+    async_add_entities(
+        SmartThingsScene(scene, client, metrics) for scene in scenes.values()
+    )
 
 
 class SmartThingsScene(Scene):
     """Define a SmartThings scene."""
 
-    def __init__(self, scene: STScene, client: SmartThings) -> None:
+    def __init__(
+        self, scene: STScene, client: SmartThings, metrics: IntegrationMetrics
+    ) -> None:
         """Init the scene class."""
         self.client = client
+        self._metrics = metrics
         self._scene = scene
         self._attr_name = scene.name
         self._attr_unique_id = scene.scene_id
 
     async def async_activate(self, **kwargs: Any) -> None:
         """Activate scene."""
+        self._metrics.api_call("execute_scene")
         await self.client.execute_scene(self._scene.scene_id)
 
     @property
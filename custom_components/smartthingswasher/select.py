@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 from typing import cast
 
 from pysmartthings import Attribute, Capability, Command, SmartThings
@@ -17,9 +18,8 @@ from homeassistant.helpers.dispatcher import (
     async_dispatcher_send,
 )
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import (
     CAPABILITIES_WITH_PROGRAMS,
     CLEANING_TYPE_TO_HA,
@@ -36,7 +36,7 @@ from .const import (
     WASHER_WATER_TEMPERATURE_TO_HA,
     WATER_SPRAY_LEVEL_TO_HA,
 )
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 from .models import SupportedOption
 from .util import (
     command_program_course,
@@ -469,12 +469,92 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add selects for a config entry."""
-    entry_data = entry.runtime_data
+    # The option selects of every device, updated when its program changes
+    option_selects: dict[
+        str, list[SmartThingsSelect | SmartThingsDishwasherOptionSelect]
+    ] = {}
+
+    @callback
+    def select_state_listener(
+        source_ent: SmartThingsProgramSelect | SmartThingsOvenModeSelect,
+        event: Event[EventStateChangedData],
+    ) -> None:
+        """Handle state changes of a program or oven mode select."""
+        new_state = event.data["new_state"]
+        old_state = event.data["old_state"]
+
+        if new_state is None or (old_state and old_state.state == new_state.state):
+            return
+        if new_state.state in [None, "unknown", "unavailable"]:
+            return
+
+        source_device_id = source_ent.device.device.device_id
+
+        if isinstance(source_ent, SmartThingsProgramSelect):
+            source_ent.device.selected_course = translate_program_course(
+                new_state.state
+            )
+            for select_entity in option_selects.get(source_device_id, ()):
+                if select_entity.entity_description.supported_option:
+                    select_entity.update_default_values(
+                        source_ent.device.selected_course
+                    )
+            return
+
+        source_ent.async_write_ha_state()
+        async_dispatcher_send(
+            hass,
+            f"smartthings_oven_mode_changed_{source_device_id}_{source_ent.component}",
+            new_state.state,
+        )
+
+    @callback
+    def entities_added(entities: list[SmartThingsEntity]) -> None:
+        """Follow the program and oven mode selects, keep the option selects."""
+        for entity in entities:
+            if isinstance(
+                entity, (SmartThingsProgramSelect, SmartThingsOvenModeSelect)
+            ):
+                entity.async_track_own_state(partial(select_state_listener, entity))
+            elif isinstance(
+                entity, (SmartThingsSelect, SmartThingsDishwasherOptionSelect)
+            ):
+                option_selects.setdefault(entity.device.device.device_id, []).append(
+                    entity
+                )
+
+    @callback
+    def entities_removed(entities: list[SmartThingsEntity]) -> None:
+        """Forget the removed option selects.
+
+        The state listeners of the other selects are removed with them.
+        """
+        for entity in entities:
+            device_id = entity.device.device.device_id
+            if entity in (selects := option_selects.get(device_id, ())):
+                selects.remove(entity)
+                if not selects:
+                    del option_selects[device_id]
+
+    async_setup_device_entities(
+        hass,
+        entry,
+        async_add_entities,
+        create_entities,
+        entities_added,
+        entities_removed,
+    )
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the selects of devices."""
     select_entities: list[SmartThingsSelect | SmartThingsDishwasherOptionSelect] = []
     program_select_entities: list[SmartThingsProgramSelect] = []
     oven_select_entities: list[SmartThingsOvenModeSelect] = []
 
-    for device in entry_data.devices.values():
+    for device in devices:
         select_entities.extend(
             SmartThingsSelect(
                 entry_data.client, device, description, capability, attribute, component
@@ -564,65 +644,7 @@ async def async_setup_entry(
             )
         )
 
-    async_add_entities(select_entities + program_select_entities + oven_select_entities)
-
-    program_entities: list[str] = [
-        select_entity.entity_id for select_entity in program_select_entities
-    ]
-    program_entities += [
-        select_entity.entity_id for select_entity in oven_select_entities
-    ]
-
-    @callback
-    def select_state_listener(event: Event[EventStateChangedData]) -> None:
-        """Handle state changes of the sensor entity."""
-        source_entity_id = event.data["entity_id"]
-        new_state = event.data["new_state"]
-        old_state = event.data["old_state"]
-
-        if new_state is None or (old_state and old_state.state == new_state.state):
-            return
-        if new_state.state in [None, "unknown", "unavailable"]:
-            return
-
-        source_ent = next(
-            (
-                ent
-                for ent in (program_select_entities + oven_select_entities)
-                if ent.entity_id == source_entity_id
-            ),
-            None,
-        )
-        if not source_ent:
-            return
-
-        source_device_id = source_ent.device.device.device_id
-
-        if isinstance(source_ent, SmartThingsProgramSelect):
-            source_ent.device.selected_course = translate_program_course(
-                new_state.state
-            )
-            for select_entity in select_entities:
-                if (
-                    select_entity.device.device.device_id == source_device_id
-                    and select_entity.entity_description.supported_option
-                ):
-                    select_entity.update_default_values(
-                        source_ent.device.selected_course
-                    )
-
-        if isinstance(source_ent, SmartThingsOvenModeSelect):
-            for select_entity in oven_select_entities:
-                if select_entity.device.device.device_id == source_device_id:
-                    if select_entity.entity_id == source_entity_id:
-                        select_entity.async_write_ha_state()
-                        async_dispatcher_send(
-                            hass,
-                            f"smartthings_oven_mode_changed_{source_device_id}_{select_entity.component}",
-                            new_state.state,
-                        )
-
-    async_track_state_change_event(hass, program_entities, select_state_listener)
+    return [*select_entities, *program_select_entities, *oven_select_entities]
 
 
 class SmartThingsSelect(SmartThingsEntity, SelectEntity):
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, cast
+from functools import partial
+import math
+import time
+from typing import TYPE_CHECKING, Any, cast
 
 from pysmartthings import Attribute, Capability, SmartThings, Status
 
@@ -28,13 +31,18 @@ from homeassistant.const import (
     UnitOfTime,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.util import dt as dt_util
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import (
     COOKTOP_HEATING_MODES,
+    CYCLE_OPERATING_STATES,
+    CYCLE_RUNNING_STATES,
+    DOMAIN,
     HEALTH_CONCERN,
     HOOD,
     JOB_STATE_MAP,
@@ -45,8 +53,18 @@ from .const import (
     ROBOT_CLEANER_TURBO_MODE_STATE_MAP,
     UNIT_MAP,
 )
-from .entity import SmartThingsEntity
-from .util import get_temperature_unit
+from .countdown import CountdownTicker
+from .duration import DurationStatistics, estimate_end
+from .entity import SmartThingsEntity, async_setup_device_entities
+from .history import (
+    CYCLE_METERS,
+    SIGNAL_CYCLE_READINGS,
+    SIGNAL_CYCLE_UPDATED,
+    CycleHistory,
+)
+from .liveness import SIGNAL_LIVENESS_UPDATED, LivenessMonitor
+from .metrics import SIGNAL_METRICS_UPDATED, IntegrationMetrics
+from .util import get_energy_reading, get_temperature_unit, get_water_reading
 
 THERMOSTAT_CAPABILITIES = {
     Capability.TEMPERATURE_MEASUREMENT,
@@ -1442,16 +1460,303 @@ CAPABILITY_TO_SENSORS: dict[
 }
 
 
+@dataclass(frozen=True, kw_only=True)
+class SmartThingsLivenessSensorEntityDescription(SensorEntityDescription):
+    """Describe a SmartThings event socket liveness sensor entity."""
+
+    value_fn: Callable[[LivenessMonitor, str], datetime | None]
+
+
+LIVENESS_SENSORS: tuple[SmartThingsLivenessSensorEntityDescription, ...] = (
+    SmartThingsLivenessSensorEntityDescription(
+        key="last_event",
+        translation_key="last_event",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda liveness, device_id: liveness.device_last_event.get(device_id),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SmartThingsCycleSensorEntityDescription(SensorEntityDescription):
+    """Describe a SmartThings per cycle consumption sensor entity."""
+
+    capability: Capability
+    attribute: Attribute
+    reading_fn: Callable[[dict[str, Any]], float | None]
+    last_cycle: bool = False
+
+
+CYCLE_SENSORS: tuple[SmartThingsCycleSensorEntityDescription, ...] = (
+    SmartThingsCycleSensorEntityDescription(
+        key="cycle_energy",
+        translation_key="cycle_energy",
+        state_class=SensorStateClass.TOTAL,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        capability=Capability.POWER_CONSUMPTION_REPORT,
+        attribute=Attribute.POWER_CONSUMPTION,
+        reading_fn=get_energy_reading,
+    ),
+    SmartThingsCycleSensorEntityDescription(
+        key="last_cycle_energy",
+        translation_key="last_cycle_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        capability=Capability.POWER_CONSUMPTION_REPORT,
+        attribute=Attribute.POWER_CONSUMPTION,
+        reading_fn=get_energy_reading,
+        last_cycle=True,
+    ),
+    SmartThingsCycleSensorEntityDescription(
+        key="cycle_water",
+        translation_key="cycle_water",
+        state_class=SensorStateClass.TOTAL,
+        device_class=SensorDeviceClass.WATER,
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        suggested_display_precision=1,
+        capability=Capability.SAMSUNG_CE_WATER_CONSUMPTION_REPORT,
+        attribute=Attribute.WATER_CONSUMPTION,
+        reading_fn=get_water_reading,
+    ),
+    SmartThingsCycleSensorEntityDescription(
+        key="last_cycle_water",
+        translation_key="last_cycle_water",
+        device_class=SensorDeviceClass.WATER,
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        suggested_display_precision=1,
+        capability=Capability.SAMSUNG_CE_WATER_CONSUMPTION_REPORT,
+        attribute=Attribute.WATER_CONSUMPTION,
+        reading_fn=get_water_reading,
+        last_cycle=True,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SmartThingsCountdownSensorEntityDescription(SensorEntityDescription):
+    """Describe a SmartThings live countdown sensor entity."""
+
+    state_attribute: Attribute
+    running_states: frozenset[str]
+    paused_states: frozenset[str]
+    value_attribute: Attribute
+    end_fn: Callable[[Any, float], float | None]
+    component_fn: Callable[[str], bool] = lambda component: component == MAIN
+    component_translation_key: dict[str, str] | None = None
+    translation_placeholders_fn: Callable[[str], dict[str, str]] | None = None
+    capability_ignore_list: set[Capability] = field(default_factory=set)
+
+
+def _completion_time_end(value: Any, now: float) -> float | None:
+    """Return the end of a countdown from a completion time."""
+    if not isinstance(value, str) or (parsed := dt_util.parse_datetime(value)) is None:
+        return None
+    return parsed.timestamp()
+
+
+def _timer_end(value: Any, now: float) -> float | None:
+    """Return the end of a countdown from the minutes left on a timer."""
+    if not isinstance(value, (int, float)):
+        return None
+    return now + value * 60
+
+
+COUNTDOWN_SENSORS: dict[Capability, SmartThingsCountdownSensorEntityDescription] = {
+    capability: SmartThingsCountdownSensorEntityDescription(
+        key="live_remaining_time",
+        translation_key="live_remaining_time",
+        state_attribute=Attribute.MACHINE_STATE,
+        running_states=frozenset({"run"}),
+        paused_states=frozenset({"pause"}),
+        value_attribute=Attribute.COMPLETION_TIME,
+        end_fn=_completion_time_end,
+    )
+    for capability in CYCLE_OPERATING_STATES
+}
+COUNTDOWN_SENSORS[Capability.OVEN_OPERATING_STATE] = (
+    SmartThingsCountdownSensorEntityDescription(
+        key="live_remaining_time",
+        translation_key="live_remaining_time",
+        state_attribute=Attribute.MACHINE_STATE,
+        running_states=frozenset({"running"}),
+        paused_states=frozenset({"paused"}),
+        value_attribute=Attribute.COMPLETION_TIME,
+        end_fn=_completion_time_end,
+        component_fn=lambda component: component in (MAIN, "cavity-01", "cavity-02"),
+        component_translation_key={
+            "cavity-01": "oven_live_remaining_time_cavity_01",
+            "cavity-02": "oven_live_remaining_time_cavity_02",
+        },
+        capability_ignore_list={Capability.SAMSUNG_CE_OVEN_OPERATING_STATE},
+    )
+)
+COUNTDOWN_SENSORS[Capability.SAMSUNG_CE_OVEN_OPERATING_STATE] = (
+    SmartThingsCountdownSensorEntityDescription(
+        key="live_remaining_time",
+        translation_key="live_remaining_time",
+        state_attribute=Attribute.OPERATING_STATE,
+        running_states=frozenset({"running"}),
+        paused_states=frozenset({"paused"}),
+        value_attribute=Attribute.COMPLETION_TIME,
+        end_fn=_completion_time_end,
+        component_fn=lambda component: component in (MAIN, "cavity-01", "cavity-02"),
+        component_translation_key={
+            "cavity-01": "oven_live_remaining_time_cavity_01",
+            "cavity-02": "oven_live_remaining_time_cavity_02",
+        },
+    )
+)
+COUNTDOWN_SENSORS[Capability.SAMSUNG_CE_COUNT_DOWN_TIMER] = (
+    SmartThingsCountdownSensorEntityDescription(
+        key="live_countdown_time",
+        translation_key="live_countdown_time",
+        state_attribute=Attribute.STATUS,
+        running_states=frozenset({"running"}),
+        paused_states=frozenset({"paused"}),
+        value_attribute=Attribute.CURRENT_VALUE,
+        end_fn=_timer_end,
+        component_fn=lambda component: component.startswith("burner-0")
+        or component == HOOD,
+        component_translation_key={"hood": "live_countdown_time_hood"},
+        translation_placeholders_fn=lambda component: (
+            {"burner_id": component.split("-0")[-1]}
+            if component.startswith("burner-0")
+            else {}
+        ),
+    )
+)
+
+
+# Share of the difference to a new estimate of the end of a cycle that the
+# estimated end moves by
+ESTIMATE_SMOOTHING = 0.3
+
+
+@dataclass(frozen=True, kw_only=True)
+class SmartThingsHealthSensorEntityDescription(SensorEntityDescription):
+    """Describe a SmartThings integration health sensor entity."""
+
+    value_fn: Callable[[SmartThingsData], float | int | None]
+    extra_state_attributes_fn: Callable[[SmartThingsData], dict[str, Any]] | None = None
+
+
+def _latency_ms(value: float | None) -> float | None:
+    """Return a latency in milliseconds."""
+    return round(value * 1000, 1) if value is not None else None
+
+
+def _metrics(entry_data: SmartThingsData) -> IntegrationMetrics:
+    """Return the metrics of an entry."""
+    return entry_data.metrics
+
+
+HEALTH_SENSORS: tuple[SmartThingsHealthSensorEntityDescription, ...] = (
+    SmartThingsHealthSensorEntityDescription(
+        key="events_per_second",
+        translation_key="events_per_second",
+        native_unit_of_measurement="events/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: _metrics(entry_data).events_per_second,
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="event_latency_p50",
+        translation_key="event_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: _latency_ms(
+            _metrics(entry_data).event_latency.percentile(0.5)
+        ),
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="event_latency_p99",
+        translation_key="event_latency_p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: _latency_ms(
+            _metrics(entry_data).event_latency.percentile(0.99)
+        ),
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="command_latency_p50",
+        translation_key="command_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: _latency_ms(
+            _metrics(entry_data).command_latency.percentile(0.5)
+        ),
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="command_latency_p99",
+        translation_key="command_latency_p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: _latency_ms(
+            _metrics(entry_data).command_latency.percentile(0.99)
+        ),
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="api_calls_per_minute",
+        translation_key="api_calls_per_minute",
+        native_unit_of_measurement="calls/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: round(
+            sum(_metrics(entry_data).api_calls_per_minute.values()), 2
+        ),
+        extra_state_attributes_fn=lambda entry_data: {
+            "methods": _metrics(entry_data).api_calls_per_minute
+        },
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: entry_data.connection.reconnects,
+    ),
+    SmartThingsHealthSensorEntityDescription(
+        key="listeners",
+        translation_key="listeners",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda entry_data: entry_data.dispatcher.listener_count,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: SmartThingsConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add sensors for a config entry."""
-    entry_data = entry.runtime_data
-    entities = []
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+    async_add_entities(
+        SmartThingsHealthSensor(entry, description) for description in HEALTH_SENSORS
+    )
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the sensors of devices."""
+    entities: list[SmartThingsEntity] = []
 
-    for device in entry_data.devices.values():
+    for device in devices:
         entities.extend(
             SmartThingsSensor(
                 entry_data.client, device, description, capability, attribute, component
@@ -1483,8 +1788,75 @@ async def async_setup_entry(
                 or description.supported_fn(device, component)
             )
         )
+        entities.extend(
+            SmartThingsLivenessSensor(
+                entry_data.client, device, entry_data.liveness, description
+            )
+            for description in LIVENESS_SENSORS
+        )
+        entities.extend(_create_cycle_sensors(entry_data, device))
+        entities.extend(_create_countdown_sensors(entry_data.client, device))
 
-    async_add_entities(entities)
+    return entities
+
+
+def _create_cycle_sensors(
+    entry_data: SmartThingsData, device: FullDevice
+) -> list[SmartThingsEntity]:
+    """Create the per cycle sensors of a device."""
+    main_status = device.status.get(MAIN, {})
+    if (
+        operating_state := next(
+            (
+                capability
+                for capability in CYCLE_OPERATING_STATES
+                if capability in main_status
+                and Attribute.MACHINE_STATE in main_status[capability]
+            ),
+            None,
+        )
+    ) is None:
+        return []
+    client = entry_data.client
+    entities: list[SmartThingsEntity] = [
+        SmartThingsEstimatedEndSensor(
+            client, device, entry_data.history, operating_state
+        )
+    ]
+    entities.extend(
+        SmartThingsCycleSensor(client, device, description, entry_data.history)
+        for description in CYCLE_SENSORS
+        if description.capability in main_status
+        and (
+            (
+                attr_status := main_status[description.capability].get(
+                    description.attribute
+                )
+            )
+            is not None
+        )
+        and isinstance(attr_status.value, dict)
+        and description.reading_fn(attr_status.value) is not None
+    )
+    return entities
+
+
+def _create_countdown_sensors(
+    client: SmartThings, device: FullDevice
+) -> list[SmartThingsCountdownSensor]:
+    """Create the live countdown sensors of a device."""
+    return [
+        SmartThingsCountdownSensor(client, device, description, capability, component)
+        for capability, description in COUNTDOWN_SENSORS.items()
+        for component, capabilities in device.status.items()
+        if capability in capabilities
+        and description.component_fn(component)
+        and not description.capability_ignore_list & capabilities.keys()
+        and description.value_attribute in capabilities[capability]
+        and (status := capabilities[capability].get(description.state_attribute))
+        is not None
+        and status.value is not None
+    ]
 
 
 class SmartThingsSensor(SmartThingsEntity, SensorEntity):
@@ -1588,3 +1960,337 @@ class SmartThingsSensor(SmartThingsEntity, SensorEntity):
                 return False
 
         return True
+
+
+class SmartThingsLivenessSensor(SmartThingsEntity, SensorEntity):
+    """Define a SmartThings event socket liveness sensor."""
+
+    entity_description: SmartThingsLivenessSensorEntityDescription
+
+    def __init__(
+        self,
+        client: SmartThings,
+        device: FullDevice,
+        liveness: LivenessMonitor,
+        entity_description: SmartThingsLivenessSensorEntityDescription,
+    ) -> None:
+        """Init the class."""
+        super().__init__(client, device, set())
+        self._attr_unique_id = f"{device.device.device_id}_{entity_description.key}"
+        self._liveness = liveness
+        self.entity_description = entity_description
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to liveness updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_LIVENESS_UPDATED.format(self.device.device.device_id),
+                self._handle_liveness_update,
+            )
+        )
+
+    @callback
+    def _handle_liveness_update(self) -> None:
+        """Handle an event received for the device."""
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(
+            self._liveness, self.device.device.device_id
+        )
+
+
+class SmartThingsCycleSensor(SmartThingsEntity, SensorEntity):
+    """Define a sensor for the consumption of a washer, dryer or dishwasher cycle.
+
+    The values come from the cycle the history follows, so the sensors agree
+    with the logged cycles. A stopped cycle still counts the next reading of
+    its meter, then becomes the last cycle.
+    """
+
+    entity_description: SmartThingsCycleSensorEntityDescription
+
+    def __init__(
+        self,
+        client: SmartThings,
+        device: FullDevice,
+        entity_description: SmartThingsCycleSensorEntityDescription,
+        history: CycleHistory,
+    ) -> None:
+        """Init the class."""
+        super().__init__(client, device, set())
+        self._attr_unique_id = (
+            f"{device.device.device_id}_{MAIN}_{entity_description.key}"
+        )
+        self.entity_description = entity_description
+        self._history = history
+        self._meter = CYCLE_METERS[entity_description.capability][0]
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the cycles and their readings."""
+        await super().async_added_to_hass()
+        device_id = self.device.device.device_id
+        for signal in (SIGNAL_CYCLE_UPDATED, SIGNAL_CYCLE_READINGS):
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass, signal.format(device_id), self._handle_cycle_update
+                )
+            )
+
+    @callback
+    def _handle_cycle_update(self) -> None:
+        """Handle a change of the cycle of the device."""
+        self._handle_update()
+
+    def _update_attr(self) -> None:
+        """Update the use of the current or the last cycle."""
+        device_id = self.device.device.device_id
+        last_cycle = self._history.last_cycle(device_id)
+        if self.entity_description.last_cycle:
+            self._attr_native_value = (
+                last_cycle.get(self._meter) if last_cycle is not None else None
+            )
+            return
+        # The cycle so far starts from zero at the start and end of every cycle
+        if (start := self._history.cycle_start(device_id)) is not None:
+            self._attr_last_reset = dt_util.utc_from_timestamp(start)
+            self._attr_native_value = self._history.cycle_use(device_id, self._meter)
+        else:
+            self._attr_last_reset = (
+                dt_util.utc_from_timestamp(last_cycle["end"])
+                if last_cycle is not None
+                else None
+            )
+            self._attr_native_value = 0
+
+
+class SmartThingsEstimatedEndSensor(SmartThingsEntity, SensorEntity):
+    """Define a sensor for the estimated end of a washer, dryer or dishwasher cycle.
+
+    The end the device reports is weighed against the end the learned
+    duration of the program gives, and smoothed, so the estimate doesn't jump
+    with every update of the device. The durations that apply are looked up
+    once per cycle, so every event takes constant time.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_translation_key = "estimated_end"
+
+    def __init__(
+        self,
+        client: SmartThings,
+        device: FullDevice,
+        history: CycleHistory,
+        operating_state: Capability,
+    ) -> None:
+        """Init the class."""
+        super().__init__(client, device, {operating_state})
+        self._attr_unique_id = f"{device.device.device_id}_{MAIN}_estimated_end"
+        self._history = history
+        self._operating_state = operating_state
+        self._cycle_start: int | None = None
+        self._statistics: DurationStatistics | None = None
+        self._smoothed: float | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the start and end of cycles."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_CYCLE_UPDATED.format(self.device.device.device_id),
+                self._handle_cycle_update,
+            )
+        )
+
+    @callback
+    def _handle_cycle_update(self) -> None:
+        """Handle the start or end of a cycle of the device."""
+        self._handle_update()
+
+    def _update_attr(self) -> None:
+        """Estimate the end of the cycle in progress."""
+        cycle = self._history.cycle(self.device.device.device_id)
+        if (
+            cycle is None
+            or self.get_attribute_value(self._operating_state, Attribute.MACHINE_STATE)
+            not in CYCLE_RUNNING_STATES
+        ):
+            self._cycle_start = self._statistics = self._smoothed = None
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        if cycle["start"] != self._cycle_start:
+            self._cycle_start = cycle["start"]
+            self._statistics = self._history.durations.statistics(
+                self.device.device.device_id, cycle["program"], cycle["options"]
+            )
+            self._smoothed = None
+        device_end = None
+        if Attribute.COMPLETION_TIME in self._internal_state[self._operating_state]:
+            completion_time = self.get_attribute_value(
+                self._operating_state, Attribute.COMPLETION_TIME
+            )
+            if completion_time and (parsed := dt_util.parse_datetime(completion_time)):
+                device_end = parsed.timestamp()
+        now = dt_util.utcnow().timestamp()
+        estimate = estimate_end(cycle["start"], now, device_end, self._statistics)
+        if estimate is None:
+            self._attr_native_value = None
+            return
+        if self._smoothed is None:
+            self._smoothed = estimate
+        else:
+            self._smoothed += ESTIMATE_SMOOTHING * (estimate - self._smoothed)
+        self._attr_native_value = dt_util.utc_from_timestamp(max(self._smoothed, now))
+        statistics = self._statistics
+        self._attr_extra_state_attributes = {
+            "confidence": round(statistics.confidence, 2) if statistics else 0.0,
+            "cycles": statistics.count if statistics else 0,
+            "typical_duration": (
+                round(statistics.quantiles[1] / 60) if statistics else None
+            ),
+        }
+
+
+class SmartThingsCountdownSensor(SmartThingsEntity, SensorEntity):
+    """Define a sensor counting down the remaining time of an appliance locally.
+
+    Every event of the appliance anchors the end of the countdown again, and
+    in between the shared ticker of the entry counts down towards it while
+    the appliance runs. A paused countdown keeps its remaining time.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_suggested_display_precision = 0
+
+    entity_description: SmartThingsCountdownSensorEntityDescription
+    _ticker: CountdownTicker
+
+    def __init__(
+        self,
+        client: SmartThings,
+        device: FullDevice,
+        entity_description: SmartThingsCountdownSensorEntityDescription,
+        capability: Capability,
+        component: str,
+    ) -> None:
+        """Init the class."""
+        super().__init__(client, device, {capability}, component=component)
+        self._attr_unique_id = (
+            f"{device.device.device_id}_{component}_{capability}_"
+            f"{entity_description.key}"
+        )
+        self.capability = capability
+        self.entity_description = entity_description
+        if entity_description.translation_placeholders_fn:
+            self._attr_translation_placeholders = (
+                entity_description.translation_placeholders_fn(component)
+            )
+        if entity_description.component_translation_key and component != MAIN:
+            self._attr_translation_key = (
+                entity_description.component_translation_key.get(
+                    component, entity_description.translation_key
+                )
+            )
+        self._end: float | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the ticker of the entry."""
+        if TYPE_CHECKING:
+            assert self.platform.config_entry is not None
+        self._ticker = self.platform.config_entry.runtime_data.countdown
+        self.async_on_remove(partial(self._ticker.async_remove, self._async_tick))
+        await super().async_added_to_hass()
+
+    def _update_attr(self) -> None:
+        """Anchor the end of the countdown on the state of the appliance."""
+        description = self.entity_description
+        state = self.get_attribute_value(self.capability, description.state_attribute)
+        now = time.time()
+        self._end = None
+        if state in description.running_states or state in description.paused_states:
+            self._end = description.end_fn(
+                self.get_attribute_value(self.capability, description.value_attribute),
+                now,
+            )
+        self._set_remaining(now)
+        if state in description.running_states and self._attr_native_value:
+            self._ticker.async_add(self._async_tick)
+        else:
+            self._ticker.async_remove(self._async_tick)
+
+    def _set_remaining(self, now: float) -> None:
+        """Set the remaining time, rounded up to the resolution of the ticker."""
+        if self._end is None:
+            self._attr_native_value = 0
+            return
+        resolution = self._ticker.resolution.total_seconds()
+        self._attr_native_value = int(
+            math.ceil(max(self._end - now, 0) / resolution) * resolution
+        )
+
+    @callback
+    def _async_tick(self, now: float) -> None:
+        """Count down towards the end."""
+        self._set_remaining(now)
+        if not self._attr_native_value:
+            self._ticker.async_remove(self._async_tick)
+        self.async_write_ha_state()
+
+
+class SmartThingsHealthSensor(SensorEntity):
+    """Define a sensor for the health of the integration."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    entity_description: SmartThingsHealthSensorEntityDescription
+
+    def __init__(
+        self,
+        entry: SmartThingsConfigEntry,
+        entity_description: SmartThingsHealthSensorEntityDescription,
+    ) -> None:
+        """Init the class."""
+        self._entry = entry
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{entry.entry_id}_{entity_description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="SmartThings",
+            model="Integration health",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to metric updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_METRICS_UPDATED.format(self._entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._entry.runtime_data)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes."""
+        if self.entity_description.extra_state_attributes_fn:
+            return self.entity_description.extra_state_attributes_fn(
+                self._entry.runtime_data
+            )
+        return None
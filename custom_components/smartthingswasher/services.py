@@ -0,0 +1,249 @@
+"""Services for the SmartThings integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.selector import ConfigEntrySelector
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .profiler import async_profile_dispatch
+from .recorder import async_record_events
+from .resync import async_resync_devices
+
+if TYPE_CHECKING:
+    from . import SmartThingsConfigEntry
+
+ATTR_CONFIG_ENTRY = "config_entry"
+ATTR_DURATION = "duration"
+ATTR_END = "end"
+ATTR_LIMIT = "limit"
+ATTR_PROGRAM = "program"
+ATTR_REDACT = "redact"
+ATTR_START = "start"
+ATTR_TOP = "top"
+
+SERVICE_RESYNC = "resync"
+SERVICE_RESYNC_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector({"integration": DOMAIN}),
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+SERVICE_PROFILE = "profile"
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector({"integration": DOMAIN}),
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_TOP, default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+SERVICE_RECORD_EVENTS = "record_events"
+SERVICE_RECORD_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector({"integration": DOMAIN}),
+        vol.Optional(ATTR_DURATION, default=300): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=86400)
+        ),
+        vol.Optional(ATTR_REDACT, default=True): cv.boolean,
+    }
+)
+
+SERVICE_GET_CYCLE_HISTORY = "get_cycle_history"
+SERVICE_GET_CYCLE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector({"integration": DOMAIN}),
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_PROGRAM): cv.string,
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+
+SERVICE_CYCLE_STATISTICS = "cycle_statistics"
+SERVICE_CYCLE_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): ConfigEntrySelector({"integration": DOMAIN}),
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+
+def get_config_entry(hass: HomeAssistant, entry_id: str) -> SmartThingsConfigEntry:
+    """Return a loaded config entry."""
+    if not (entry := hass.config_entries.async_get_entry(entry_id)):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+        )
+    return entry
+
+
+def get_smartthings_device_ids(hass: HomeAssistant, device_ids: list[str]) -> list[str]:
+    """Return the SmartThings device ids of device registry entries."""
+    device_registry = dr.async_get(hass)
+    smartthings_device_ids: list[str] = []
+    for device_id in device_ids:
+        if (device_entry := device_registry.async_get(device_id)) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="device_not_found",
+                translation_placeholders={"device_id": device_id},
+            )
+        smartthings_device_ids.extend(
+            identifier[1]
+            for identifier in device_entry.identifiers
+            if identifier[0] == DOMAIN
+        )
+    return smartthings_device_ids
+
+
+def get_history_device_ids(
+    hass: HomeAssistant, entry: SmartThingsConfigEntry, call: ServiceCall
+) -> list[str]:
+    """Return the SmartThings device ids of a cycle history call."""
+    if ATTR_DEVICE_ID in call.data:
+        return get_smartthings_device_ids(hass, call.data[ATTR_DEVICE_ID])
+    return list(entry.runtime_data.devices)
+
+
+def get_history_range(call: ServiceCall) -> tuple[float | None, float | None]:
+    """Return the timestamps of the start and end of a cycle history call."""
+    since, until = (
+        dt_util.as_utc(call.data[attribute]).timestamp()
+        if attribute in call.data
+        else None
+        for attribute in (ATTR_START, ATTR_END)
+    )
+    return since, until
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up services for the SmartThings integration."""
+
+    async def resync(call: ServiceCall) -> ServiceResponse:
+        """Reconcile the state of devices with the cloud."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        device_ids: list[str] | None = None
+        if ATTR_DEVICE_ID in call.data:
+            device_ids = get_smartthings_device_ids(hass, call.data[ATTR_DEVICE_ID])
+        changed = await async_resync_devices(entry, device_ids)
+        return {"changed_attributes": changed}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESYNC,
+        resync,
+        schema=SERVICE_RESYNC_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the event dispatch of a config entry."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        return await async_profile_dispatch(
+            hass, entry, call.data[ATTR_DURATION], call.data[ATTR_TOP]
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        profile,
+        schema=SERVICE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def record_events(call: ServiceCall) -> ServiceResponse:
+        """Record the event stream of a config entry."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        return await async_record_events(
+            hass, entry, call.data[ATTR_DURATION], call.data[ATTR_REDACT]
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_EVENTS,
+        record_events,
+        schema=SERVICE_RECORD_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def get_cycle_history(call: ServiceCall) -> ServiceResponse:
+        """Return the cycles of devices that ran between two times."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        devices = entry.runtime_data.devices
+        device_ids = get_history_device_ids(hass, entry, call)
+        since, until = get_history_range(call)
+        cycles = await entry.runtime_data.history.async_query(
+            device_ids,
+            since,
+            until,
+            call.data.get(ATTR_PROGRAM),
+            call.data[ATTR_LIMIT],
+        )
+        return {
+            "devices": {
+                device_id: {
+                    "name": devices[device_id].device.label
+                    if device_id in devices
+                    else None,
+                    "cycles": device_cycles,
+                }
+                for device_id, device_cycles in cycles.items()
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CYCLE_HISTORY,
+        get_cycle_history,
+        schema=SERVICE_GET_CYCLE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def cycle_statistics(call: ServiceCall) -> ServiceResponse:
+        """Return the statistics per program of the cycles of devices."""
+        entry = get_config_entry(hass, call.data[ATTR_CONFIG_ENTRY])
+        since, until = get_history_range(call)
+        return await entry.runtime_data.history.async_statistics(
+            get_history_device_ids(hass, entry, call), since, until
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CYCLE_STATISTICS,
+        cycle_statistics,
+        schema=SERVICE_CYCLE_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
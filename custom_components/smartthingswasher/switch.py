@@ -14,9 +14,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, Program, SmartThingsConfigEntry
+from . import FullDevice, Program, SmartThingsConfigEntry, SmartThingsData
 from .const import CAPABILITY_COMMANDS, CAPABILITY_COURSES, HOOD, MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 from .models import SupportedOption
 from .util import command_program_course, get_program_table_id, translate_program_course
 
@@ -426,8 +426,14 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add switches for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the switches of devices."""
+    entities: list[SmartThingsEntity] = [
         SmartThingsSwitch(
             entry_data.client,
             device,
@@ -436,7 +442,7 @@ async def async_setup_entry(
             attribute,
             component,
         )
-        for device in entry_data.devices.values()
+        for device in devices
         for component, capabilities in device.status.items()
         if not any(c in capabilities for c in CAPABILITIES)
         if not all(c in capabilities for c in AC_CAPABILITIES)
@@ -451,9 +457,9 @@ async def async_setup_entry(
                 and description.component_fn(component)
             )
         )
-    )
+    ]
 
-    async_add_entities(
+    entities.extend(
         SmartThingsSwitch(
             entry_data.client,
             device,
@@ -462,7 +468,7 @@ async def async_setup_entry(
             attribute,
             component,
         )
-        for device in entry_data.devices.values()
+        for device in devices
         for capability, attributes in DISHWASHER_WASHING_OPTIONS_TO_SWITCHES.items()
         for component in device.status
         if capability in device.status[component]
@@ -475,7 +481,7 @@ async def async_setup_entry(
         for description in descriptions
     )
 
-    async_add_entities(
+    entities.extend(
         SmartThingsProgramSwitch(
             entry_data.client,
             device,
@@ -484,13 +490,14 @@ async def async_setup_entry(
             attribute,
             component,
         )
-        for device in entry_data.devices.values()
+        for device in devices
         for program in device.programs.values()
         for component, capabilities in device.status.items()
         for capability, attribute in CAPABILITY_COURSES.items()
         if capability in capabilities
         and capabilities[capability].get(attribute) is not None
     )
+    return entities
 
 
 class SmartThingsSwitch(SmartThingsEntity, SwitchEntity):
@@ -12,9 +12,9 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -46,13 +46,19 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add time entities for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the time entities of devices."""
+    return [
         SmartThingsDnDTime(entry_data.client, device, description)
-        for device in entry_data.devices.values()
+        for device in devices
         if Capability.CUSTOM_DO_NOT_DISTURB_MODE in device.status.get(MAIN, {})
         for description in DND_ENTITIES
-    )
+    ]
 
 
 class SmartThingsDnDTime(SmartThingsEntity, TimeEntity):
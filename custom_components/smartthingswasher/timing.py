@@ -0,0 +1,112 @@
+"""Setup timing for SmartThings."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+SETUP_HISTORY_SIZE = 10
+
+SETUP_TIMINGS: HassKey[dict[str, deque[SetupTimer]]] = HassKey(
+    f"{DOMAIN}_setup_timings"
+)
+
+
+def get_setup_history(hass: HomeAssistant, entry_id: str) -> deque[SetupTimer]:
+    """Return the timings of the last setups of a config entry."""
+    return hass.data.setdefault(SETUP_TIMINGS, {}).setdefault(
+        entry_id, deque(maxlen=SETUP_HISTORY_SIZE)
+    )
+
+
+class SetupTimer:
+    """Measure the phases of a config entry setup.
+
+    A phase runs once per setup, a sample is a step that repeats, like
+    fetching the status of every device, and is reported as a distribution.
+    Phases can nest: the planning_<platform> phases only time planning the
+    entities of a platform and are part of the platforms phase, which times
+    the whole setup of all platforms.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timer."""
+        self.started = dt_util.utcnow()
+        self._start = time.perf_counter()
+        self.total: float | None = None
+        self.phases: dict[str, float] = {}
+        self.samples: dict[str, list[float]] = {}
+        self.details: dict[str, Any] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the setup."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    @contextmanager
+    def sample(self, name: str) -> Iterator[None]:
+        """Time one occurrence of a repeated step of the setup."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    def add_samples(self, name: str, values: list[float]) -> None:
+        """Add occurrences of a repeated step that were timed elsewhere."""
+        self.samples.setdefault(name, []).extend(values)
+
+    def finish(self) -> None:
+        """Mark the setup as finished."""
+        self.total = time.perf_counter() - self._start
+
+    def summary(self) -> str:
+        """Return a single line summary of the phases."""
+        parts = [f"{name}={value:.3f}s" for name, value in self.phases.items()]
+        parts.extend(
+            f"{name}={sum(values):.3f}s/{len(values)}"
+            for name, values in self.samples.items()
+        )
+        return " ".join(parts)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings as a dictionary."""
+        return {
+            "started": self.started.isoformat(),
+            "total": round(self.total, 4) if self.total is not None else None,
+            "phases": {name: round(value, 4) for name, value in self.phases.items()},
+            "samples": {
+                name: _distribution(values) for name, values in self.samples.items()
+            },
+            **self.details,
+        }
+
+
+def _distribution(values: list[float]) -> dict[str, float | int]:
+    """Return the distribution of timing samples."""
+    ordered = sorted(values)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 4)
+
+    return {
+        "count": len(ordered),
+        "total": round(sum(ordered), 4),
+        "min": round(ordered[0], 4),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "max": round(ordered[-1], 4),
+    }
@@ -0,0 +1,163 @@
+"""Event to state latency tracing for SmartThings."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from pysmartthings import DeviceEvent
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+if TYPE_CHECKING:
+    from .entity import SmartThingsEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_LOG_INTERVAL = timedelta(minutes=5)
+TRACE_LOG_TOP = 10
+
+STAGES = ("dispatch", "update_attr", "state_write")
+
+# Index of the count and the slowest update next to the stage totals
+COUNT = len(STAGES)
+SLOWEST = COUNT + 1
+
+
+class LatencyTracer:
+    """Trace where the time goes between an event and the state write.
+
+    For every entity updated by an event the time is split in stages:
+    dispatch, from calling the listener of the entity until its update
+    starts, update_attr and the state write, which includes evaluating the
+    properties. The slowest update is measured from the start of the
+    dispatch of the event, so it includes the listeners that ran before.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracer."""
+        self._received: float | None = None
+        self._listener_started: float | None = None
+        self._capability: str | None = None
+        # Stage totals, count and slowest update per platform, capability
+        # and entity description
+        self.stats: dict[tuple[str, str, str], list[float]] = {}
+
+    @callback
+    def start(self, hass: HomeAssistant) -> Callable[[], None]:
+        """Start logging a summary every interval."""
+        return async_track_time_interval(hass, self._async_log, TRACE_LOG_INTERVAL)
+
+    @property
+    def active(self) -> bool:
+        """Return if an event is being dispatched."""
+        return self._capability is not None
+
+    def event_started(self, event: DeviceEvent) -> None:
+        """Stamp an event when its dispatch starts."""
+        self._received = time.perf_counter()
+        self._capability = event.capability
+
+    def listener_started(self) -> None:
+        """Stamp the call of a listener of the event being dispatched."""
+        self._listener_started = time.perf_counter()
+
+    def event_finished(self) -> None:
+        """Mark the end of the dispatch of an event."""
+        self._received = self._listener_started = self._capability = None
+
+    def trace_update(self, entity: SmartThingsEntity) -> None:
+        """Update an entity and write its state, timing every stage."""
+        if TYPE_CHECKING:
+            assert self._received is not None
+            assert self._listener_started is not None
+            assert self._capability is not None
+        start = time.perf_counter()
+        entity._update_attr()  # noqa: SLF001
+        attributes_updated = time.perf_counter()
+        entity.async_write_ha_state()
+        written = time.perf_counter()
+        timings = (
+            start - self._listener_started,
+            attributes_updated - start,
+            written - attributes_updated,
+        )
+        description = getattr(entity, "entity_description", None)
+        key = (
+            entity.platform.domain,
+            self._capability,
+            description.key if description is not None else type(entity).__name__,
+        )
+        if (stats := self.stats.get(key)) is None:
+            stats = self.stats[key] = [0.0] * (len(STAGES) + 2)
+        for index, timing in enumerate(timings):
+            stats[index] += timing
+        stats[COUNT] += 1
+        stats[SLOWEST] = max(stats[SLOWEST], written - self._received)
+
+    def _group(self, index: int) -> dict[str, dict[str, Any]]:
+        """Return the stats summed by a part of their key."""
+        grouped: dict[str, list[float]] = {}
+        for key, stats in self.stats.items():
+            if (total := grouped.get(key[index])) is None:
+                grouped[key[index]] = list(stats)
+                continue
+            for stage in range(COUNT + 1):
+                total[stage] += stats[stage]
+            total[SLOWEST] = max(total[SLOWEST], stats[SLOWEST])
+        return {name: _summary(stats) for name, stats in sorted(grouped.items())}
+
+    def top(self, count: int) -> list[dict[str, Any]]:
+        """Return the entity descriptions that took the most time."""
+        ordered = sorted(
+            self.stats.items(), key=lambda item: sum(item[1][:COUNT]), reverse=True
+        )
+        return [
+            {
+                "platform": platform,
+                "capability": capability,
+                "description": description,
+                **_summary(stats),
+            }
+            for (platform, capability, description), stats in ordered[:count]
+        ]
+
+    @callback
+    def _async_log(self, now: datetime) -> None:
+        """Log the entity descriptions that took the most time."""
+        if not self.stats or not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        for item in self.top(TRACE_LOG_TOP):
+            _LOGGER.debug(
+                "%s %s %s: %s updates, %s",
+                item["platform"],
+                item["capability"],
+                item["description"],
+                item["count"],
+                " ".join(f"{stage}={item[stage]}ms" for stage in STAGES),
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the traced latencies for diagnostics."""
+        return {
+            "platforms": self._group(0),
+            "capabilities": self._group(1),
+            "top": self.top(TRACE_LOG_TOP),
+        }
+
+
+def _summary(stats: list[float]) -> dict[str, Any]:
+    """Return the mean of every stage and the slowest update in milliseconds."""
+    count = int(stats[COUNT])
+    return {
+        "count": count,
+        **{
+            stage: round(stats[index] / count * 1000, 3)
+            for index, stage in enumerate(STAGES)
+        },
+        "slowest": round(stats[SLOWEST] * 1000, 3),
+    }
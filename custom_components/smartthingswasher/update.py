@@ -15,9 +15,9 @@ from homeassistant.components.update import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 
 async def async_setup_entry(
@@ -26,12 +26,18 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add update entities for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the update entities of devices."""
+    return [
         SmartThingsUpdateEntity(entry_data.client, device, {Capability.FIRMWARE_UPDATE})
-        for device in entry_data.devices.values()
+        for device in devices
         if Capability.FIRMWARE_UPDATE in device.status[MAIN]
-    )
+    ]
 
 
 def is_hex_version(version: str) -> bool:
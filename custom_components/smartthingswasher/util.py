@@ -148,6 +148,16 @@ def time_to_minutes(time_str: str | None) -> int:
     return 0
 
 
+def get_energy_reading(value: dict[str, Any]) -> float | None:
+    """Return the energy meter reading of a power consumption report in kWh."""
+    return value["energy"] / 1000 if "energy" in value else None
+
+
+def get_water_reading(value: dict[str, Any]) -> float | None:
+    """Return the water meter reading of a water consumption report in L."""
+    return value["cumulativeAmount"] / 1000 if "cumulativeAmount" in value else None
+
+
 def get_component_attribute_value(
     status: dict[str, ComponentStatus],
     component_id: str,
@@ -12,9 +12,9 @@ from homeassistant.components.valve import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 DEVICE_CLASS_MAP: dict[Category | str, ValveDeviceClass] = {
     Category.WATER_VALVE: ValveDeviceClass.WATER,
@@ -28,12 +28,18 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add valves for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the valves of devices."""
+    return [
         SmartThingsValve(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if Capability.VALVE in device.status[MAIN]
-    )
+    ]
 
 
 class SmartThingsValve(SmartThingsEntity, ValveEntity):
@@ -21,9 +21,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.util.unit_conversion import TemperatureConverter
 
-from . import FullDevice, SmartThingsConfigEntry
+from . import FullDevice, SmartThingsConfigEntry, SmartThingsData
 from .const import MAIN, UNIT_MAP
-from .entity import SmartThingsEntity
+from .entity import SmartThingsEntity, async_setup_device_entities
 
 OPERATION_MAP_TO_HA: dict[str, str] = {
     "eco": STATE_ECO,
@@ -41,10 +41,16 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Add water heaters for a config entry."""
-    entry_data = entry.runtime_data
-    async_add_entities(
+    async_setup_device_entities(hass, entry, async_add_entities, create_entities)
+
+
+def create_entities(
+    entry_data: SmartThingsData, devices: list[FullDevice]
+) -> list[SmartThingsEntity]:
+    """Create the water heaters of devices."""
+    return [
         SmartThingsWaterHeater(entry_data.client, device)
-        for device in entry_data.devices.values()
+        for device in devices
         if all(
             capability in device.status[MAIN]
             for capability in (
@@ -61,7 +67,7 @@ async def async_setup_entry(
             Attribute.TEMPERATURE
         ].value
         is not None
-    )
+    ]
 
 
 class SmartThingsWaterHeater(SmartThingsEntity, WaterHeaterEntity):
@@ -0,0 +1,130 @@
+"""Tests for the SmartThings cycle statistics."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import orjson
+import pytest
+
+from custom_components.smartthingswasher.analytics import (
+    CycleColumnCache,
+    cycle_statistics,
+)
+
+pytest.importorskip("numpy")
+
+TIME_ZONE = ZoneInfo("Europe/Amsterdam")
+# Spans the change to daylight saving time
+FIRST_START = 1742500000
+
+
+def _write_log(path: Path, count: int, seed: int) -> list[dict[str, Any]]:
+    """Write a log of random cycles and return them."""
+    rng = random.Random(seed)
+    cycles = []
+    start = FIRST_START
+    for _ in range(count):
+        start += rng.randint(600, 36000)
+        cycle = {
+            "start": start,
+            "end": start + rng.randint(300, 10800),
+            "program": rng.choice(["cotton", "eco", "quick", None]),
+            "options": {},
+            "energy": rng.choice([None, round(rng.uniform(0, 2), 3)]),
+            "water": rng.choice([None, round(rng.uniform(20, 80), 1)]),
+            "job_state": None,
+        }
+        cycles.append(cycle)
+    path.write_bytes(b"".join(orjson.dumps(cycle) + b"\n" for cycle in cycles))
+    return cycles
+
+
+@pytest.mark.parametrize(
+    ("since", "until"),
+    [
+        (None, None),
+        (FIRST_START + 86400 * 5, None),
+        (None, FIRST_START + 86400 * 20),
+        (FIRST_START + 86400 * 5, FIRST_START + 86400 * 20),
+        # No cycles in the range
+        (FIRST_START + 86400 * 1000, None),
+    ],
+)
+def test_numpy_python_parity(
+    tmp_path: Path, since: float | None, until: float | None
+) -> None:
+    """Test both engines aggregate the same statistics."""
+    _write_log(tmp_path / "washer.ndjson", 200, 1)
+    _write_log(tmp_path / "dryer.ndjson", 3, 2)
+    cache = CycleColumnCache()
+    columns = cache.load([tmp_path / "washer.ndjson", tmp_path / "dryer.ndjson"])
+
+    vectorized = cycle_statistics(columns, cache.programs, since, until, TIME_ZONE)
+    looped = cycle_statistics(
+        columns, cache.programs, since, until, TIME_ZONE, use_numpy=False
+    )
+
+    assert vectorized.pop("engine") == "numpy"
+    assert looped.pop("engine") == "array"
+    assert vectorized == looped
+
+
+def test_statistics_values(tmp_path: Path) -> None:
+    """Test the statistics of known cycles, without and with NumPy."""
+    day = FIRST_START
+    cycles = [
+        {"start": day, "end": day + 3600, "program": "cotton", "energy": 1.0},
+        {"start": day + 7200, "end": day + 9000, "program": "cotton", "energy": 2.0},
+        {"start": day + 90000, "end": day + 93600, "program": "eco", "energy": None},
+    ]
+    path = tmp_path / "washer.ndjson"
+    path.write_bytes(b"".join(orjson.dumps(cycle) + b"\n" for cycle in cycles))
+    cache = CycleColumnCache()
+    columns = cache.load([path])
+
+    for use_numpy in (True, False):
+        result = cycle_statistics(
+            columns, cache.programs, None, None, TIME_ZONE, use_numpy=use_numpy
+        )
+
+        assert result["cycles"] == 3
+        assert result["programs"]["cotton"]["count"] == 2
+        assert result["programs"]["cotton"]["duration"] == {
+            "mean": 45.0,
+            "median": 45.0,
+            "p95": 58.5,
+        }
+        assert result["programs"]["cotton"]["energy"]["mean"] == 1.5
+        assert result["programs"]["eco"]["energy"] == {
+            "mean": None,
+            "median": None,
+            "p95": None,
+        }
+        assert sum(result["days"].values()) == 3
+        assert len(result["days"]) == 2
+
+
+def test_cache_reads_appended_lines(tmp_path: Path) -> None:
+    """Test the cache only parses what was appended and notices rotations."""
+    path = tmp_path / "washer.ndjson"
+    first = {"start": 0, "end": 3600, "program": "cotton"}
+    second = {"start": 7200, "end": 9000, "program": "eco"}
+    path.write_bytes(orjson.dumps(first) + b"\n")
+    cache = CycleColumnCache()
+
+    assert list(cache.load([path]).start) == [0]
+
+    with path.open("ab") as file:
+        file.write(orjson.dumps(second) + b"\n" + b'{"start": 1')
+
+    # The line being appended is read the next time
+    assert list(cache.load([path]).start) == [0, 7200]
+
+    path.write_bytes(orjson.dumps(second) + b"\n")
+
+    assert list(cache.load([path]).start) == [7200]
+    assert cache.programs == ["cotton", "eco"]
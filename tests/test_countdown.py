@@ -0,0 +1,71 @@
+"""Tests for the SmartThings countdown ticker."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from custom_components.smartthingswasher.countdown import CountdownTicker
+from homeassistant.util import dt as dt_util
+
+
+def test_ticker_runs_while_countdowns_are_added() -> None:
+    """Test the timer starts with the first countdown and stops after the last."""
+    unsub_timer = MagicMock()
+    ticker = CountdownTicker(MagicMock(), timedelta(seconds=30))
+    first = MagicMock()
+    second = MagicMock()
+
+    with patch(
+        "custom_components.smartthingswasher.countdown.async_track_time_interval",
+        return_value=unsub_timer,
+    ) as track_time_interval:
+        ticker.async_add(first)
+        ticker.async_add(second)
+        ticker.async_add(first)
+
+        track_time_interval.assert_called_once()
+        assert track_time_interval.call_args.args[2] == timedelta(seconds=30)
+        assert ticker.as_dict()["running"] == 2
+
+        ticker.async_remove(first)
+
+        unsub_timer.assert_not_called()
+
+        ticker.async_remove(second)
+
+        unsub_timer.assert_called_once()
+        assert ticker.as_dict()["running"] == 0
+
+        ticker.async_remove(second)
+        ticker.async_add(first)
+
+    unsub_timer.assert_called_once()
+    assert track_time_interval.call_count == 2
+
+
+def test_ticker_ticks_every_countdown() -> None:
+    """Test a tick hands every countdown the same time."""
+    ticker = CountdownTicker(MagicMock(), timedelta(seconds=30))
+    now = dt_util.utcnow()
+    first = MagicMock()
+
+    def second(timestamp: float) -> None:
+        # A countdown reaching zero removes itself during the tick
+        ticker.async_remove(second)
+
+    with patch(
+        "custom_components.smartthingswasher.countdown.async_track_time_interval"
+    ) as track_time_interval:
+        ticker.async_add(first)
+        ticker.async_add(second)
+        tick = track_time_interval.call_args.args[1]
+        tick(now)
+        tick(now + timedelta(seconds=30))
+
+    assert [call.args for call in first.call_args_list] == [
+        (now.timestamp(),),
+        ((now + timedelta(seconds=30)).timestamp(),),
+    ]
+    assert ticker.ticks == 2
+    assert ticker.as_dict()["running"] == 1
@@ -0,0 +1,167 @@
+"""Tests for the learned durations of SmartThings programs."""
+
+from __future__ import annotations
+
+import statistics
+
+import pytest
+
+from custom_components.smartthingswasher.duration import (
+    MIN_DURATION,
+    MIN_OPTION_SAMPLES,
+    RECENT_DURATIONS,
+    DurationModel,
+    DurationStatistics,
+    estimate_end,
+    options_key,
+)
+
+DURATIONS = [3600.0, 3900.0, 3300.0, 4200.0, 3000.0]
+
+
+def _cycle(
+    duration: float, program: str | None = "cotton", **options: str
+) -> dict[str, object]:
+    """Return a finished cycle of the cycle history."""
+    return {
+        "start": 1000,
+        "end": 1000 + duration,
+        "program": program,
+        "options": options,
+    }
+
+
+def test_statistics_running() -> None:
+    """Test the running mean and deviation match the batch ones."""
+    durations = DurationStatistics()
+    for duration in DURATIONS:
+        durations.add(duration)
+
+    assert durations.count == len(DURATIONS)
+    assert durations.mean == pytest.approx(statistics.mean(DURATIONS))
+    assert durations.std == pytest.approx(statistics.stdev(DURATIONS))
+    assert durations.quantiles == (3000.0, 3600.0, 4200.0)
+
+
+def test_statistics_single_cycle() -> None:
+    """Test a single cycle has no deviation."""
+    durations = DurationStatistics()
+    durations.add(3600)
+
+    assert durations.std == 0.0
+    assert durations.quantiles == (3600, 3600, 3600)
+
+
+def test_statistics_recent_quantiles() -> None:
+    """Test the quantiles follow the recent cycles only."""
+    durations = DurationStatistics()
+    for _ in range(RECENT_DURATIONS):
+        durations.add(1800)
+    for _ in range(RECENT_DURATIONS):
+        durations.add(3600)
+
+    assert durations.quantiles == (3600, 3600, 3600)
+    assert durations.mean == pytest.approx(2700)
+
+
+def test_statistics_confidence() -> None:
+    """Test the confidence grows with cycles and drops with variation."""
+    assert DurationStatistics().confidence == 0.0
+    steady = DurationStatistics()
+    varying = DurationStatistics()
+    confidences = []
+    for duration in DURATIONS:
+        steady.add(3600)
+        varying.add(duration)
+        confidences.append(steady.confidence)
+
+    assert confidences == sorted(confidences)
+    assert 0 < varying.confidence < steady.confidence < 1
+
+
+def test_statistics_round_trip() -> None:
+    """Test stored statistics are restored as they were."""
+    durations = DurationStatistics()
+    for duration in DURATIONS:
+        durations.add(duration)
+
+    restored = DurationStatistics.from_dict(durations.as_dict())
+
+    assert restored.count == durations.count
+    assert restored.mean == durations.mean
+    assert restored.std == durations.std
+    assert restored.quantiles == durations.quantiles
+
+
+def test_model_ignores_partial_and_short_cycles() -> None:
+    """Test partial, unknown and cancelled cycles aren't learned from."""
+    model = DurationModel()
+    model.add_cycle("washer", {**_cycle(3600), "partial": True})
+    model.add_cycle("washer", _cycle(3600, program=None))
+    model.add_cycle("washer", _cycle(MIN_DURATION - 1))
+
+    assert model.statistics("washer", "cotton", {}) is None
+
+
+def test_model_options() -> None:
+    """Test the durations of options are used once there are enough."""
+    model = DurationModel()
+    for _ in range(MIN_OPTION_SAMPLES):
+        model.add_cycle("washer", _cycle(3600))
+    for _ in range(MIN_OPTION_SAMPLES - 1):
+        model.add_cycle("washer", _cycle(7200, spin="1400"))
+
+    program = model.statistics("washer", "cotton", {"spin": "1400"})
+    assert program is not None
+    assert program.count == 2 * MIN_OPTION_SAMPLES - 1
+
+    model.add_cycle("washer", _cycle(7200, spin="1400"))
+
+    options = model.statistics("washer", "cotton", {"spin": "1400"})
+    assert options is not None
+    assert options.count == MIN_OPTION_SAMPLES
+    assert options.mean == 7200
+    assert model.statistics("dryer", "cotton", {}) is None
+    assert model.statistics("washer", None, {}) is None
+
+
+def test_model_round_trip_and_remove() -> None:
+    """Test a stored model is restored and devices are forgotten."""
+    model = DurationModel()
+    model.add_cycle("washer", _cycle(3600, spin="1400"))
+    model.add_cycle("dryer", _cycle(5400))
+
+    restored = DurationModel.from_dict(model.as_dict())
+    washer = restored.statistics("washer", "cotton", {"spin": "1400"})
+    assert washer is not None
+    assert washer.mean == 3600
+
+    restored.remove_device("washer")
+
+    assert restored.statistics("washer", "cotton", {}) is None
+    assert restored.statistics("dryer", "cotton", {}) is not None
+
+
+def test_options_key() -> None:
+    """Test the key of options doesn't depend on their order."""
+    assert options_key({"spin": "1400", "rinse": 2}) == options_key(
+        {"rinse": 2, "spin": "1400"}
+    )
+    assert options_key({}) == ""
+
+
+def test_estimate_end() -> None:
+    """Test the learned end is weighed against the end of the device."""
+    durations = DurationStatistics()
+    for _ in range(10):
+        durations.add(3600)
+
+    assert estimate_end(0, 0, 4000, None) == 4000
+    assert estimate_end(0, 0, None, durations) == 3600
+    # The device knows best towards the end of the cycle
+    assert estimate_end(0, 3600, 4000, durations) == 4000
+    halfway = estimate_end(0, 1800, 4000, durations)
+    assert halfway is not None
+    assert 3600 < halfway < 4000
+    # A cycle running past its learned duration ends no earlier than now
+    assert estimate_end(0, 5000, None, durations) == 5000
@@ -0,0 +1,93 @@
+"""Tests for the SmartThings device event buffer."""
+
+from __future__ import annotations
+
+from pysmartthings import Attribute, Capability, DeviceEvent
+
+from custom_components.smartthingswasher.event_buffer import (
+    EVENT_OVERHEAD,
+    DeviceEventBuffer,
+    event_size,
+)
+
+
+def _event(value: object, device_id: str = "washer") -> DeviceEvent:
+    """Return a switch event of a device."""
+    return DeviceEvent(
+        event_id="event",
+        location_id="location",
+        owner_id="location",
+        device_id=device_id,
+        component_id="main",
+        capability=Capability.SWITCH,
+        attribute=Attribute.SWITCH,
+        value=value,
+    )
+
+
+def _values(buffer: DeviceEventBuffer, device_id: str = "washer") -> list[object]:
+    """Return the values of the buffered events of a device."""
+    return [event["value"] for event in buffer.get_events(device_id)]
+
+
+def test_event_size() -> None:
+    """Test large values are sized by their text length."""
+    assert event_size(_event(None)) == EVENT_OVERHEAD
+    assert event_size(_event({"a": "b" * 100})) == EVENT_OVERHEAD + len(
+        repr({"a": "b" * 100})
+    )
+
+
+def test_record_evicts_by_count() -> None:
+    """Test the oldest events are dropped beyond the number of events."""
+    buffer = DeviceEventBuffer(max_events=3, max_bytes=1_000_000)
+
+    for value in range(5):
+        buffer.record(_event(value))
+
+    assert _values(buffer) == [2, 3, 4]
+    assert buffer.as_dict()["devices"]["washer"] == {
+        "events": 3,
+        "bytes": sum(event_size(_event(value)) for value in (2, 3, 4)),
+    }
+
+
+def test_record_evicts_by_size() -> None:
+    """Test the oldest events are dropped beyond the size."""
+    size = event_size(_event(0))
+    buffer = DeviceEventBuffer(max_events=100, max_bytes=size * 2)
+
+    for value in range(4):
+        buffer.record(_event(value))
+
+    assert _values(buffer) == [2, 3]
+    assert buffer.as_dict()["devices"]["washer"]["bytes"] == size * 2
+
+
+def test_record_keeps_last_large_event() -> None:
+    """Test an event larger than the size is kept on its own."""
+    buffer = DeviceEventBuffer(max_events=10, max_bytes=EVENT_OVERHEAD * 2)
+    large = {"catalog": "x" * 10_000}
+
+    buffer.record(_event(0))
+    buffer.record(_event(large))
+
+    assert _values(buffer) == [large]
+    assert buffer.as_dict()["devices"]["washer"]["bytes"] == event_size(_event(large))
+
+
+def test_record_per_device() -> None:
+    """Test every device has a buffer of its own."""
+    buffer = DeviceEventBuffer(max_events=2, max_bytes=1_000_000)
+
+    for value in range(3):
+        buffer.record(_event(value))
+    buffer.record(_event("dryer", device_id="dryer"))
+
+    assert _values(buffer) == [1, 2]
+    assert _values(buffer, "dryer") == ["dryer"]
+
+    buffer.remove_device("washer")
+
+    assert buffer.get_events("washer") == []
+    assert buffer.as_dict()["devices"].keys() == {"dryer"}
@@ -0,0 +1,135 @@
+"""Tests for the SmartThings cycle history."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from custom_components.smartthingswasher.history import (
+    MAX_LOG_SIZE,
+    ROTATED_LOGS,
+    CycleHistory,
+    _seek_end,
+)
+
+
+def _line(start: int, end: int) -> bytes:
+    """Return the log line of a cycle."""
+    return orjson.dumps({"start": start, "end": end, "program": "cotton"}) + b"\n"
+
+
+def _ends_from(path: Path, since: float) -> list[int]:
+    """Return the ends of the cycles read after seeking a log."""
+    with path.open("rb") as file:
+        _seek_end(file, since)
+        return [orjson.loads(line)["end"] for line in file]
+
+
+@pytest.fixture
+def history(tmp_path: Path) -> CycleHistory:
+    """Return a cycle history writing to a temporary directory."""
+    hass = MagicMock()
+    hass.config.path.side_effect = lambda *parts: str(tmp_path.joinpath(*parts))
+    return CycleHistory(hass, MagicMock(entry_id="entry"))
+
+
+@pytest.mark.parametrize(
+    ("since", "expected"),
+    [
+        (0, [100, 200, 300, 400, 500]),
+        (100, [100, 200, 300, 400, 500]),
+        (101, [200, 300, 400, 500]),
+        (300, [300, 400, 500]),
+        (450, [500]),
+        (500, [500]),
+        (501, []),
+    ],
+)
+def test_seek_end(tmp_path: Path, since: float, expected: list[int]) -> None:
+    """Test seeking a log to the first cycle that ended at or after a time."""
+    path = tmp_path / "washer.ndjson"
+    path.write_bytes(b"".join(_line(end - 50, end) for end in range(100, 600, 100)))
+
+    assert _ends_from(path, since) == expected
+
+
+def test_seek_end_lines_of_different_length(tmp_path: Path) -> None:
+    """Test seeking when the middle of the log falls in a long line."""
+    path = tmp_path / "washer.ndjson"
+    path.write_bytes(
+        _line(0, 100)
+        + orjson.dumps({"start": 150, "end": 200, "program": "x" * 500})
+        + b"\n"
+        + _line(250, 300)
+    )
+
+    assert _ends_from(path, 150) == [200, 300]
+    assert _ends_from(path, 250) == [300]
+
+
+@pytest.mark.parametrize(
+    ("since", "expected"), [(100, [100, 300, 400]), (250, [300, 400]), (350, [400])]
+)
+def test_seek_end_cut_line(tmp_path: Path, since: float, expected: list[int]) -> None:
+    """Test a line cut short doesn't make the seek skip a cycle."""
+    path = tmp_path / "washer.ndjson"
+    path.write_bytes(
+        _line(0, 100) + b'{"start": 150, "en\n' + _line(250, 300) + _line(350, 400)
+    )
+
+    with path.open("rb") as file:
+        _seek_end(file, since)
+        lines = file.read().splitlines()
+
+    assert [
+        orjson.loads(line)["end"] for line in lines if line != b'{"start": 150, "en'
+    ] == expected
+
+
+def test_seek_end_empty(tmp_path: Path) -> None:
+    """Test seeking an empty log."""
+    path = tmp_path / "washer.ndjson"
+    path.write_bytes(b"")
+
+    assert _ends_from(path, 100) == []
+
+
+def test_append_rotates(history: CycleHistory) -> None:
+    """Test a full log is rotated and the oldest rotated log is dropped."""
+    line = _line(0, 100)
+    lines_per_log = MAX_LOG_SIZE // len(line)
+
+    for _ in range(lines_per_log * (ROTATED_LOGS + 2)):
+        history._append("washer", line)  # noqa: SLF001
+
+    for index in range(ROTATED_LOGS + 1):
+        path = history.log_path("washer", index)
+        assert path.stat().st_size <= MAX_LOG_SIZE
+    assert not history.log_path("washer", ROTATED_LOGS + 1).exists()
+    # Every rotated log is full
+    for index in range(1, ROTATED_LOGS + 1):
+        assert history.log_path("washer", index).stat().st_size == (
+            lines_per_log * len(line)
+        )
+
+
+def test_append_keeps_order(history: CycleHistory) -> None:
+    """Test the logs read from the oldest rotated log hold the cycles in order."""
+    padding = "x" * 200
+    for end in range(2000):
+        history._append(  # noqa: SLF001
+            "washer",
+            orjson.dumps({"start": end, "end": end, "program": padding}) + b"\n",
+        )
+
+    ends = []
+    for index in range(ROTATED_LOGS, -1, -1):
+        if (path := history.log_path("washer", index)).exists():
+            ends.extend(orjson.loads(line)["end"] for line in path.open("rb"))
+
+    assert ends == sorted(ends)
+    assert ends[-1] == 1999
+    assert history.log_path("washer", 1).exists()
@@ -0,0 +1,61 @@
+"""Tests for the SmartThings integration metrics."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.smartthingswasher.metrics import (
+    LATENCY_BUCKETS,
+    LatencyHistogram,
+)
+
+
+def test_histogram_empty() -> None:
+    """Test an empty histogram has no percentiles."""
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_histogram_percentiles() -> None:
+    """Test percentiles are the upper bound of their bucket."""
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(0.001)
+    for _ in range(10):
+        histogram.record(0.1)
+
+    assert histogram.percentile(0.5) == LATENCY_BUCKETS[0]
+    assert histogram.percentile(0.9) == LATENCY_BUCKETS[0]
+    p99 = histogram.percentile(0.99)
+    assert p99 is not None
+    assert p99 >= 0.1
+    assert p99 == min(bound for bound in LATENCY_BUCKETS if bound >= 0.1)
+
+
+def test_histogram_beyond_buckets() -> None:
+    """Test latencies beyond the last bucket report the last bound."""
+    histogram = LatencyHistogram()
+    histogram.record(LATENCY_BUCKETS[-1] * 10)
+
+    assert histogram.percentile(0.5) == LATENCY_BUCKETS[-1]
+
+
+def test_histogram_decay() -> None:
+    """Test older latencies weigh less and are forgotten eventually."""
+    histogram = LatencyHistogram()
+    for _ in range(4):
+        histogram.record(0.5)
+    histogram.decay()
+    for _ in range(4):
+        histogram.record(0.001)
+
+    # 2 old and 4 new latencies
+    assert histogram.percentile(0.5) == LATENCY_BUCKETS[0]
+    assert histogram.percentile(0.9) == pytest.approx(
+        min(bound for bound in LATENCY_BUCKETS if bound >= 0.5)
+    )
+
+    for _ in range(4):
+        histogram.decay()
+
+    # Less than a single latency is left
+    assert histogram.percentile(0.5) is None
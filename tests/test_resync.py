@@ -0,0 +1,170 @@
+"""Tests for the resync of SmartThings devices."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pysmartthings import Attribute, Capability, ComponentStatus, Status
+
+from custom_components.smartthingswasher import FullDevice
+from custom_components.smartthingswasher.resync import (
+    RESYNC_EVENT_ID,
+    diff_status,
+    merge_status,
+)
+
+LOCATION_ID = "location"
+
+
+def _device(status: dict[str, ComponentStatus]) -> FullDevice:
+    """Return a device with a status."""
+    return FullDevice(
+        device=MagicMock(device_id="washer"),
+        status=status,
+        programs={},
+        selected_course=None,
+        modes={},
+        online=True,
+    )
+
+
+def _status(machine_state: str, switch: str = "on") -> dict[str, ComponentStatus]:
+    """Return the status of a washer."""
+    return {
+        "main": {
+            Capability.WASHER_OPERATING_STATE: {
+                Attribute.MACHINE_STATE: Status(machine_state),
+            },
+            Capability.SWITCH: {Attribute.SWITCH: Status(switch)},
+            Capability.BUTTON: {Attribute.BUTTON: Status("pushed")},
+        }
+    }
+
+
+def test_diff_status_unchanged() -> None:
+    """Test an unchanged status gives no events."""
+    device = _device(_status("run"))
+
+    assert diff_status(device, _status("run"), LOCATION_ID) == []
+
+
+def test_diff_status_changed() -> None:
+    """Test changed attributes are applied in place and returned as events."""
+    device = _device(_status("run"))
+    machine_state = device.status["main"][Capability.WASHER_OPERATING_STATE][
+        Attribute.MACHINE_STATE
+    ]
+
+    events = diff_status(device, _status("stop"), LOCATION_ID)
+
+    assert [(event.capability, event.attribute, event.value) for event in events] == [
+        (Capability.WASHER_OPERATING_STATE, Attribute.MACHINE_STATE, "stop")
+    ]
+    assert events[0].event_id == RESYNC_EVENT_ID
+    assert events[0].device_id == "washer"
+    assert events[0].component_id == "main"
+    assert events[0].location_id == LOCATION_ID
+    # The status object the entities hold is updated, not replaced
+    assert (
+        device.status["main"][Capability.WASHER_OPERATING_STATE][
+            Attribute.MACHINE_STATE
+        ]
+        is machine_state
+    )
+    assert machine_state.value == "stop"
+
+
+def test_diff_status_changed_data() -> None:
+    """Test a change of the data of an attribute is an event."""
+    device = _device(_status("run"))
+    fresh = _status("run")
+    fresh["main"][Capability.SWITCH][Attribute.SWITCH].data = {"source": "app"}
+
+    events = diff_status(device, fresh, LOCATION_ID)
+
+    assert [(event.attribute, event.data) for event in events] == [
+        (Attribute.SWITCH, {"source": "app"})
+    ]
+
+
+def test_diff_status_skips_unknown_and_buttons() -> None:
+    """Test buttons and what the device doesn't know are not compared."""
+    device = _device(_status("run"))
+    fresh = _status("run")
+    fresh["main"][Capability.BUTTON][Attribute.BUTTON] = Status("held")
+    fresh["main"][Capability.AUDIO_VOLUME] = {Attribute.VOLUME: Status(10)}
+    fresh["sub"] = {Capability.SWITCH: {Attribute.SWITCH: Status("off")}}
+
+    assert diff_status(device, fresh, LOCATION_ID) == []
+    assert Capability.AUDIO_VOLUME not in device.status["main"]
+    assert "sub" not in device.status
+
+
+def test_diff_status_missing_in_fresh() -> None:
+    """Test attributes missing from the fresh status are left alone."""
+    device = _device(_status("run"))
+    fresh = _status("stop")
+    del fresh["main"][Capability.WASHER_OPERATING_STATE]
+
+    assert diff_status(device, fresh, LOCATION_ID) == []
+    assert (
+        device.status["main"][Capability.WASHER_OPERATING_STATE][
+            Attribute.MACHINE_STATE
+        ].value
+        == "run"
+    )
+
+
+def test_merge_status() -> None:
+    """Test the structure of a fresh status is merged in place."""
+    status = _status("run")
+    main = status["main"]
+    switch = main[Capability.SWITCH]
+    switch_status = switch[Attribute.SWITCH]
+    fresh = _status("stop", "off")
+    del fresh["main"][Capability.BUTTON]
+    fresh["main"][Capability.AUDIO_VOLUME] = {Attribute.VOLUME: Status(10)}
+    fresh["sub"] = {Capability.SWITCH: {Attribute.SWITCH: Status("off")}}
+    status["old"] = {Capability.SWITCH: {Attribute.SWITCH: Status("on")}}
+
+    merge_status(status, fresh)
+
+    assert status.keys() == {"main", "sub"}
+    assert status["main"] is main
+    assert main.keys() == {
+        Capability.WASHER_OPERATING_STATE,
+        Capability.SWITCH,
+        Capability.AUDIO_VOLUME,
+    }
+    # Existing status objects are kept, their values are left to diff_status
+    assert main[Capability.SWITCH] is switch
+    assert switch[Attribute.SWITCH] is switch_status
+    assert switch_status.value == "on"
+    assert main[Capability.AUDIO_VOLUME][Attribute.VOLUME].value == 10
+
+
+def test_merge_status_attributes() -> None:
+    """Test attributes are added and removed within a capability."""
+    status: dict[str, ComponentStatus] = {
+        "main": {
+            Capability.SWITCH: {
+                Attribute.SWITCH: Status("on"),
+                Attribute.SUPPORTED_COMMANDS: Status([]),
+            }
+        }
+    }
+    fresh: dict[str, ComponentStatus] = {
+        "main": {
+            Capability.SWITCH: {
+                Attribute.SWITCH: Status("off"),
+                Attribute.STATUS: Status("ready"),
+            }
+        }
+    }
+
+    merge_status(status, fresh)
+
+    assert status["main"][Capability.SWITCH].keys() == {
+        Attribute.SWITCH,
+        Attribute.STATUS,
+    }